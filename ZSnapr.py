@@ -1,3 +1,5 @@
+import argparse
+import atexit
 import os
 import ctypes
 import sys
@@ -24,19 +26,32 @@ os.environ['QT_SCREEN_SCALE_FACTORS'] = '1'
 os.environ['QT_DEVICE_PIXEL_RATIO'] = '1'
 
 import flet as ft
+import gc
+import io
 import threading
+import time
 import keyboard
 from screenshot_engine import ScreenshotEngine
-from config import APP_NAME, APP_VERSION, DEFAULT_SETTINGS, HOTKEYS, SUPPORTED_FORMATS, save_hotkeys
+from config import APP_NAME, APP_VERSION, DEFAULT_SETTINGS, HOTKEYS, SUPPORTED_FORMATS, save_hotkeys, save_toolbar_icons
 from modules.copy_legacy import ClipboardManager
 from modules.save_legacy import SaveManager
 import pystray
 from PIL import Image, ImageDraw
 import queue
-from ui.pages import capture_page, settings_page, about_page, home_page
+from collections import deque
+from ui.pages import capture_page, settings_page, about_page, home_page, logs_page
 from core.hotkeys import register as register_hotkeys, re_register as re_register_hotkeys
 from core.tray import TrayManager
-from core.log_sys import get_logger, LogOperation, auto_cleanup_logs, CleanupStrategy
+from core.commands import CommandBus
+from core.ui_updates import UpdateScheduler
+from core.preview import PreviewCache, ASSETS_DIR
+from modules.frame_grab import get_frame_grabber
+from core.idle import IdleMonitor
+from core.process_stats import rss_bytes, trim_memory, format_bytes
+from core.log_sys import get_logger, LogOperation, auto_cleanup_logs, CleanupStrategy, LogQuery, get_tracer, get_instrumentation, get_profiler
+from core.log_sys.profiling import parse_profile_spec
+from core.log_sys.log_query import levels_at_least
+from core.font_manager import RenderConfig, get_icon_manager
 
 
 class ZSnaprApp:
@@ -55,8 +70,18 @@ class ZSnaprApp:
         self.page = None
         self.status_text = None
         self.preview_image = None
-        self.last_screenshot = None
+        self.previews = PreviewCache()
+        self.capture_count = 0
+        self.preview_id = None          # Capture ID shown in the Home preview
+        self._screenshot_lock = threading.Lock()
+        self._last_screenshot = None
+        self._last_screenshot_png = None    # Compressed copy while idle in the tray
         self.last_filepath = None
+        self.last_capture_time = None
+        
+        # Log viewer
+        self.log_query = LogQuery(str(self.logger.log_dir))
+        self._log_follow_stop = None
         
         # UI components
         self.save_dir_field = None
@@ -64,11 +89,98 @@ class ZSnaprApp:
         self.delay_field = None
         self.auto_save_checkbox = None
         self.tabs = None
+        self.tab_views = []
+        self._tabs_built = []
+        self._tab_lock = threading.Lock()
+        self.toolbar_icon_target = "copy"
+        self._icon_previews = {}
+        # Hotkey press -> frozen frame latency (ms), most recent last
+        self.freeze_latencies = deque(maxlen=100)
+        
+        # All status/hover/tray UI changes are coalesced and flushed from one thread
+        self.ui = UpdateScheduler(lambda: self.page)
+        
+        # Hotkeys and tray post here; handlers run on the bus thread
+        self.commands = CommandBus()
+        self.commands.register("hotkey_fullscreen", self._hotkey_fullscreen)
+        self.commands.register("hotkey_region", self._hotkey_region)
+        self.commands.register("hotkey_window", self._hotkey_window)
         self.tray_manager = TrayManager(self)
         self.is_compact = False
         
+        # Idle low-memory mode while minimised to the tray
+        self.idle_report = None
+        self.idle_monitor = IdleMonitor(
+            float(DEFAULT_SETTINGS.get("idle_release_minutes", 0)) * 60,
+            self._enter_low_memory,
+            condition=lambda: self.tray_manager.in_tray
+        )
+        
+        # Suspected memory holders, reported in each profiling memory snapshot
+        profiler = get_profiler()
+        profiler.add_probe("last_screenshot", self._last_screenshot_info)
+        profiler.add_probe("icon_previews", lambda: f"{len(self._icon_previews)} entries")
+        profiler.add_probe("icon_caches", self._icon_cache_info)
+        
         self.logger.info("ZSnaprApp initialization completed")
     
+    @property
+    def last_screenshot(self):
+        # Decompressed on first use after idle mode packed it
+        with self._screenshot_lock:
+            if self._last_screenshot is None and self._last_screenshot_png is not None:
+                with Image.open(io.BytesIO(self._last_screenshot_png)) as img:
+                    img.load()
+                    self._last_screenshot = img.copy()
+                self._last_screenshot_png = None
+            return self._last_screenshot
+    
+    @last_screenshot.setter
+    def last_screenshot(self, image):
+        with self._screenshot_lock:
+            self._last_screenshot = image
+            self._last_screenshot_png = None
+    
+    def _note_activity(self):
+        # Captures, hotkeys and tray actions keep the app out of idle mode
+        self.idle_monitor.touch()
+    
+    def _enter_low_memory(self):
+        # Called by the idle monitor: drop what can be rebuilt, pack the last screenshot, trim the heap
+        before = rss_bytes()
+        with self._screenshot_lock:
+            if self._last_screenshot is not None:
+                buf = io.BytesIO()
+                self._last_screenshot.save(buf, "PNG", compress_level=1)
+                self._last_screenshot_png = buf.getvalue()
+                self._last_screenshot = None
+        manager = get_icon_manager(create=False)
+        if manager is not None:
+            manager.clear_caches()
+        self._icon_previews.clear()
+        # Control trees that refill on demand (icon search results, log viewer rows)
+        for name in ("icon_results", "log_list"):
+            control = getattr(self, name, None)
+            if control is not None:
+                control.controls = []
+                self.ui.mark(control)
+        if getattr(self, "log_count_text", None) is not None:
+            self.log_count_text.value = "0 records"
+            self.ui.mark(self.log_count_text)
+        gc.collect()
+        trim_memory()
+        after = rss_bytes()
+        self.idle_report = {"before": before, "after": after, "time": time.time()}
+        self.logger.info("Idle low-memory mode: RSS %s -> %s", format_bytes(before), format_bytes(after))
+        self._refresh_memory_text()
+    
+    def _refresh_memory_text(self):
+        text = getattr(self, "home_memory_text", None)
+        if text is None:
+            return
+        text.value = home_page.memory_summary(self)
+        self.ui.mark(text)
+    
     def _silent_log_cleanup(self):
         # Automatic log cleanup with informative logging
         try:
@@ -96,7 +208,7 @@ class ZSnaprApp:
                                 self.logger.info(f"释放空间: {mb_freed:.2f} MB")
                         else:
                             self.logger.info("日志清理检查完成: 无需删除文件")
-                    elif result.get("status") == "no_cleanup_needed":
+                    elif result.get("status") in ("no_cleanup_needed", "no_files", "too_soon"):
                         self.logger.info("日志清理检查: 当前日志文件数量正常，无需清理")
                     else:
                         self.logger.warning(f"日志清理状态: {result.get('status', 'unknown')}")
@@ -140,63 +252,102 @@ class ZSnaprApp:
         # Setup global hotkeys
         self._setup_hotkeys()
         
-        # Start tray action checker
-        self._start_tray_checker()
+        # Start dispatching hotkey and tray commands
+        self.commands.start()
         
         page.update()
+        
+        threading.Thread(target=self._prebuild_tabs, name="TabPrebuild", daemon=True).start()
     
-    def _setup_ui(self):
-        """Setup the user interface with tabs"""
-        compact = (self.page.width or 0) < 560 if self.page else False
-        self.is_compact = compact
+    COMPACT_WIDTH = 560
+    TAB_LABELS = (
+        ("Home", ft.Icons.HOME),
+        ("Capture", ft.Icons.CAMERA_ALT),
+        ("Settings", ft.Icons.SETTINGS),
+        ("Logs", ft.Icons.RECEIPT_LONG),
+        ("About", ft.Icons.INFO),
+    )
+    TAB_BUILDERS = (home_page.build, capture_page.build, settings_page.build, logs_page.build, about_page.build)
+    # Seconds after the first frame before unvisited tabs are built in the background
+    TAB_PREBUILD_DELAY = 1.5
+    
+    def _tab_placeholder(self):
+        return ft.Container(
+            content=ft.ProgressRing(width=22, height=22, stroke_width=2),
+            alignment=ft.alignment.center,
+            padding=40
+        )
+    
+    def _ensure_tab(self, index):
+        # Build a tab's page once; returns its view when it was just built
+        with self._tab_lock:
+            if self._tabs_built[index]:
+                return None
+            self.tab_views[index].controls = [self.TAB_BUILDERS[index](self)]
+            self._tabs_built[index] = True
+            return self.tab_views[index]
+    
+    def _on_tab_change(self, e):
+        try:
+            view = self._ensure_tab(int(e.control.selected_index))
+            if view is not None:
+                self.ui.mark(view)
+        except Exception as ex:
+            self.logger.error(f"Tab build failed: {ex}")
+    
+    def _prebuild_tabs(self):
+        # Build the remaining tabs one at a time once the window is up, so the first visit is instant
+        time.sleep(self.TAB_PREBUILD_DELAY)
+        for index in range(len(self.TAB_LABELS)):
+            try:
+                view = self._ensure_tab(index)
+            except Exception as ex:
+                self.logger.error(f"Tab prebuild failed: {ex}")
+                continue
+            if view is not None:
+                self.ui.mark(view)
+                time.sleep(0.05)
+    
+    
+    def _tabs_height(self):
+        return max(250, (self.page.height or 411) - 150) if self.page else 250
+    
+    def _apply_layout(self, compact):
+        # Set the breakpoint-dependent header properties in place; returns the controls that changed
         header_icon_size = 18 if compact else 20
         header_text_size = 13 if compact else 14
         header_spacing = 8 if compact else 10
         header_padding_v = 6 if compact else 8
         header_padding_h = 8 if compact else 10
-        # Create tabs with controlled scrolling and responsive width
-        tabs_height = max(250, (self.page.height or 411) - 150) if self.page else 250
+        self.is_compact = compact
+        parts = self._layout_controls
+        parts["icon"].size = header_icon_size
+        parts["title"].size = header_text_size + 1
+        parts["version"].size = header_text_size - 2
+        parts["title_row"].spacing = header_spacing + 2
+        parts["header"].padding = ft.padding.symmetric(vertical=header_padding_v + 2, horizontal=header_padding_h + 2)
+        return [parts["header"]]
+    
+    def _setup_ui(self):
+        """Setup the user interface with tabs"""
+        compact = (self.page.width or 0) < self.COMPACT_WIDTH if self.page else False
+        # Create tabs with controlled scrolling and responsive width.
+        # Only the first tab is built now; the rest on first visit or by the idle prebuild.
+        tabs_height = self._tabs_height()
+        self.tab_views = [
+            ft.ListView(controls=[self._tab_placeholder()], expand=True, auto_scroll=False)
+            for _ in self.TAB_LABELS
+        ]
+        self._tabs_built = [False] * len(self.TAB_LABELS)
+        self._ensure_tab(0)
         self.tabs = ft.Container(
             content=ft.Tabs(
                 selected_index=0,
                 animation_duration=300,
+                on_change=self._on_tab_change,
                 tabs=[
-                    ft.Tab(
-                        text="Home",
-                        icon=ft.Icons.HOME,
-                        content=ft.ListView(
-                            controls=[home_page.build(self)],
-                            expand=True,
-                            auto_scroll=False
-                        )
-                    ),
-                    ft.Tab(
-                        text="Capture",
-                        icon=ft.Icons.CAMERA_ALT,
-                        content=ft.ListView(
-                            controls=[capture_page.build(self)],
-                            expand=True,
-                            auto_scroll=False
-                        )
-                    ),
-                    ft.Tab(
-                        text="Settings",
-                        icon=ft.Icons.SETTINGS,
-                        content=ft.ListView(
-                            controls=[settings_page.build(self)],
-                            expand=True,
-                            auto_scroll=False
-                        )
-                    ),
-                    ft.Tab(
-                        text="About",
-                        icon=ft.Icons.INFO,
-                        content=ft.ListView(
-                            controls=[about_page.build(self)],
-                            expand=True,
-                            auto_scroll=False
-                        )
-                    ),
+                    ft.Tab(text=text, icon=icon, content=self.tab_views[i])
+                    for i, (text, icon) in enumerate(self.TAB_LABELS)
                 ]
             ),
             height=tabs_height,
@@ -219,7 +370,10 @@ class ZSnaprApp:
             border=ft.border.all(1, ft.Colors.GREY_200)
         )
         
-        # Enhanced Header with Material Design
+        # Enhanced Header with Material Design; sizes and paddings are set by _apply_layout
+        header_icon = ft.Icon(ft.Icons.CAMERA_ALT, color=ft.Colors.WHITE)
+        header_title = ft.Text(f"{APP_NAME}", weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_800)
+        header_version = ft.Text(f"v{APP_VERSION}", color=ft.Colors.BLUE_600, weight=ft.FontWeight.W_400)
         header = ft.Container(
             content=ft.Row([
                 ft.WindowDragArea(
@@ -234,7 +388,7 @@ class ZSnaprApp:
                                     border_radius=8,
                                 ),
                                 ft.Container(
-                                    content=ft.Icon(ft.Icons.CAMERA_ALT, size=header_icon_size, color=ft.Colors.WHITE),
+                                    content=header_icon,
                                     alignment=ft.alignment.center,
                                     width=32,
                                     height=32,
@@ -242,11 +396,8 @@ class ZSnaprApp:
                             ]),
                         ),
                         # App title with enhanced typography
-                        ft.Column([
-                            ft.Text(f"{APP_NAME}", size=header_text_size + 1, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_800),
-                            ft.Text(f"v{APP_VERSION}", size=header_text_size - 2, color=ft.Colors.BLUE_600, weight=ft.FontWeight.W_400),
-                        ], spacing=0, tight=True),
-                    ], spacing=header_spacing + 2, alignment=ft.MainAxisAlignment.START),
+                        ft.Column([header_title, header_version], spacing=0, tight=True),
+                    ], alignment=ft.MainAxisAlignment.START),
                     expand=True
                 ),
                 # Enhanced toolbar with Material Design buttons - Fixed alignment
@@ -326,7 +477,6 @@ class ZSnaprApp:
                     ),
                 ], spacing=4, alignment=ft.MainAxisAlignment.END)
             ], spacing=12, alignment=ft.MainAxisAlignment.CENTER),
-            padding=ft.padding.symmetric(vertical=header_padding_v + 2, horizontal=header_padding_h + 2),
             bgcolor=ft.Colors.WHITE,
             border_radius=15,
             border=ft.border.all(1, ft.Colors.GREY_200),
@@ -338,6 +488,15 @@ class ZSnaprApp:
             )
         )
         
+        self._layout_controls = {
+            "icon": header_icon,
+            "title": header_title,
+            "version": header_version,
+            "title_row": header.content.controls[0].content,
+            "header": header,
+        }
+        self._apply_layout(compact)
+        
         # Main layout with controlled scrolling
         main_content = ft.ListView(
             controls=[
@@ -364,15 +523,18 @@ class ZSnaprApp:
         register_hotkeys(self)
     
     def _on_resize(self, e):
+        # Adjust the existing controls; the tree is never rebuilt on resize
         try:
-            new_compact = (self.page.width or 0) < 560
-            if new_compact != getattr(self, "is_compact", False):
-                sel = self.tabs.selected_index if self.tabs else 0
-                self.page.controls.clear()
-                self._setup_ui()
-                if self.tabs:
-                    self.tabs.selected_index = sel
-                self.page.update()
+            changed = []
+            height = self._tabs_height()
+            if self.tabs and self.tabs.height != height:
+                self.tabs.height = height
+                changed.append(self.tabs)
+            compact = (self.page.width or 0) < self.COMPACT_WIDTH
+            if compact != self.is_compact:
+                changed.extend(self._apply_layout(compact))
+            if changed:
+                self.ui.mark(*changed)
         except Exception:
             pass
 
@@ -381,33 +543,37 @@ class ZSnaprApp:
         if self.status_text:
             self.status_text.value = message
             self.status_text.color = color
-            self.page.update()
+            self.ui.mark(self.status_text)
     
-    def _capture_fullscreen(self, e=None):
+    def _capture_fullscreen(self, e=None, frame=None):
         """Capture full screen"""
+        self._note_activity()
         self._update_status("Capturing full screen...", ft.Colors.BLUE)
         
         def capture():
             try:
-                screenshot = self.engine.capture_fullscreen()
-                self._process_screenshot(screenshot, "fullscreen")
+                with get_profiler().capture("fullscreen"):
+                    screenshot = self.engine.capture_fullscreen(frame=frame)
+                    self._process_screenshot(screenshot, "fullscreen")
             except Exception as ex:
                 self._update_status(f"Error: {str(ex)}", ft.Colors.RED)
         
         threading.Thread(target=capture, daemon=True).start()
     
-    def _capture_region(self, e=None):
+    def _capture_region(self, e=None, frame=None):
         """Capture selected region"""
-        with LogOperation("Region Capture"):
-            self.logger.log_screenshot_event("REGION_CAPTURE_START")
-            self._update_status("Select region on screen...", ft.Colors.BLUE)
-            
-            def capture():
+        self._note_activity()
+        self.logger.log_screenshot_event("REGION_CAPTURE_START")
+        self._update_status("Select region on screen...", ft.Colors.BLUE)
+        
+        def capture():
+            # The operation spans the whole capture thread, so the trace nests worker and save under it
+            with LogOperation("Region Capture", cat="capture"), get_profiler().capture("region"):
                 self.logger.log_thread_info("Region capture thread started")
                 try:
                     self.logger.debug("Calling engine.capture_region()")
-                    result = self.engine.capture_region()
-                    self.logger.debug(f"Engine returned: {type(result)} - {result is not None}")
+                    result = self.engine.capture_region(frame=frame)
+                    self.logger.debug("Engine returned: %s - %s", type(result), result is not None)
                     
                     if result:
                         self.logger.log_screenshot_event("REGION_CAPTURE_SUCCESS", f"Result type: {type(result)}")
@@ -421,18 +587,20 @@ class ZSnaprApp:
                     self._update_status(f"Error: {str(ex)}", ft.Colors.RED)
                 finally:
                     self.logger.log_thread_info("Region capture thread finished")
-            
-            self.logger.debug("Starting region capture thread")
-            threading.Thread(target=capture, daemon=True).start()
+        
+        self.logger.debug("Starting region capture thread")
+        threading.Thread(target=capture, name="RegionCapture", daemon=True).start()
     
     def _capture_window(self, e=None):
         """Capture active window"""
+        self._note_activity()
         self._update_status("Capturing active window...", ft.Colors.BLUE)
         
         def capture():
             try:
-                screenshot = self.engine.capture_window()
-                self._process_screenshot(screenshot, "window")
+                with get_profiler().capture("window"):
+                    screenshot = self.engine.capture_window()
+                    self._process_screenshot(screenshot, "window")
             except Exception as ex:
                 self._update_status(f"Error: {str(ex)}", ft.Colors.RED)
         
@@ -449,18 +617,20 @@ class ZSnaprApp:
             screenshot, action = screenshot
         
         self.last_screenshot = screenshot
+        self.last_capture_time = time.time()
+        self.capture_count += 1
+        self.previews.submit(self.capture_count, screenshot, lambda entry: self._show_preview(entry.capture_id))
         
         if capture_type == "region" and action == "copy":
             try:
-                ok = self.clipboard_manager.copy_image_to_clipboard(screenshot)
+                with LogOperation("clipboard", log=False, cat="output"):
+                    ok = self.clipboard_manager.copy_image_to_clipboard(screenshot)
                 if ok:
                     self._update_status("Region copied to clipboard", ft.Colors.GREEN)
                 else:
                     self._update_status("Failed to copy to clipboard", ft.Colors.RED)
             except Exception as e:
                 self._update_status(f"Clipboard error: {str(e)}", ft.Colors.RED)
-            if self.page:
-                self.page.update()
             return
         
         if capture_type == "region" and action == "save":
@@ -473,21 +643,20 @@ class ZSnaprApp:
                     self._update_status("Save cancelled", ft.Colors.ORANGE)
             except Exception as e:
                 self._update_status(f"Save error: {str(e)}", ft.Colors.RED)
-            if self.page:
-                self.page.update()
             return
         
         # Check for auto-copy settings
         should_auto_copy = False
-        if capture_type == "fullscreen" and hasattr(self, 'auto_copy_fullscreen_checkbox') and self.auto_copy_fullscreen_checkbox.value:
+        if capture_type == "fullscreen" and self._setting_value("auto_copy_fullscreen_checkbox", "auto_copy_fullscreen"):
             should_auto_copy = True
-        elif capture_type == "window" and hasattr(self, 'auto_copy_window_checkbox') and self.auto_copy_window_checkbox.value:
+        elif capture_type == "window" and self._setting_value("auto_copy_window_checkbox", "auto_copy_window"):
             should_auto_copy = True
         
         # Auto-copy if enabled
         if should_auto_copy:
             try:
-                ok = self.clipboard_manager.copy_image_to_clipboard(screenshot)
+                with LogOperation("clipboard", log=False, cat="output"):
+                    ok = self.clipboard_manager.copy_image_to_clipboard(screenshot)
                 if ok:
                     self._update_status(f"{capture_type.title()} screenshot copied to clipboard", ft.Colors.GREEN)
                 else:
@@ -496,13 +665,14 @@ class ZSnaprApp:
                 self._update_status(f"Clipboard error: {str(e)}", ft.Colors.RED)
         
         # Auto-save if enabled
-        if self.auto_save_checkbox and self.auto_save_checkbox.value:
+        if self._setting_value("auto_save_checkbox", "auto_save"):
             try:
-                filepath = self.save_manager.quick_save(
-                    screenshot, 
-                    self.save_dir_field.value if self.save_dir_field else DEFAULT_SETTINGS["save_directory"],
-                    self.format_dropdown.value if self.format_dropdown else DEFAULT_SETTINGS["image_format"]
-                )
+                with LogOperation("quick_save", log=False, cat="output"):
+                    filepath = self.save_manager.quick_save(
+                        screenshot, 
+                        self._setting_value("save_dir_field", "save_directory"),
+                        self._setting_value("format_dropdown", "image_format")
+                    )
                 if filepath:
                     self.last_filepath = filepath
                     status_msg = f"Screenshot saved: {os.path.basename(filepath)}"
@@ -515,9 +685,35 @@ class ZSnaprApp:
                 self._update_status(f"Save error: {str(e)}", ft.Colors.RED)
         elif not should_auto_copy:
             self._update_status("Screenshot captured (not saved)", ft.Colors.BLUE)
-        
-        if self.page:
-            self.page.update()
+    
+    def _show_preview(self, capture_id):
+        # Point the Home preview at a cached capture; no image data goes through the websocket
+        entry = self.previews.get(capture_id)
+        if entry is None or self.preview_image is None:
+            return
+        self.preview_id = capture_id
+        self.preview_image.src = entry.src
+        self.preview_image.visible = True
+        when = time.strftime("%H:%M:%S", time.localtime(entry.created))
+        self.preview_caption.value = f"#{capture_id}  {entry.source_size[0]}x{entry.source_size[1]}  {when}"
+        ids = self.previews.ids()
+        self.preview_prev_button.disabled = not ids or capture_id <= ids[0]
+        self.preview_next_button.disabled = not ids or capture_id >= ids[-1]
+        self.ui.mark(self.preview_image, self.preview_caption, self.preview_prev_button, self.preview_next_button)
+    
+    def _browse_preview(self, step):
+        ids = self.previews.ids()
+        if not ids:
+            return
+        position = ids.index(self.preview_id) if self.preview_id in ids else len(ids) - 1
+        self._show_preview(ids[max(0, min(len(ids) - 1, position + step))])
+    
+    def _setting_value(self, field_name, key):
+        # Value of a Settings control, or the default while the Settings tab is not built yet
+        field = getattr(self, field_name, None)
+        if field is None:
+            return DEFAULT_SETTINGS[key]
+        return field.value
     
     def _apply_settings(self, e):
         """Apply current settings"""
@@ -545,41 +741,52 @@ class ZSnaprApp:
                 re_register_hotkeys(self, new_hotkeys)
                 self._refresh_hotkey_labels()
 
+            # Toolbar icons are read by the selector process on its next start
+            if getattr(self, "toolbar_icon_fields", None):
+                icons = {k: (f.value or "").strip() for k, f in self.toolbar_icon_fields.items()}
+                unknown = [v for v in icons.values() if v and get_icon_manager().get_icon_unicode(v) is None]
+                if unknown:
+                    raise ValueError(f"Unknown icon: {', '.join(unknown)}")
+                save_toolbar_icons(icons)
+
+            idle_field = getattr(self, "idle_minutes_field", None)
+            if idle_field is not None:
+                minutes = float(idle_field.value or 0)
+                if minutes < 0:
+                    raise ValueError("Idle minutes must be 0 or more")
+                self.idle_monitor.set_delay(minutes * 60)
+
             self._update_status("Settings applied successfully", ft.Colors.GREEN)
             self._show_snackbar("Settings applied successfully", ft.Colors.GREEN_600)
             self._show_dialog("Settings", "Settings applied successfully", modal=False)
-            try:
-                if self.tabs and self.tabs.tabs and len(self.tabs.tabs) > 0:
-                    self.tabs.tabs[0].content = home_page.build(self)
-            except Exception:
-                pass
-            if self.page:
-                self.page.update()
+            self._refresh_page_values()
         except Exception as ex:
             self._update_status(f"Settings error: {str(ex)}", ft.Colors.RED)
             self._show_snackbar(f"Settings error: {str(ex)}", ft.Colors.RED_600)
-            if self.page:
-                self.page.update()
+    
+    def _refresh_page_values(self):
+        # Push changed settings values into the Home and Capture pages without rebuilding them
+        changed = []
+        if hasattr(self, "home_value_texts"):
+            changed.extend(home_page.refresh(self))
+        if hasattr(self, "capture_value_texts"):
+            changed.extend(capture_page.refresh(self))
+        if changed:
+            self.ui.mark(*changed)
     
     def _browse_directory(self, e):
         """Browse for save directory"""
         try:
-            import tkinter as tk
-            from tkinter import filedialog
-            
-            root = tk.Tk()
-            root.withdraw()
+            from modules.dialog_host import get_dialog_host
             
-            directory = filedialog.askdirectory(
+            directory = get_dialog_host().ask_directory(
                 initialdir=self.save_dir_field.value,
                 title="Select Save Directory"
             )
             
-            root.destroy()
-            
             if directory:
                 self.save_dir_field.value = directory
-                self.page.update()
+                self.ui.mark(self.save_dir_field)
                 self._update_status("Directory updated", ft.Colors.GREEN)
                 
         except Exception as ex:
@@ -617,7 +824,7 @@ class ZSnaprApp:
     def _open_folder(self, e):
         """Open save folder"""
         try:
-            folder_path = self.save_dir_field.value
+            folder_path = self._setting_value("save_dir_field", "save_directory")
             if self.last_filepath:
                 folder_path = os.path.dirname(self.last_filepath)
             
@@ -626,35 +833,53 @@ class ZSnaprApp:
         except Exception as ex:
             self._update_status(f"Error opening folder: {str(ex)}", ft.Colors.RED)
     
+    def _freeze_frame(self, pressed_at=None):
+        # Grab the screen as it was when the hotkey fired, before anything else can change it.
+        # Skipped when a capture delay is set, since then the user wants the later screen.
+        if not self.page or self.engine.delay_seconds > 0:
+            return None
+        grabber = get_frame_grabber()
+        try:
+            with LogOperation("freeze_frame", log=False, cat="capture", backend=grabber.backend):
+                frame = grabber.grab()
+        except Exception as ex:
+            self.logger.warning("Frame freeze failed, capturing later instead: %s", ex)
+            return None
+        if pressed_at is not None:
+            latency = (frame.grabbed_at - pressed_at) * 1000.0
+            self.freeze_latencies.append(latency)
+            ordered = sorted(self.freeze_latencies)
+            self.logger.info("Frozen frame %dx%d via %s %.1f ms after hotkey (median %.1f, max %.1f over %d)",
+                             frame.size[0], frame.size[1], grabber.backend, latency,
+                             ordered[len(ordered) // 2], ordered[-1], len(ordered))
+        return frame
+    
     # Hotkey handlers
-    def _hotkey_fullscreen(self):
+    def _hotkey_fullscreen(self, pressed_at=None):
         """Hotkey handler for fullscreen capture"""
+        frame = self._freeze_frame(pressed_at)
         if self.page:
-            self._capture_fullscreen()
+            self._capture_fullscreen(frame=frame)
     
-    def _hotkey_region(self):
+    def _hotkey_region(self, pressed_at=None):
         """Hotkey handler for region capture"""
+        frame = self._freeze_frame(pressed_at)
         self.logger.log_hotkey_event("ctrl+shift+r", "region_capture")
         if self.page:
             self.logger.debug("Page exists, calling _capture_region")
-            self._capture_region()
+            self._capture_region(frame=frame)
         else:
             self.logger.warning("Page is None, cannot capture region")
     
-    def _hotkey_window(self):
+    def _hotkey_window(self, pressed_at=None):
         """Hotkey handler for window capture"""
         if self.page:
             self._capture_window()
 
     def _refresh_hotkey_labels(self):
-        # Rebuild capture page to reflect latest hotkeys
-        try:
-            if self.tabs and self.tabs.tabs and len(self.tabs.tabs) > 1:
-                self.tabs.tabs[1].content = capture_page.build(self)
-                if self.page:
-                    self.page.update()
-        except Exception:
-            pass
+        # Update the capture page hotkey labels in place
+        if hasattr(self, "capture_value_texts"):
+            self.ui.mark(*capture_page.refresh(self))
 
     def _record_hotkey(self, target):
         # Capture a hotkey combo and put it into corresponding field
@@ -662,19 +887,239 @@ class ZSnaprApp:
         def worker():
             try:
                 combo = keyboard.read_hotkey(suppress=True)
+                field = None
                 if target == "fullscreen" and hasattr(self, "fullscreen_hotkey_field"):
-                    self.fullscreen_hotkey_field.value = combo
+                    field = self.fullscreen_hotkey_field
                 elif target == "region" and hasattr(self, "region_hotkey_field"):
-                    self.region_hotkey_field.value = combo
+                    field = self.region_hotkey_field
                 elif target == "window" and hasattr(self, "window_hotkey_field"):
-                    self.window_hotkey_field.value = combo
-                if self.page:
-                    self.page.update()
+                    field = self.window_hotkey_field
+                if field is not None:
+                    field.value = combo
+                    self.ui.mark(field)
                 self._update_status("Hotkey captured", ft.Colors.GREEN)
             except Exception as ex:
                 self._update_status(f"Hotkey capture failed: {str(ex)}", ft.Colors.RED)
         threading.Thread(target=worker, daemon=True).start()
 
+    # Log viewer
+    LOG_VIEW_LIMIT = 5000
+    LOG_RANGE_SECONDS = {"5m": 300, "15m": 900, "1h": 3600, "24h": 86400}
+
+    def _log_view_filters(self):
+        text = (self.log_text_field.value or "").strip() if self.log_text_field else ""
+        return {
+            "levels": levels_at_least(self.log_level_dropdown.value or "INFO"),
+            "text": text or None,
+        }
+
+    def _show_log_records(self, records, append=False):
+        rows = [logs_page.record_row(r) for r in records]
+        if append:
+            rows = self.log_list.controls + rows
+        self.log_list.controls = rows[-self.LOG_VIEW_LIMIT:]
+        self.log_count_text.value = f"{len(self.log_list.controls)} records"
+        self.ui.mark(self.log_list, self.log_count_text)
+
+    def _refresh_log_view(self, e=None):
+        # Query off the UI thread; the index makes time-range queries seek instead of scanning
+        def worker():
+            try:
+                key = self.log_range_dropdown.value
+                filters = self._log_view_filters()
+                if key == "capture":
+                    if not self.last_capture_time:
+                        self._update_status("No capture yet in this session", ft.Colors.ORANGE)
+                        return
+                    records = self.log_query.around(self.last_capture_time, limit=self.LOG_VIEW_LIMIT, **filters)
+                elif key in self.LOG_RANGE_SECONDS:
+                    start = time.time() - self.LOG_RANGE_SECONDS[key]
+                    records = self.log_query.query(start, None, limit=self.LOG_VIEW_LIMIT, **filters)
+                else:
+                    records = self.log_query.tail(self.LOG_VIEW_LIMIT, **filters)
+                self._show_log_records(records)
+            except Exception as ex:
+                self.logger.warning(f"Log view refresh failed: {ex}")
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _toggle_log_follow(self, e):
+        # Stream new records into the list while the switch is on
+        if self._log_follow_stop is not None:
+            self._log_follow_stop.set()
+            self._log_follow_stop = None
+        self.log_list.auto_scroll = bool(self.log_follow_switch.value)
+        if not self.log_follow_switch.value:
+            self.ui.mark(self.log_list)
+            return
+        stop = threading.Event()
+        self._log_follow_stop = stop
+        filters = self._log_view_filters()
+
+        def worker():
+            try:
+                for batch in self.log_query.follow(stop, **filters):
+                    self._show_log_records(batch, append=True)
+            except Exception as ex:
+                self.logger.warning(f"Log follow stopped: {ex}")
+        threading.Thread(target=worker, name="LogFollow", daemon=True).start()
+
+    def _toggle_trace(self, e=None):
+        # Start or stop recording LogOperation spans; stopping writes a Chrome trace to logs/
+        tracer = get_tracer()
+        if not tracer.enabled:
+            tracer.start()
+            self.logger.info("Trace recording started")
+            self._update_status("Recording trace...", ft.Colors.BLUE)
+        else:
+            path = tracer.stop(str(self.logger.log_dir))
+            self.logger.info("Trace recording stopped: %s", path)
+            if path:
+                self._show_snackbar(f"Trace saved: {path}", ft.Colors.GREEN_600)
+            else:
+                self._update_status("Trace stopped (no spans recorded)", ft.Colors.ORANGE)
+        self.trace_button.selected = tracer.enabled
+        self.ui.mark(self.trace_button)
+    
+    def _dump_debug_records(self, e=None):
+        # Flush the in-memory debug buffer to disk, then show it
+        self.logger.dump_flight_recorder("log viewer")
+        threading.Timer(0.5, self._refresh_log_view).start()
+
+    # Function timing
+    def _toggle_instrumentation(self, e=None):
+        instrumentation = get_instrumentation()
+        sample_every = int(self.instrument_sample_dropdown.value or 1)
+        if self.instrument_switch.value:
+            instrumentation.enable(sample_every)
+            self.logger.info("Function timing enabled (every %d call(s))", sample_every)
+        else:
+            instrumentation.disable()
+            self.logger.info("Function timing disabled")
+    
+    def _write_function_report(self, e=None):
+        instrumentation = get_instrumentation()
+        path = instrumentation.write_report(str(self.logger.log_dir))
+        self.logger.info("Function timing report written: %s", path)
+        self._show_snackbar(f"Report saved: {path}", ft.Colors.GREEN_600)
+    
+    def _reset_function_stats(self, e=None):
+        get_instrumentation().reset()
+        self._show_snackbar("Function timing reset", ft.Colors.BLUE_600)
+    
+    # Profiling sessions
+    PROFILE_SCOPES = {"1": (1, None), "5": (5, None), "10": (10, None), "30s": (None, 30), "60s": (None, 60), "300s": (None, 300)}
+
+    def _last_screenshot_info(self):
+        if self._last_screenshot_png is not None:
+            return f"compressed ({len(self._last_screenshot_png) / 1048576:.1f} MiB PNG)"
+        img = self._last_screenshot
+        if img is None:
+            return "none"
+        bands = len(img.getbands()) if hasattr(img, "getbands") else 4
+        return f"{img.size[0]}x{img.size[1]} {getattr(img, 'mode', '?')} (~{img.size[0] * img.size[1] * bands / 1048576:.1f} MiB)"
+
+    def _icon_cache_info(self):
+        manager = get_icon_manager(create=False)
+        return manager.cache_stats() if manager is not None else "not loaded"
+
+    def _start_profiling(self, captures=None, seconds=None, cpu=True, memory=True):
+        session = get_profiler().start(captures=captures, seconds=seconds, cpu=cpu, memory=memory,
+                                       log_dir=str(self.logger.log_dir), on_finish=self._on_profiling_finished)
+        self.logger.info("Profiling started: %s", session.describe())
+        self._update_status(f"Profiling: {session.describe()}", ft.Colors.BLUE)
+        self._refresh_profile_controls()
+        return session
+
+    def _toggle_profiling(self, e=None):
+        # About page start/stop button
+        profiler = get_profiler()
+        if profiler.active:
+            profiler.stop()
+            return
+        captures, seconds = self.PROFILE_SCOPES.get(self.profile_scope_dropdown.value, (5, None))
+        cpu = bool(self.profile_cpu_checkbox.value)
+        memory = bool(self.profile_memory_checkbox.value)
+        if not cpu and not memory:
+            self._update_status("Select CPU and/or memory profiling", ft.Colors.ORANGE)
+            return
+        self._start_profiling(captures, seconds, cpu, memory)
+
+    def _toggle_profiling_from_tray(self):
+        # Tray menu item: profile the next 5 captures, or stop the running session
+        if get_profiler().active:
+            get_profiler().stop()
+        else:
+            self._start_profiling(captures=5)
+
+    def _on_profiling_finished(self, session):
+        self.logger.info("Profiling finished after %d capture(s); %d files in %s",
+                         session.count, len(session.files), session.log_dir)
+        self._update_status(f"Profiling finished: {session.count} capture(s), files in {session.log_dir}", ft.Colors.GREEN)
+        self._refresh_profile_controls()
+
+    def _refresh_profile_controls(self):
+        button = getattr(self, "profile_button", None)
+        if button is None:
+            return
+        active = get_profiler().active
+        button.text = "Stop profiling" if active else "Start profiling"
+        button.icon = ft.Icons.STOP_CIRCLE_OUTLINED if active else ft.Icons.PLAY_CIRCLE_OUTLINE
+        self.ui.mark(button)
+
+    # Toolbar icon picker
+    ICON_PICKER_LIMIT = 40
+    ICON_PREVIEW_CACHE = 512
+
+    def _select_toolbar_icon_target(self, action):
+        # Remember which toolbar button the next picked icon applies to
+        self.toolbar_icon_target = action
+
+    def _on_icon_search(self, e):
+        # Re-rank icons on every keystroke; the search index is built once per process
+        try:
+            names = get_icon_manager().search_icons(e.control.value or "", self.ICON_PICKER_LIMIT)
+            self.icon_results.controls = [self._icon_tile(name) for name in names]
+            self.ui.mark(self.icon_results)
+        except Exception as ex:
+            self.logger.warning(f"Icon search failed: {ex}")
+
+    def _icon_preview(self, name):
+        # Base64 PNG of an icon, kept in a small bounded cache
+        data = self._icon_previews.get(name)
+        if data is None:
+            import base64
+            import io
+            img = get_icon_manager().render_icon(name, RenderConfig(size=28, color=(51, 65, 85, 255)), shared=True)
+            buf = io.BytesIO()
+            img.save(buf, "PNG")
+            data = base64.b64encode(buf.getvalue()).decode("ascii")
+            if len(self._icon_previews) >= self.ICON_PREVIEW_CACHE:
+                self._icon_previews.pop(next(iter(self._icon_previews)))
+            self._icon_previews[name] = data
+        return data
+
+    def _icon_tile(self, name):
+        return ft.Container(
+            content=ft.Column([
+                ft.Image(src_base64=self._icon_preview(name), width=28, height=28),
+                ft.Text(name, size=10, color=ft.Colors.GREY_700, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS)
+            ], spacing=4, horizontal_alignment=ft.CrossAxisAlignment.CENTER, alignment=ft.MainAxisAlignment.CENTER),
+            tooltip=name,
+            padding=6,
+            border_radius=8,
+            bgcolor=ft.Colors.GREY_50,
+            border=ft.border.all(1, ft.Colors.GREY_200),
+            on_click=lambda e, n=name: self._pick_toolbar_icon(n)
+        )
+
+    def _pick_toolbar_icon(self, name):
+        field = getattr(self, "toolbar_icon_fields", {}).get(self.toolbar_icon_target)
+        if field is None:
+            return
+        field.value = name
+        self.ui.mark(field)
+        self._update_status(f"{self.toolbar_icon_target.capitalize()} icon set to {name} (apply to save)", ft.Colors.BLUE)
+
     def _show_snackbar(self, message, bgcolor=ft.Colors.BLUE_600):
         try:
             if not self.page:
@@ -695,7 +1140,7 @@ class ZSnaprApp:
                 behavior=ft.SnackBarBehavior.FLOATING
             )
             self.page.snack_bar.open = True
-            self.page.update()
+            self.ui.mark()
         except Exception:
             pass
 
@@ -716,9 +1161,8 @@ class ZSnaprApp:
 
     # Delegate all tray operations to TrayManager
     def _minimize_to_tray(self, e=None):
+        self._note_activity()
         self.tray_manager.minimize_to_tray()
-    def _start_tray_checker(self):
-        self.tray_manager.start_checker()
     def _restore_from_tray(self):
         self.tray_manager.restore_from_tray()
     def _on_tray_click(self):
@@ -736,8 +1180,7 @@ class ZSnaprApp:
                     e.control.bgcolor = hover_color
                 else:  # Mouse leave
                     e.control.bgcolor = ft.Colors.TRANSPARENT
-                if self.page:
-                    self.page.update()
+                self.ui.mark(e.control)
         except Exception:
             pass
 
@@ -750,9 +1193,41 @@ class ZSnaprApp:
             except Exception:
                 pass
 
+def _write_diagnostics_on_exit():
+    # Flush a trace or timing report still being recorded when the app exits
+    try:
+        if get_tracer().enabled:
+            get_tracer().stop()
+        if get_instrumentation().enabled and get_instrumentation().snapshot():
+            get_instrumentation().write_report()
+        get_profiler().stop()
+    except Exception:
+        pass
+
 def main():
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} screenshot tool")
+    parser.add_argument("--instrument", nargs="?", type=int, const=1, metavar="N",
+                        help="Collect function timing from startup, timing every Nth call (default 1)")
+    parser.add_argument("--trace", action="store_true", help="Record a timeline trace from startup")
+    parser.add_argument("--profile", metavar="SPEC",
+                        help="Profile the next N captures ('5') or a time window ('60s', '2m'); files go to logs/")
+    parser.add_argument("--profile-kind", choices=("cpu", "memory", "both"), default="both")
+    args, _ = parser.parse_known_args()
+    if args.instrument:
+        get_instrumentation().enable(args.instrument)
+    if args.trace:
+        get_tracer().start()
+    atexit.register(_write_diagnostics_on_exit)
+    
     app = ZSnaprApp()
-    ft.app(target=app.main)
+    if args.profile:
+        try:
+            captures, seconds = parse_profile_spec(args.profile)
+        except ValueError:
+            parser.error(f"invalid --profile value: {args.profile}")
+        app._start_profiling(captures, seconds, cpu=args.profile_kind in ("cpu", "both"),
+                             memory=args.profile_kind in ("memory", "both"))
+    ft.app(target=app.main, assets_dir=ASSETS_DIR)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -26,7 +26,8 @@ DEFAULT_SETTINGS = {
     "show_cursor": False,
     "delay_seconds": 0,
     "auto_copy_fullscreen": False,
-    "auto_copy_window": False
+    "auto_copy_window": False,
+    "idle_release_minutes": 10      # Release caches after this long idle in the tray (0 = never)
 }
 
 # Hotkeys
@@ -36,8 +37,16 @@ HOTKEYS = {
     "window": "ctrl+shift+w"
 }
 
+# Region selector toolbar icons (Material Symbols names)
+TOOLBAR_ICONS = {
+    "copy": "content_copy",
+    "save": "save",
+    "cancel": "close"
+}
+
 CONFIG_DIR = os.path.join("assets", "config")
 HOTKEYS_FILE = os.path.join(CONFIG_DIR, "hotkeys.json")
+TOOLBAR_ICONS_FILE = os.path.join(CONFIG_DIR, "toolbar_icons.json")
 
 def load_hotkeys():
     # Load hotkeys from file and merge into HOTKEYS
@@ -67,7 +76,36 @@ def save_hotkeys(hotkeys: dict):
     except Exception:
         pass
 
+def load_toolbar_icons():
+    # Load toolbar icon names from file and merge into TOOLBAR_ICONS
+    try:
+        if os.path.exists(TOOLBAR_ICONS_FILE):
+            with open(TOOLBAR_ICONS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                for k in ("copy", "save", "cancel"):
+                    v = data.get(k)
+                    if isinstance(v, str) and v.strip():
+                        TOOLBAR_ICONS[k] = v.strip()
+    except Exception:
+        pass
+    return TOOLBAR_ICONS
+
+def save_toolbar_icons(icons: dict):
+    # Persist toolbar icon names to file and update in-memory defaults
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        data = {k: str(icons.get(k, TOOLBAR_ICONS.get(k, ""))).strip() for k in ("copy", "save", "cancel")}
+        with open(TOOLBAR_ICONS_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        for k, v in data.items():
+            if v:
+                TOOLBAR_ICONS[k] = v
+    except Exception:
+        pass
+
 try:
     load_hotkeys()
+    load_toolbar_icons()
 except Exception:
     pass
\ No newline at end of file
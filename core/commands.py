@@ -0,0 +1,64 @@
+import queue
+import threading
+import time
+from core.log_sys import get_logger
+
+# Queue wait above this is logged; dispatch itself is a blocking get, so this only
+# fires when a handler on the dispatcher thread held things up
+SLOW_DISPATCH_MS = 50.0
+
+_STOP = object()
+
+
+class CommandBus:
+    # Single entry point for hotkeys, tray menu and UI. post() only enqueues, so it is safe
+    # from the keyboard hook thread; handlers run one at a time on the "CommandBus" thread,
+    # which blocks on the queue and never wakes while idle.
+
+    def __init__(self):
+        self._handlers = {}
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self.dispatched = 0
+        self.max_wait_ms = 0.0
+
+    def register(self, name, handler):
+        self._handlers[name] = handler
+
+    def post(self, name, *args):
+        self._queue.put((name, args, time.perf_counter()))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="CommandBus", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._queue.put(_STOP)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        logger = get_logger()
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            name, args, posted = item
+            wait_ms = (time.perf_counter() - posted) * 1000.0
+            self.dispatched += 1
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+            if wait_ms > SLOW_DISPATCH_MS:
+                logger.debug("Command %s waited %.1f ms in queue", name, wait_ms)
+            handler = self._handlers.get(name)
+            if handler is None:
+                logger.warning("No handler for command: %s", name)
+                continue
+            try:
+                handler(*args)
+            except Exception:
+                logger.exception("Command %s failed", name)
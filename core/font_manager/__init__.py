@@ -1,4 +1,5 @@
 # Font Manager Module
-from .icon_manager import MaterialSymbolsTTFManager, RenderConfig, IconVariations
+from .icon_manager import MaterialSymbolsTTFManager, RenderConfig, IconVariations, get_icon_manager
+from .icon_search import IconSearchIndex
 
-__all__ = ['MaterialSymbolsTTFManager', 'RenderConfig', 'IconVariations']
\ No newline at end of file
+__all__ = ['MaterialSymbolsTTFManager', 'RenderConfig', 'IconVariations', 'get_icon_manager', 'IconSearchIndex']
\ No newline at end of file
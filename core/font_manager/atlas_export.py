@@ -0,0 +1,205 @@
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from .icon_manager import DEFAULT_TTF, IconVariations, MaterialSymbolsTTFManager, RenderConfig
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "atlas.json"
+MIN_SHEET_ICONS = 256     # Do not split sheets below this many icons just to feed more workers
+MAX_SHEET_SIDE = 4096     # Pixel limit of one sprite sheet side
+
+# Per-process manager, created by the pool initializer
+_worker_manager: Optional[MaterialSymbolsTTFManager] = None
+
+
+def _init_worker(ttf_path: Optional[str], codepoints_file: Optional[str]) -> None:
+    global _worker_manager
+    # Results are written once, so the render caches would only cost memory
+    _worker_manager = MaterialSymbolsTTFManager(ttf_path, codepoints_file, cache_enabled=False)
+
+
+def _render_sheet(job: dict, manager: Optional[MaterialSymbolsTTFManager] = None) -> dict:
+    """Render one sprite sheet (and optional per-file PNGs) in a worker process or in-process."""
+    manager = manager or _worker_manager or MaterialSymbolsTTFManager(cache_enabled=False)
+    config: RenderConfig = job["config"]
+    variations: IconVariations = job["variations"]
+    cell = config.size + config.padding * 2
+    columns = job["columns"]
+    names = job["names"]
+    rows = max(1, math.ceil(len(names) / columns))
+
+    sheet = Image.new("RGBA", (columns * cell, rows * cell), (0, 0, 0, 0)) if job["sheet_path"] else None
+    frames: Dict[str, List[int]] = {}
+    failed: List[str] = []
+    for i, name in enumerate(names):
+        try:
+            img = manager.render_icon(name, config, variations, shared=True)
+        except Exception:
+            failed.append(name)
+            continue
+        x, y = (i % columns) * cell, (i // columns) * cell
+        if sheet is not None:
+            sheet.paste(img, (x, y))
+        frames[name] = [x, y, img.width, img.height]
+        if job["files_dir"]:
+            img.save(os.path.join(job["files_dir"], f"{name}_{config.size}.png"), config.format or "PNG")
+
+    if sheet is not None:
+        sheet.save(job["sheet_path"], "PNG")
+    return {
+        "file": os.path.basename(job["sheet_path"]) if sheet is not None else None,
+        "size": config.size,
+        "width": sheet.width if sheet is not None else 0,
+        "height": sheet.height if sheet is not None else 0,
+        "icons": frames,
+        "failed": failed,
+    }
+
+
+def _plan_sheets(names: Sequence[str], cell: int, workers: int) -> List[Tuple[List[str], int]]:
+    """Split names into (chunk, columns) sheets: at most MAX_SHEET_SIDE wide, enough chunks for every worker."""
+    per_side = max(1, MAX_SHEET_SIDE // cell)
+    capacity = per_side * per_side
+    chunk = min(capacity, max(MIN_SHEET_ICONS, math.ceil(len(names) / max(1, workers))))
+    plan = []
+    for start in range(0, len(names), chunk):
+        part = list(names[start:start + chunk])
+        plan.append((part, min(per_side, math.ceil(math.sqrt(len(part))))))
+    return plan
+
+
+def export_atlases(
+    output_dir: str,
+    icon_names: Optional[Iterable[str]] = None,
+    sizes: Sequence[int] = (24,),
+    config: Optional[RenderConfig] = None,
+    variations: Optional[IconVariations] = None,
+    sheets: bool = True,
+    per_file: bool = False,
+    workers: Optional[int] = None,
+    ttf_path: Optional[str] = None,
+    codepoints_file: Optional[str] = None,
+    manager: Optional[MaterialSymbolsTTFManager] = None,
+) -> dict:
+    """Render icons at each size across a process pool into sprite sheets and/or per-file PNGs.
+
+    Small exports (fewer than MIN_SHEET_ICONS icons in total, one job or one worker) render
+    in-process with manager instead of starting a pool. When sheets are written, atlas.json
+    next to them maps 'name@size' to its sheet and rect (the frame naming used by
+    modules.icon_atlas). Returns the manifest.
+    """
+    config = config or RenderConfig()
+    variations = variations or IconVariations()
+    workers = workers or os.cpu_count() or 1
+    if icon_names is None:
+        icon_names = MaterialSymbolsTTFManager(ttf_path, codepoints_file).list_available_icons()
+    names = list(dict.fromkeys(icon_names))
+
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    files_dirs = {}
+    if per_file:
+        for size in sizes:
+            files_dirs[size] = out / str(size) if len(sizes) > 1 else out
+            files_dirs[size].mkdir(parents=True, exist_ok=True)
+
+    jobs = []
+    for size in sizes:
+        size_config = replace(config, size=int(size))
+        cell = size_config.size + size_config.padding * 2
+        for index, (chunk, columns) in enumerate(_plan_sheets(names, cell, workers)):
+            jobs.append({
+                "names": chunk,
+                "columns": columns,
+                "config": size_config,
+                "variations": variations,
+                "sheet_path": str(out / f"icons_{size}_{index:02d}.png") if sheets else None,
+                "files_dir": str(files_dirs[size]) if per_file else None,
+            })
+
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1 or len(names) * len(sizes) < MIN_SHEET_ICONS:
+        # A pool would spend longer spawning interpreters and loading the font than rendering
+        workers = 1
+        manager = manager or MaterialSymbolsTTFManager(ttf_path, codepoints_file, cache_enabled=False)
+        results = [_render_sheet(job, manager) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                 initializer=_init_worker, initargs=(ttf_path, codepoints_file)) as pool:
+            results = list(pool.map(_render_sheet, jobs))
+    elapsed = time.perf_counter() - start
+
+    manifest = {
+        "font": Path(ttf_path).name if ttf_path else DEFAULT_TTF.name,
+        "color": list(config.color),
+        "padding": config.padding,
+        "variations": vars(variations),
+        "sheets": [],
+        "icons": {},
+    }
+    failed = set()
+    for result in results:
+        failed.update(result.pop("failed"))
+        sheet_index = len(manifest["sheets"])
+        if sheets:
+            manifest["sheets"].append({k: result[k] for k in ("file", "size", "width", "height")})
+        for name, rect in result["icons"].items():
+            entry = {}
+            if sheets:
+                entry["sheet"] = sheet_index
+                entry["rect"] = rect
+            if per_file:
+                folder = files_dirs[result["size"]].relative_to(out).as_posix()
+                filename = f"{name}_{result['size']}.png"
+                entry["file"] = filename if folder == "." else f"{folder}/{filename}"
+            manifest["icons"][f"{name}@{result['size']}"] = entry
+
+    if sheets:
+        (out / MANIFEST_NAME).write_text(json.dumps(manifest, separators=(",", ":")), encoding="utf-8")
+    logger.info(f"Exported {len(manifest['icons'])} icons ({len(sizes)} sizes, {len(jobs)} sheets) "
+                f"with {workers} workers in {elapsed:.2f}s to {out}")
+    if failed:
+        logger.warning(f"Skipped {len(failed)} icons: {', '.join(sorted(failed)[:10])}")
+    return manifest
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Export Material Symbols icons as sprite-sheet atlases.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[24])
+    parser.add_argument("--icons", nargs="*", help="Icon names (default: all)")
+    parser.add_argument("--color", default="000000ff", help="RGBA hex colour")
+    parser.add_argument("--padding", type=int, default=0)
+    parser.add_argument("--files", action="store_true", help="Also write one PNG per icon")
+    parser.add_argument("--no-sheets", action="store_true", help="Only write per-file PNGs")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    hex_color = args.color.lstrip("#")
+    hex_color = hex_color + "ff" if len(hex_color) == 6 else hex_color
+    color = tuple(int(hex_color[i:i + 2], 16) for i in range(0, 8, 2))
+    export_atlases(
+        args.output_dir,
+        icon_names=args.icons or None,
+        sizes=args.sizes,
+        config=RenderConfig(color=color, padding=args.padding),
+        sheets=not args.no_sheets,
+        per_file=args.files or args.no_sheets,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Compiled tables live with the other runtime caches (relative to the working directory)
+DEFAULT_INDEX_DIR = Path("assets") / "cache" / "icons"
+
+# Layout: header | (count + 1) u32 name offsets | count u32 codepoints | utf-8 names blob
+_MAGIC = b"ZSCP"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIqqI")  # magic, version, source mtime_ns, source size, count
+
+
+def parse_codepoints(filepath: Path) -> Dict[str, int]:
+    """Parse a 'icon_name HEXCODEPOINT' per line file into a normalized name map."""
+    table: Dict[str, int] = {}
+    with filepath.open("r", encoding="utf-8") as f:
+        for line in f:
+            s = line.strip()
+            if not s or s.startswith("#"):
+                continue
+            parts = s.split()
+            if len(parts) >= 2:
+                try:
+                    table[parts[0].lower().replace("-", "_")] = int(parts[1], 16)
+                except ValueError:
+                    continue
+    return table
+
+
+def compile_codepoints(table: Dict[str, int], mtime_ns: int, size: int) -> bytes:
+    """Serialize a name map into the sorted binary layout."""
+    names = sorted(table)
+    offsets = array("I", [0])
+    codepoints = array("I")
+    blob = bytearray()
+    for name in names:
+        blob += name.encode("utf-8")
+        offsets.append(len(blob))
+        codepoints.append(table[name])
+    header = _HEADER.pack(_MAGIC, _VERSION, mtime_ns, size, len(names))
+    return header + offsets.tobytes() + codepoints.tobytes() + bytes(blob)
+
+
+class _SortedNames:
+    """Sequence view of the sorted names, decoded on access (for bisect)."""
+
+    def __init__(self, index: "CodepointIndex"):
+        self._index = index
+
+    def __len__(self) -> int:
+        return self._index._count
+
+    def __getitem__(self, i: int) -> str:
+        return self._index._name(i)
+
+
+class CodepointIndex(Mapping):
+    """Read-only name -> codepoint mapping over a compiled, usually memory-mapped, table."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], source: Optional[Path] = None):
+        magic, version, self.source_mtime_ns, self.source_size, count = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a compiled codepoint table")
+        self._buffer = buffer
+        self._count = count
+        self.source = source
+        view = memoryview(buffer)
+        start = _HEADER.size
+        self._offsets = view[start:start + (count + 1) * 4].cast("I")
+        start += (count + 1) * 4
+        self._codepoints = view[start:start + count * 4].cast("I")
+        self._names_start = start + count * 4
+        self._sorted = _SortedNames(self)
+
+    @classmethod
+    def load(cls, source: Path, index_dir: Path = DEFAULT_INDEX_DIR) -> "CodepointIndex":
+        """Map the compiled table for source, recompiling it when the source changed."""
+        stat = source.stat()
+        compiled = Path(index_dir) / f"{source.stem}.cpidx"
+        index = cls._open(compiled, source)
+        if index is not None and index.source_mtime_ns == stat.st_mtime_ns and index.source_size == stat.st_size:
+            return index
+        if index is not None:
+            index.close()
+
+        data = compile_codepoints(parse_codepoints(source), stat.st_mtime_ns, stat.st_size)
+        try:
+            compiled.parent.mkdir(parents=True, exist_ok=True)
+            tmp = compiled.with_name(f"{compiled.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, compiled)
+            logger.info(f"Compiled codepoint index: {compiled}")
+        except OSError as e:
+            # Another process may hold the old file mapped; serve this run from memory
+            logger.warning(f"Codepoint index not written ({e}); using in-memory table")
+            return cls(data, source)
+        return cls._open(compiled, source) or cls(data, source)
+
+    @classmethod
+    def _open(cls, compiled: Path, source: Path) -> Optional["CodepointIndex"]:
+        try:
+            with compiled.open("rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(mapped, source)
+        except (ValueError, struct.error):
+            mapped.close()
+            return None
+
+    def close(self) -> None:
+        """Release the memory views and the mapping."""
+        self._offsets.release()
+        self._codepoints.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def _name(self, i: int) -> str:
+        start = self._names_start
+        return bytes(self._buffer[start + self._offsets[i]:start + self._offsets[i + 1]]).decode("utf-8")
+
+    def _find(self, name: str) -> int:
+        i = bisect.bisect_left(self._sorted, name)
+        if i < self._count and self._name(i) == name:
+            return i
+        return -1
+
+    def __getitem__(self, name: str) -> int:
+        i = self._find(name)
+        if i < 0:
+            raise KeyError(name)
+        return self._codepoints[i]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._find(name) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._name(i)
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def sorted_names(self) -> _SortedNames:
+        """Names in sorted order as a lazily decoded sequence."""
+        return self._sorted
@@ -1,11 +1,16 @@
 
 import logging
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Mapping, Optional, Tuple
 
 from PIL import Image, ImageDraw, ImageFont
 
+from .codepoint_index import CodepointIndex, parse_codepoints
+from .icon_search import IconSearchIndex
+
 # Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,6 +41,66 @@ class RenderConfig:
     format: str = "PNG"                                          # PNG, JPEG, ...
 
 
+class ByteBoundedLRU:
+    """Thread-safe LRU cache of PIL images bounded by total pixel bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[Hashable, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _cost(image: Image.Image) -> int:
+        return image.width * image.height * len(image.getbands())
+
+    def get(self, key: Hashable) -> Optional[Image.Image]:
+        """Return the cached image and mark it most recently used, or None."""
+        with self._lock:
+            image = self._items.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key: Hashable, image: Image.Image) -> None:
+        """Insert an image, evicting least recently used entries over the byte budget."""
+        cost = self._cost(image)
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= self._cost(old)
+            self._items[key] = image
+            self.bytes += cost
+            while self.bytes > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self.bytes -= self._cost(evicted)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._items),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
 class MaterialSymbolsTTFManager:
     """Local TTF icon manager for Material Symbols Outlined variable font."""
 
@@ -46,6 +111,8 @@ class MaterialSymbolsTTFManager:
         ttf_path: Optional[str] = None,
         codepoints_file: Optional[str] = None,
         cache_enabled: bool = True,
+        mask_cache_bytes: int = 4 * 1024 * 1024,
+        image_cache_bytes: int = 8 * 1024 * 1024,
     ):
         """Initialize manager and try to load codepoints from file."""
         # Resolve font path
@@ -55,42 +122,56 @@ class MaterialSymbolsTTFManager:
 
         self.cache_enabled = cache_enabled
         self._font_cache: Dict[Tuple, ImageFont.FreeTypeFont] = {}
-        self._image_cache: Dict[str, Image.Image] = {}
-
-        # Use codepoints file only (ignore built-in fallback map)
-        self.ICON_CODEPOINTS = {}
-
-        # Load extra codepoints if available; default to local file if not given
-        cp_path = Path(codepoints_file) if codepoints_file else DEFAULT_CODEPOINTS
-        if cp_path.exists():
-            self._load_codepoints(cp_path)
-        else:
-            logger.warning(f"Codepoints file not found: {cp_path}")
-
-        logger.info(f"Manager ready. Font: {self.ttf_path.name if self.ttf_path.exists() else 'MISSING'}, "
-                    f"icons: {len(self.ICON_CODEPOINTS)}")
-
-    def _load_codepoints(self, filepath: Path) -> None:
+        # Glyph alpha masks (one per size/variation) and tinted results, both byte-bounded
+        self._mask_cache = ByteBoundedLRU(mask_cache_bytes)
+        self._image_cache = ByteBoundedLRU(image_cache_bytes)
+
+        # Serialises FreeType access when one manager is shared across threads
+        self._render_lock = threading.RLock()
+
+        # Codepoints file only (ignore built-in fallback map); mapped lazily on first lookup
+        self.codepoints_path = Path(codepoints_file) if codepoints_file else DEFAULT_CODEPOINTS
+        self._codepoints: Optional[Mapping[str, int]] = None
+        self._search_index: Optional[IconSearchIndex] = None
+
+        logger.debug(f"Manager ready. Font: {self.ttf_path.name if self.ttf_path.exists() else 'MISSING'}")
+
+    @property
+    def ICON_CODEPOINTS(self) -> Mapping[str, int]:
+        """Name -> codepoint mapping, loaded from the compiled index on first access."""
+        if self._codepoints is None:
+            with self._render_lock:
+                if self._codepoints is None:
+                    self._codepoints = self._load_codepoints(self.codepoints_path)
+        return self._codepoints
+
+    @property
+    def search_index(self) -> IconSearchIndex:
+        """Trigram search index over all icon names, built on first use."""
+        if self._search_index is None:
+            with self._render_lock:
+                if self._search_index is None:
+                    self._search_index = IconSearchIndex(self.ICON_CODEPOINTS.keys())
+        return self._search_index
+
+    def _load_codepoints(self, filepath: Path) -> Mapping[str, int]:
         """Load codepoints mapping. Format: 'icon_name HEXCODEPOINT' per line."""
-        loaded = 0
+        if not filepath.exists():
+            logger.warning(f"Codepoints file not found: {filepath}")
+            return {}
+        try:
+            index = CodepointIndex.load(filepath)
+            logger.info(f"Mapped {len(index)} codepoints for {filepath.name}")
+            return index
+        except Exception as e:
+            logger.warning(f"Codepoint index unavailable, parsing text file: {e}")
         try:
-            with filepath.open("r", encoding="utf-8") as f:
-                for line in f:
-                    s = line.strip()
-                    if not s or s.startswith("#"):
-                        continue
-                    parts = s.split()
-                    if len(parts) >= 2:
-                        name = parts[0].lower().replace("-", "_")
-                        try:
-                            codepoint = int(parts[1], 16)
-                            self.ICON_CODEPOINTS[name] = codepoint
-                            loaded += 1
-                        except ValueError:
-                            continue
-            logger.info(f"Loaded {loaded} codepoints from {filepath.name}")
+            table = parse_codepoints(filepath)
+            logger.info(f"Loaded {len(table)} codepoints from {filepath.name}")
+            return table
         except Exception as e:
             logger.error(f"Failed to load codepoints: {e}")
+            return {}
 
     def get_font(self, size: int = 24, variations: Optional[IconVariations] = None) -> ImageFont.FreeTypeFont:
         """Return a PIL FreeTypeFont configured with variable axes if supported."""
@@ -123,44 +204,97 @@ class MaterialSymbolsTTFManager:
         normalized = icon_name.lower().replace("-", "_")
         return self.ICON_CODEPOINTS.get(normalized)
 
-    def render_icon(
+    def render_mask(
         self,
         icon_name: str,
-        config: Optional[RenderConfig] = None,
+        size: int = 24,
+        padding: int = 0,
         variations: Optional[IconVariations] = None,
     ) -> Image.Image:
-        """Render an icon to a PIL Image."""
-        config = config or RenderConfig()
+        """Rasterise a glyph once into a shared 'L' alpha mask (do not modify)."""
         variations = variations or IconVariations()
-
         codepoint = self.get_icon_unicode(icon_name)
         if codepoint is None:
             raise ValueError(f"Unknown icon name: {icon_name}")
 
-        cache_key = f"{icon_name}|{config.size}|{config.color}|{config.background}|{config.padding}|{variations}"
-        if self.cache_enabled and cache_key in self._image_cache:
-            return self._image_cache[cache_key].copy()
+        cache_key = (codepoint, size, padding, variations)
+        if self.cache_enabled:
+            mask = self._mask_cache.get(cache_key)
+            if mask is not None:
+                return mask
+
+        with self._render_lock:
+            font = self.get_font(size, variations)
+            img_size = size + (padding * 2)
+            mask = Image.new("L", (img_size, img_size), 0)
+            draw = ImageDraw.Draw(mask)
+
+            char = chr(codepoint)
+            bbox = draw.textbbox((0, 0), char, font=font)
+            text_w = bbox[2] - bbox[0]
+            text_h = bbox[3] - bbox[1]
+            x = (img_size - text_w) // 2 - bbox[0]
+            y = (img_size - text_h) // 2 - bbox[1]
+            draw.text((x, y), char, fill=255, font=font)
+
+        if self.cache_enabled:
+            self._mask_cache.put(cache_key, mask)
+        return mask
+
+    @staticmethod
+    def tint_mask(
+        mask: Image.Image,
+        color: Tuple[int, int, int, int],
+        background: Optional[Tuple[int, int, int, int]] = None,
+    ) -> Image.Image:
+        """Colour an alpha mask, optionally composited over a solid background."""
+        r, g, b, a = color
+        alpha = mask if a >= 255 else mask.point([v * a // 255 for v in range(256)])
+        channels = [Image.new("L", mask.size, c) for c in (r, g, b)]
+        image = Image.merge("RGBA", (*channels, alpha))
+        if background:
+            base = Image.new("RGBA", mask.size, background)
+            image = Image.alpha_composite(base, image)
+        return image
 
-        font = self.get_font(config.size, variations)
+    def render_icon(
+        self,
+        icon_name: str,
+        config: Optional[RenderConfig] = None,
+        variations: Optional[IconVariations] = None,
+        shared: bool = False,
+    ) -> Image.Image:
+        """Render an icon to a PIL Image.
 
-        img_size = config.size + (config.padding * 2)
-        bg = config.background if config.background else (255, 255, 255, 0)
-        image = Image.new("RGBA", (img_size, img_size), bg)
-        draw = ImageDraw.Draw(image)
+        With shared=True the cached image itself is returned and must be treated as read-only.
+        """
+        config = config or RenderConfig()
+        variations = variations or IconVariations()
 
-        char = chr(codepoint)
-        bbox = draw.textbbox((0, 0), char, font=font)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
-        x = (img_size - text_w) // 2 - bbox[0]
-        y = (img_size - text_h) // 2 - bbox[1]
+        cache_key = (icon_name, config.size, config.color, config.background, config.padding, variations)
+        if self.cache_enabled:
+            image = self._image_cache.get(cache_key)
+            if image is not None:
+                return image if shared else image.copy()
 
-        draw.text((x, y), char, fill=config.color, font=font)
+        mask = self.render_mask(icon_name, config.size, config.padding, variations)
+        image = self.tint_mask(mask, config.color, config.background)
 
         if self.cache_enabled:
-            self._image_cache[cache_key] = image.copy()
+            self._image_cache.put(cache_key, image)
+            if not shared:
+                return image.copy()
         return image
 
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss/eviction statistics of the mask and image caches."""
+        return {"masks": self._mask_cache.stats(), "images": self._image_cache.stats()}
+
+    def clear_caches(self) -> None:
+        """Drop cached masks and tinted images (fonts are kept)."""
+        self._mask_cache.clear()
+        self._image_cache.clear()
+
     def save_icon(
         self,
         icon_name: str,
@@ -169,7 +303,7 @@ class MaterialSymbolsTTFManager:
         variations: Optional[IconVariations] = None,
     ) -> None:
         """Render and save icon image."""
-        img = self.render_icon(icon_name, config, variations)
+        img = self.render_icon(icon_name, config, variations, shared=True)
         fmt = (config.format if config else "PNG") or "PNG"
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
         img.save(output_path, fmt)
@@ -181,25 +315,40 @@ class MaterialSymbolsTTFManager:
         output_dir: str,
         config: Optional[RenderConfig] = None,
         variations: Optional[IconVariations] = None,
+        workers: Optional[int] = None,
     ) -> None:
-        """Batch render icons."""
-        out = Path(output_dir)
-        out.mkdir(parents=True, exist_ok=True)
-        for name in icon_names:
-            try:
-                filename = f"{name}_{config.size if config else 24}.png"
-                self.save_icon(name, str(out / filename), config, variations)
-            except Exception as e:
-                logger.error(f"Skip {name}: {e}")
+        """Batch render icons to one PNG per icon; large batches run in parallel (see export_atlas)."""
+        config = config or RenderConfig()
+        self.export_atlas(output_dir, icon_names, [config.size], config, variations,
+                          sheets=False, per_file=True, workers=workers)
+
+    def export_atlas(
+        self,
+        output_dir: str,
+        icon_names: Optional[List[str]] = None,
+        sizes: Tuple[int, ...] = (24,),
+        config: Optional[RenderConfig] = None,
+        variations: Optional[IconVariations] = None,
+        sheets: bool = True,
+        per_file: bool = False,
+        workers: Optional[int] = None,
+    ) -> dict:
+        """Export icons (default: all) as sprite sheets plus a JSON manifest, using a process pool for large exports."""
+        from .atlas_export import export_atlases
+        return export_atlases(output_dir, icon_names, sizes, config, variations, sheets, per_file,
+                              workers, str(self.ttf_path), str(self.codepoints_path), manager=self)
 
     def list_available_icons(self) -> List[str]:
         """Return all available icon names sorted."""
-        return sorted(self.ICON_CODEPOINTS.keys())
+        return list(self.search_index.names)
+
+    def search_icons(self, keyword: str, limit: Optional[int] = None) -> List[str]:
+        """Return icon names matching keyword, best matches first (typo tolerant)."""
+        return self.search_index.search(keyword, limit)
 
-    def search_icons(self, keyword: str) -> List[str]:
-        """Return icon names containing keyword."""
-        kw = keyword.lower()
-        return [n for n in self.ICON_CODEPOINTS.keys() if kw in n]
+    def prefix_icons(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Return icon names starting with prefix, sorted."""
+        return self.search_index.prefix(prefix, limit)
 
     def get_icon_as_text(self, icon_name: str) -> str:
         """Return the icon as a single-character string."""
@@ -283,6 +432,23 @@ class MaterialSymbolsTTFManager:
         logger.info(f"HTML demo saved: {output_file}")
 
 
+_shared_manager: Optional[MaterialSymbolsTTFManager] = None
+_shared_lock = threading.Lock()
+
+
+def get_icon_manager(create: bool = True) -> Optional[MaterialSymbolsTTFManager]:
+    """Return the process-wide manager (default font and codepoints), creating it once.
+
+    With create=False, returns None instead of creating it (for diagnostics).
+    """
+    global _shared_manager
+    if _shared_manager is None and create:
+        with _shared_lock:
+            if _shared_manager is None:
+                _shared_manager = MaterialSymbolsTTFManager()
+    return _shared_manager
+
+
 if __name__ == "__main__":
     # Quick smoke test example (paths auto-resolve to local icons directory)
     manager = MaterialSymbolsTTFManager()
@@ -295,4 +461,4 @@ if __name__ == "__main__":
         manager.batch_render(["search", "settings", "notifications", "person", "menu"], str(BASE_DIR / "preview"), cfg)
         logger.info("Preview icons rendered in 'core/font_manager/preview'")
     except Exception as e:
-        logger.error(f"Smoke test failed: {e}")
\ No newline at end of file
+        logger.error(f"Smoke test failed: {e}")
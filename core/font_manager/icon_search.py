@@ -0,0 +1,87 @@
+
+import bisect
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def normalize_query(text: str) -> str:
+    """Lower-case and map spaces/dashes onto the '_' used in icon names."""
+    return "_".join(text.strip().lower().replace("-", " ").split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Space-padded trigrams, so word starts and ends count as grams."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class IconSearchIndex:
+    """Trigram index over icon names with prefix lookup and ranked fuzzy search."""
+
+    MIN_SIMILARITY = 0.5   # Share of query trigrams a fuzzy hit must contain
+    SHORT_QUERY = 3        # Shorter queries fall back to prefix + substring matching
+
+    # Match tiers, best first
+    EXACT, PREFIX, SUBSTRING, FUZZY = 3, 2, 1, 0
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = sorted(names)
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in trigrams(name):
+                postings[gram].append(i)
+        self._postings = dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_range(self, prefix: str) -> range:
+        lo = bisect.bisect_left(self.names, prefix)
+        hi = bisect.bisect_left(self.names, prefix + "\uffff", lo)
+        return range(lo, hi)
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Names starting with prefix, in sorted order."""
+        ids = self._prefix_range(normalize_query(prefix))
+        if limit is not None:
+            ids = ids[:limit]
+        return [self.names[i] for i in ids]
+
+    def search(self, query: str, limit: Optional[int] = 50) -> List[str]:
+        """Rank names for query: exact, prefix, substring, then trigram similarity."""
+        q = normalize_query(query)
+        if not q:
+            return self.names[:limit] if limit is not None else list(self.names)
+
+        scores: Dict[int, float] = {}
+        if len(q) < self.SHORT_QUERY:
+            for i, name in enumerate(self.names):
+                if q in name:
+                    scores[i] = 0.0
+        else:
+            grams = trigrams(q)
+            counts: Dict[int, int] = defaultdict(int)
+            for gram in grams:
+                for i in self._postings.get(gram, ()):
+                    counts[i] += 1
+            need = self.MIN_SIMILARITY * len(grams)
+            for i, shared in counts.items():
+                if shared >= need or q in self.names[i]:
+                    scores[i] = shared / len(grams)
+
+        ranked = []
+        for i, similarity in scores.items():
+            name = self.names[i]
+            if name == q:
+                tier = self.EXACT
+            elif name.startswith(q):
+                tier = self.PREFIX
+            elif q in name:
+                tier = self.SUBSTRING
+            else:
+                tier = self.FUZZY
+            ranked.append((-tier, -similarity, len(name), name))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [item[3] for item in ranked]
@@ -1,3 +1,4 @@
+import time
 import keyboard
 from config import load_hotkeys
 
@@ -14,15 +15,17 @@ def unregister():
     _hotkey_handles = []
 
 def register(app, mappings=None):
-    # Register global hotkeys binding to app handlers
+    # Register global hotkeys; callbacks run on the keyboard hook thread, so they only
+    # post to the command bus (with the press time) and the handlers run on its dispatcher thread
     global _hotkey_handles
     try:
         if _hotkey_handles:
             unregister()
         hk = mappings or load_hotkeys()
-        h1 = keyboard.add_hotkey(hk["fullscreen"], app._hotkey_fullscreen)
-        h2 = keyboard.add_hotkey(hk["region"], app._hotkey_region)
-        h3 = keyboard.add_hotkey(hk["window"], app._hotkey_window)
+        post = app.commands.post
+        h1 = keyboard.add_hotkey(hk["fullscreen"], lambda: post("hotkey_fullscreen", time.perf_counter()))
+        h2 = keyboard.add_hotkey(hk["region"], lambda: post("hotkey_region", time.perf_counter()))
+        h3 = keyboard.add_hotkey(hk["window"], lambda: post("hotkey_window", time.perf_counter()))
         _hotkey_handles = [h1, h2, h3]
     except Exception as e:
         print(f"Failed to setup hotkeys: {e}")
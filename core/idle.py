@@ -0,0 +1,54 @@
+import threading
+import time
+
+
+class IdleMonitor:
+    # Calls on_idle once after `delay` seconds without activity while condition() holds;
+    # any activity (touch) re-arms it. delay <= 0 disables it.
+
+    def __init__(self, delay, on_idle, condition=None):
+        self.delay = float(delay)
+        self.on_idle = on_idle
+        self.condition = condition or (lambda: True)
+        self.idle = False
+        self._last_activity = time.monotonic()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="IdleMonitor", daemon=True)
+        self._thread.start()
+
+    def touch(self):
+        # Record activity; leaves idle state and restarts the countdown
+        self._last_activity = time.monotonic()
+        self.idle = False
+        self._wake.set()
+
+    def set_delay(self, delay):
+        self.delay = float(delay)
+        self._wake.set()
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            if self.delay <= 0 or self.idle:
+                timeout = None
+            else:
+                timeout = max(0.0, self._last_activity + self.delay - time.monotonic())
+            self._wake.wait(timeout)
+            self._wake.clear()
+            if self._stopped or self.idle or self.delay <= 0:
+                continue
+            if time.monotonic() - self._last_activity < self.delay:
+                continue
+            if not self.condition():
+                # Not eligible (e.g. window visible); check again after another period
+                self._last_activity = time.monotonic()
+                continue
+            self.idle = True
+            try:
+                self.on_idle()
+            except Exception:
+                pass
@@ -1,5 +1,9 @@
 # Log system for ZSnapr
-from .logger import Logger, get_logger, LogOperation
+from .logger import Logger, get_logger, LogOperation, log_function
+from .instrument import get_instrumentation
+from .profiling import get_profiler
+from .tracing import get_tracer
 from .auto_clean import auto_cleanup_logs, CleanupStrategy, SmartLogCleaner
+from .log_query import LogQuery
 
-__all__ = ['Logger', 'get_logger', 'LogOperation', 'auto_cleanup_logs', 'CleanupStrategy', 'SmartLogCleaner']
\ No newline at end of file
+__all__ = ['Logger', 'get_logger', 'LogOperation', 'auto_cleanup_logs', 'CleanupStrategy', 'SmartLogCleaner', 'LogQuery', 'get_tracer', 'log_function', 'get_instrumentation', 'get_profiler']
\ No newline at end of file
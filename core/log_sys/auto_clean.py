@@ -1,12 +1,53 @@
+import gzip
+import json
 import os
+import re
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
+# Cached scan results, stored in the log directory and rewritten in place
+MANIFEST_NAME = ".cleaner_manifest.json"
+# Rotation backups of the active JSON-lines log (zSnapr.jsonl.1, .2, ...)
+ROTATED_RE = re.compile(r"\.jsonl\.\d+$")
+# Rotation backups renamed by the compressor before gzipping (zSnapr_20250101_101010[_1].jsonl)
+CLAIMED_RE = re.compile(r"_\d{8}_\d{6}(_\d+)?\.jsonl$")
+COMPRESS_CHUNK = 1024 * 1024
+# Partial .gz.tmp files older than this are left over from an interrupted compressor
+STALE_TMP_SECONDS = 300
+_UNPARSED = object()
+
+def _is_managed(name: str) -> bool:
+    # Files the cleaner may compress or delete; the active zSnapr.jsonl is never touched
+    return (name.endswith((".log", ".gz")) or ROTATED_RE.search(name) is not None
+            or CLAIMED_RE.search(name) is not None)
+
+def _name_timestamp(name: str) -> Optional[float]:
+    # Timestamp embedded in names like zSnapr_20250101_101010.log[.gz], parsed once per file
+    parts = name.split(".")[0].split("_")
+    for i in range(len(parts) - 1):
+        day, clock = parts[i], parts[i + 1]
+        if len(day) == 8 and len(clock) == 6 and day.isdigit() and clock.isdigit():
+            try:
+                return time.mktime((int(day[:4]), int(day[4:6]), int(day[6:]),
+                                    int(clock[:2]), int(clock[2:4]), int(clock[4:]), 0, 0, -1))
+            except (OverflowError, ValueError):
+                return None
+    return None
+
+def _lower_thread_priority():
+    # Best effort: run the compressor at idle priority on Windows
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), -2)  # THREAD_PRIORITY_LOWEST
+    except Exception:
+        pass
+
 class CleanupStrategy(Enum):
     # Different cleanup strategies
     CONSERVATIVE = "conservative"  # Keep more logs, slower cleanup
@@ -15,12 +56,39 @@ class CleanupStrategy(Enum):
 
 @dataclass
 class LogFileInfo:
-    # Information about a log file
-    path: Path
+    # Information about a log file; path, datetimes and name timestamp are derived only on access
+    name: str
+    directory: Path
     size_bytes: int
-    created_time: datetime
-    modified_time: datetime
-    age_hours: float
+    created_ts: float
+    modified_ts: float
+    _name_ts: object = field(default=_UNPARSED, repr=False, compare=False)
+    
+    @property
+    def path(self) -> Path:
+        return self.directory / self.name
+    
+    @property
+    def name_ts(self) -> Optional[float]:
+        if self._name_ts is _UNPARSED:
+            self._name_ts = _name_timestamp(self.name)
+        return self._name_ts
+    
+    @property
+    def created_time(self) -> datetime:
+        return datetime.fromtimestamp(self.created_ts)
+    
+    @property
+    def modified_time(self) -> datetime:
+        return datetime.fromtimestamp(self.modified_ts)
+    
+    @property
+    def age_hours(self) -> float:
+        return (time.time() - self.modified_ts) / 3600
+    
+    @property
+    def compressed(self) -> bool:
+        return self.name.endswith(".gz")
     
     @property
     def size_mb(self) -> float:
@@ -45,9 +113,17 @@ class SmartLogCleaner:
         self.stats = {
             "files_deleted": 0,
             "bytes_freed": 0,
+            "files_compressed": 0,
+            "bytes_saved_by_compression": 0,
             "last_cleanup": None,
             "total_cleanups": 0
         }
+        
+        # Manifest: file name -> LogFileInfo, refreshed incrementally from os.scandir
+        self._files: Optional[Dict[str, LogFileInfo]] = None
+        self._dir_mtime_ns = None
+        self._manifest_dirty = False
+        self._compressor = None
     
     def _get_strategy_config(self, strategy: CleanupStrategy) -> Dict:
         # Get configuration based on cleanup strategy
@@ -59,6 +135,7 @@ class SmartLogCleaner:
                 "max_age_days": 30,         # Delete files older than 30 days
                 "size_threshold_mb": 5,     # Delete large files (>5MB) more aggressively
                 "keep_recent_hours": 24,    # Always keep files from last 24 hours
+                "compress_after_hours": 48, # Gzip files older than 48 hours
                 "cleanup_interval_hours": 24 # Run cleanup every 24 hours
             },
             CleanupStrategy.BALANCED: {
@@ -68,6 +145,7 @@ class SmartLogCleaner:
                 "max_age_days": 14,         # Delete files older than 14 days
                 "size_threshold_mb": 2,     # Delete large files (>2MB) more aggressively
                 "keep_recent_hours": 12,    # Always keep files from last 12 hours
+                "compress_after_hours": 24, # Gzip files older than 24 hours
                 "cleanup_interval_hours": 12 # Run cleanup every 12 hours
             },
             CleanupStrategy.AGGRESSIVE: {
@@ -77,39 +155,204 @@ class SmartLogCleaner:
                 "max_age_days": 3,          # Delete files older than 3 days
                 "size_threshold_mb": 0.5,   # Delete large files (>0.5MB) more aggressively
                 "keep_recent_hours": 6,   # Always keep files from last 6 h
+                "compress_after_hours": 6,  # Gzip files older than 6 hours
                 "cleanup_interval_hours": 2  # Run cleanup every 2 hours
             }
         }
         return configs[strategy]
     
     def scan_log_files(self) -> List[LogFileInfo]:
-        # Scan and analyze all log files
+        # Return all managed log files from the incrementally refreshed manifest
+        with self.lock:
+            self._refresh_manifest()
+            return list(self._files.values()) if self._files else []
+    
+    def _manifest_path(self) -> Path:
+        return self.log_dir / MANIFEST_NAME
+    
+    def _load_manifest(self):
+        # Load the persisted manifest; any problem just means a full scan
+        self._files = {}
+        try:
+            data = json.loads(self._manifest_path().read_text(encoding="utf-8"))
+            for name, size, ctime, mtime in data["files"]:
+                self._files[name] = LogFileInfo(name, self.log_dir, size, ctime, mtime)
+            self._dir_mtime_ns = data["dir_mtime_ns"]
+        except Exception:
+            self._files = {}
+            self._dir_mtime_ns = None
+    
+    def save_manifest(self):
+        # Persist the manifest so the next process starts from it instead of a full scan
+        with self.lock:
+            self._save_manifest()
+    
+    def _save_manifest(self):
+        # Rewrite in place (no temp file) so saving does not change the directory mtime
+        if not self._manifest_dirty or self._files is None:
+            return
+        data = {
+            "dir_mtime_ns": self._dir_mtime_ns,
+            "files": [[name, f.size_bytes, f.created_ts, f.modified_ts] for name, f in self._files.items()]
+        }
+        try:
+            text = json.dumps(data, separators=(",", ":"))
+            with open(self._manifest_path(), "w", encoding="utf-8") as fh:
+                fh.write(text)
+            self._manifest_dirty = False
+        except OSError as e:
+            print(f"Error writing log manifest: {e}")
+    
+    def _stat_entry(self, name: str, stat) -> LogFileInfo:
+        return LogFileInfo(name, self.log_dir, stat.st_size, stat.st_ctime, stat.st_mtime)
+    
+    def _refresh_manifest(self):
+        # Rescan only when the directory changed; stat only new names, rotation backups and recent files
         if not self.log_dir.exists():
-            return []
+            self._files = {}
+            return
+        if self._files is None:
+            self._sweep_interrupted()
+            self._load_manifest()
+        dir_mtime_ns = os.stat(self.log_dir).st_mtime_ns
+        recent_cutoff = time.time() - self.config["keep_recent_hours"] * 3600
         
-        log_files = []
-        current_time = datetime.now()
+        if dir_mtime_ns != self._dir_mtime_ns:
+            seen = set()
+            files = self._files
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    known = files.get(name)
+                    if (known is not None and known.modified_ts < recent_cutoff
+                            and (name.endswith((".log", ".gz")) or CLAIMED_RE.search(name))):
+                        seen.add(name)  # Timestamped and compressed logs never change
+                        continue
+                    if not _is_managed(name):
+                        continue
+                    seen.add(name)
+                    if known is None or ROTATED_RE.search(name) or known.modified_ts >= recent_cutoff:
+                        try:
+                            self._files[name] = self._stat_entry(name, entry.stat())
+                        except OSError as e:
+                            print(f"Error scanning {entry.path}: {e}")
+                            continue
+                        self._manifest_dirty = True
+            for name in [n for n in files if n not in seen]:
+                del self._files[name]
+                self._manifest_dirty = True
+            self._dir_mtime_ns = dir_mtime_ns
+            if not self._manifest_path().exists():
+                # Creating the manifest touches the directory; record the mtime after it exists
+                self._save_manifest()
+                self._dir_mtime_ns = os.stat(self.log_dir).st_mtime_ns
+                self._manifest_dirty = True
+            return
         
-        for file_path in self.log_dir.glob("*.log"):
+        # Directory unchanged: only files that may still be growing need a fresh stat
+        for name, info in self._files.items():
+            if info.modified_ts >= recent_cutoff:
+                try:
+                    self._files[name] = self._stat_entry(name, os.stat(info.path))
+                except OSError:
+                    continue
+    
+    def _sweep_interrupted(self):
+        # The compressor is a daemon thread, so an exit mid-file can leave a partial .gz.tmp,
+        # or a source next to its finished .gz; drop both (claimed backups are managed names)
+        now = time.time()
+        try:
+            with os.scandir(self.log_dir) as entries:
+                names = {entry.name: entry for entry in entries}
+        except OSError:
+            return
+        for name, entry in names.items():
             try:
-                stat = file_path.stat()
-                created_time = datetime.fromtimestamp(stat.st_ctime)
-                modified_time = datetime.fromtimestamp(stat.st_mtime)
-                age_hours = (current_time - modified_time).total_seconds() / 3600
-                
-                log_info = LogFileInfo(
-                    path=file_path,
-                    size_bytes=stat.st_size,
-                    created_time=created_time,
-                    modified_time=modified_time,
-                    age_hours=age_hours
-                )
-                log_files.append(log_info)
-            except (OSError, ValueError) as e:
-                print(f"Error scanning {file_path}: {e}")
-                continue
+                if name.endswith(".gz.tmp"):
+                    if now - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                        os.unlink(entry.path)
+                elif name + ".gz" in names and _is_managed(name) and not name.endswith(".gz"):
+                    os.unlink(entry.path)
+            except OSError as e:
+                print(f"Error removing leftover {entry.path}: {e}")
+    
+    def _forget(self, name: str):
+        if self._files is not None and self._files.pop(name, None) is not None:
+            self._manifest_dirty = True
+    
+    def compress_old_logs(self, blocking: bool = False) -> int:
+        # Gzip uncompressed logs older than compress_after_hours (but not yet due for deletion by age);
+        # runs in a background thread by default
+        if blocking and self._compressor is not None:
+            self._compressor.join()
+        with self.lock:
+            self._refresh_manifest()
+            limit = self.config["compress_after_hours"]
+            max_age = self.config["max_age_days"] * 24
+            candidates = [f for f in (self._files or {}).values()
+                          if not f.compressed and limit < f.age_hours <= max_age]
+        if not candidates:
+            return 0
+        if blocking:
+            self._compress_files(candidates)
+            return len(candidates)
+        if self._compressor is not None and self._compressor.is_alive():
+            return 0
+        self._compressor = threading.Thread(target=self._compress_files, args=(candidates,),
+                                            name="LogCompressor", daemon=True)
+        self._compressor.start()
+        return len(candidates)
+    
+    def _compress_files(self, candidates: List[LogFileInfo]):
+        _lower_thread_priority()
+        for info in candidates:
+            try:
+                self._compress_file(info)
+            except OSError as e:
+                print(f"Error compressing {info.path}: {e}")
+            time.sleep(0)  # Yield between files
+        with self.lock:
+            self._save_manifest()
+    
+    def _compress_file(self, info: LogFileInfo):
+        src = info.path
+        if ROTATED_RE.search(src.name):
+            # Claim a rotation backup under a unique name first, so a concurrent rollover cannot race us
+            stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(info.modified_ts))
+            claimed = src.with_name(f"{src.name.split('.')[0]}_{stamp}.jsonl")
+            n = 1
+            while claimed.exists() or claimed.with_name(claimed.name + ".gz").exists():
+                claimed = src.with_name(f"{src.name.split('.')[0]}_{stamp}_{n}.jsonl")
+                n += 1
+            os.rename(src, claimed)
+            with self.lock:
+                self._forget(src.name)
+            src = claimed
         
-        return log_files
+        dst = src.with_name(src.name + ".gz")
+        tmp = src.with_name(src.name + ".gz.tmp")
+        stat = os.stat(src)
+        with open(src, "rb") as fin, gzip.open(tmp, "wb", compresslevel=6) as fout:
+            while True:
+                chunk = fin.read(COMPRESS_CHUNK)
+                if not chunk:
+                    break
+                fout.write(chunk)
+                time.sleep(0)
+        os.utime(tmp, (stat.st_atime, stat.st_mtime))  # Keep the original age
+        os.replace(tmp, dst)
+        os.unlink(src)
+        
+        with self.lock:
+            self._forget(src.name)
+            if self._files is not None:
+                self._files[dst.name] = self._stat_entry(dst.name, os.stat(dst))
+                self._manifest_dirty = True
+                saved = stat.st_size - self._files[dst.name].size_bytes
+            else:
+                saved = 0
+            self.stats["files_compressed"] += 1
+            self.stats["bytes_saved_by_compression"] += saved
     
     def calculate_cleanup_priority(self, log_files: List[LogFileInfo]) -> List[Tuple[LogFileInfo, float]]:
         # Calculate cleanup priority for each file (higher score = higher priority for deletion)
@@ -132,16 +375,11 @@ class SmartLogCleaner:
                 score += 50
             
             # Files with duplicate timestamps (failed starts) get higher score
-            timestamp_str = log_file.path.stem.split('_')[-2:]  # Extract date and time
-            if len(timestamp_str) == 2:
-                try:
-                    file_time = datetime.strptime('_'.join(timestamp_str), '%Y%m%d_%H%M%S')
-                    # If file is much older than its timestamp suggests, it might be a duplicate
-                    time_diff = abs((log_file.modified_time - file_time).total_seconds())
-                    if time_diff > 3600:  # More than 1 hour difference
-                        score += 20
-                except ValueError:
-                    pass
+            if log_file.name_ts is not None:
+                # If file is much older than its timestamp suggests, it might be a duplicate
+                time_diff = abs(log_file.modified_ts - log_file.name_ts)
+                if time_diff > 3600:  # More than 1 hour difference
+                    score += 20
             
             # Recent files get negative score (protection)
             if log_file.age_hours < self.config["keep_recent_hours"]:
@@ -168,9 +406,12 @@ class SmartLogCleaner:
         return any(conditions)
     
     def perform_cleanup(self, dry_run: bool = False) -> Dict:
-        # Perform intelligent log cleanup
+        # Perform intelligent log cleanup; sizes of compressed logs count as their .gz size
         with self.lock:
-            log_files = self.scan_log_files()
+            self._refresh_manifest()
+            if not dry_run:
+                self._save_manifest()
+            log_files = list(self._files.values()) if self._files else []
             
             if not log_files:
                 return {"status": "no_files", "message": "No log files found"}
@@ -225,9 +466,10 @@ class SmartLogCleaner:
                 try:
                     if not dry_run:
                         log_file.path.unlink()
+                        self._forget(log_file.name)
                     
                     deleted_files.append({
-                        "name": log_file.path.name,
+                        "name": log_file.name,
                         "size_kb": log_file.size_kb,
                         "age_hours": log_file.age_hours
                     })
@@ -238,6 +480,7 @@ class SmartLogCleaner:
             
             # Update statistics
             if not dry_run:
+                self._save_manifest()
                 self.stats["files_deleted"] += len(deleted_files)
                 self.stats["bytes_freed"] += bytes_freed
                 self.stats["last_cleanup"] = datetime.now()
@@ -253,14 +496,18 @@ class SmartLogCleaner:
                 "mb_freed": bytes_freed / (1024 * 1024)
             }
     
-    def auto_cleanup_if_needed(self) -> Dict:
-        # Automatic cleanup with interval checking
+    def auto_cleanup_if_needed(self, compress: bool = True) -> Dict:
+        # Automatic cleanup with interval checking; old logs are gzipped first (blocking the caller),
+        # so the size budget sees their compressed size and only what is still over it is deleted
         if self.stats["last_cleanup"]:
             hours_since_last = (datetime.now() - self.stats["last_cleanup"]).total_seconds() / 3600
             if hours_since_last < self.config["cleanup_interval_hours"]:
                 return {"status": "too_soon", "hours_since_last": hours_since_last}
         
-        return self.perform_cleanup(dry_run=False)
+        compressed = self.compress_old_logs(blocking=True) if compress else 0
+        result = self.perform_cleanup(dry_run=False)
+        result["files_compressed"] = compressed
+        return result
     
     def get_status(self) -> Dict:
         # Get current status and statistics
@@ -295,10 +542,10 @@ def cleanup_logs_now(strategy: CleanupStrategy = CleanupStrategy.BALANCED, dry_r
     cleaner = get_log_cleaner(strategy)
     return cleaner.perform_cleanup(dry_run=dry_run)
 
-def auto_cleanup_logs(strategy: CleanupStrategy = CleanupStrategy.BALANCED) -> Dict:
+def auto_cleanup_logs(strategy: CleanupStrategy = CleanupStrategy.BALANCED, compress: bool = True) -> Dict:
     # Automatic log cleanup with interval checking
     cleaner = get_log_cleaner(strategy)
-    return cleaner.auto_cleanup_if_needed()
+    return cleaner.auto_cleanup_if_needed(compress=compress)
 
 # Convenience functions for different strategies
 def cleanup_conservative(dry_run: bool = False) -> Dict:
@@ -333,6 +580,46 @@ if __name__ == "__main__":
             print(f"Would delete {len(result.get('deleted_files', []))} files")
             print(f"Would free {result.get('mb_freed', 0):.2f} MB")
             
+        elif command == "compress":
+            strategy_name = sys.argv[2] if len(sys.argv) > 2 else "balanced"
+            cleaner = SmartLogCleaner(strategy=CleanupStrategy(strategy_name))
+            count = cleaner.compress_old_logs(blocking=True)
+            print(f"Compressed {count} files, saved {cleaner.stats['bytes_saved_by_compression'] / (1024 * 1024):.2f} MB")
+            
+        elif command == "bench":
+            # Scan timing against N synthetic log files in a temporary directory
+            import tempfile
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+            with tempfile.TemporaryDirectory() as tmp:
+                base = time.time() - 30 * 24 * 3600
+                for i in range(count):
+                    path = os.path.join(tmp, time.strftime("zSnapr_%Y%m%d_%H%M%S", time.localtime(base + i * 7)) + f"_{i}.log")
+                    with open(path, "wb") as fh:
+                        fh.write(b"x" * 64)
+                    os.utime(path, (base + i * 7, base + i * 7))
+                
+                cleaner = SmartLogCleaner(tmp)
+                timings = []
+                for label in ("cold scan", "warm scan (unchanged)"):
+                    start = time.perf_counter()
+                    files = cleaner.scan_log_files()
+                    timings.append((label, time.perf_counter() - start, len(files)))
+                for i in range(10):
+                    open(os.path.join(tmp, f"zSnapr_new_{i}.log"), "wb").close()
+                start = time.perf_counter()
+                files = cleaner.scan_log_files()
+                timings.append(("incremental scan (+10 files)", time.perf_counter() - start, len(files)))
+                cleaner.save_manifest()
+                fresh = SmartLogCleaner(tmp)
+                start = time.perf_counter()
+                files = fresh.scan_log_files()
+                timings.append(("new process (persisted manifest)", time.perf_counter() - start, len(files)))
+                start = time.perf_counter()
+                preview = cleaner.perform_cleanup(dry_run=True)
+                timings.append(("cleanup preview", time.perf_counter() - start, len(preview.get("deleted_files", []))))
+                for label, seconds, n in timings:
+                    print(f"{label:34s} {seconds * 1000:9.1f} ms  ({n} files)")
+            
         elif command == "clean":
             strategy_name = sys.argv[2] if len(sys.argv) > 2 else "balanced"
             strategy = CleanupStrategy(strategy_name)
@@ -342,7 +629,8 @@ if __name__ == "__main__":
             print(f"Freed {result.get('mb_freed', 0):.2f} MB")
             
         else:
-            print("Usage: python auto_clean.py [status|preview|clean] [conservative|balanced|aggressive]")
+            print("Usage: python auto_clean.py [status|preview|clean|compress] [conservative|balanced|aggressive]")
+            print("       python auto_clean.py bench [file_count]")
     else:
         # Default: show status
         cleaner = get_log_cleaner()
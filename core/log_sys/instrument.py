@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+# Set ZSNAPR_INSTRUMENT=1 (or N to time every Nth call) to collect from startup
+ENV_INSTRUMENT = "ZSNAPR_INSTRUMENT"
+
+# Latency histogram bucket upper bounds in microseconds; the last bucket is open-ended
+BUCKET_BOUNDS_US = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000,
+                    100000, 250000, 500000, 1000000, 2500000, 5000000)
+
+
+class FunctionStats:
+    # Counters for one instrumented function
+    __slots__ = ("name", "sample_every", "calls", "timed", "errors", "total_ns", "self_ns", "max_ns", "buckets")
+
+    def __init__(self, name, sample_every=None):
+        self.name = name
+        self.sample_every = sample_every
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.timed = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_US) + 1)
+
+    def add(self, elapsed_ns, self_ns, error):
+        self.timed += 1
+        self.total_ns += elapsed_ns
+        self.self_ns += self_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if error:
+            self.errors += 1
+        self.buckets[bisect_left(BUCKET_BOUNDS_US, elapsed_ns / 1000.0)] += 1
+
+    def percentile(self, p):
+        # Upper bound (ms) of the bucket holding the p-th percentile of timed calls
+        if not self.timed:
+            return 0.0
+        rank = p / 100.0 * self.timed
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                if i < len(BUCKET_BOUNDS_US):
+                    return BUCKET_BOUNDS_US[i] / 1000.0
+                break
+        return self.max_ns / 1e6
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "timed": self.timed,
+            "errors": self.errors,
+            "total_ns": self.total_ns,
+            "self_ns": self.self_ns,
+            "max_ns": self.max_ns,
+            "buckets": list(self.buckets),
+        }
+
+    def merge(self, data):
+        # Add counters reported by another process
+        self.calls += data.get("calls", 0)
+        self.timed += data.get("timed", 0)
+        self.errors += data.get("errors", 0)
+        self.total_ns += data.get("total_ns", 0)
+        self.self_ns += data.get("self_ns", 0)
+        self.max_ns = max(self.max_ns, data.get("max_ns", 0))
+        for i, count in enumerate(data.get("buckets", ())[:len(self.buckets)]):
+            self.buckets[i] += count
+
+
+class Instrumentation:
+    # Registry behind log_function: call counts, cumulative/self time and latency histograms
+    def __init__(self):
+        self.enabled = False
+        self.sample_every = 1       # Default: time every call
+        self._stats = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.started_at = None
+
+    def register(self, name, sample_every=None):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = FunctionStats(name, sample_every)
+            return stats
+
+    def enable(self, sample_every=None):
+        if sample_every:
+            self.sample_every = max(1, int(sample_every))
+        if not self.enabled:
+            self.started_at = time.time()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            for stats in self._stats.values():
+                stats.reset()
+            self.started_at = time.time() if self.enabled else None
+
+    def call(self, stats, func, args, kwargs):
+        # Run func, timing it unless this call is skipped by sampling.
+        # Skipped calls are counted only; their time shows up in the caller's self time.
+        stats.calls += 1
+        every = stats.sample_every or self.sample_every
+        if every > 1 and stats.calls % every:
+            return func(*args, **kwargs)
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0)
+        error = True
+        start = time.perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            child_ns = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                stats.add(elapsed, elapsed - child_ns, error)
+
+    def snapshot(self):
+        # {name: counters} for every function called at least once
+        with self._lock:
+            return {name: s.as_dict() for name, s in self._stats.items() if s.calls}
+
+    def merge(self, snapshot):
+        # Fold in counters from another process (e.g. the region worker at exit)
+        for name, data in snapshot.items():
+            stats = self.register(name)
+            with self._lock:
+                stats.merge(data)
+
+    def report(self, limit=None):
+        # Text table sorted by cumulative time
+        with self._lock:
+            rows = sorted((s for s in self._stats.values() if s.calls), key=lambda s: s.total_ns, reverse=True)
+            if limit:
+                rows = rows[:limit]
+            lines = [f"{'function':<60} {'calls':>8} {'timed':>8} {'err':>4} {'total ms':>10} "
+                     f"{'self ms':>10} {'mean ms':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'max ms':>9}"]
+            for s in rows:
+                mean = s.total_ns / s.timed / 1e6 if s.timed else 0.0
+                lines.append(f"{s.name[-60:]:<60} {s.calls:>8} {s.timed:>8} {s.errors:>4} "
+                             f"{s.total_ns / 1e6:>10.1f} {s.self_ns / 1e6:>10.1f} {mean:>9.2f} "
+                             f"{s.percentile(50):>7.2f} {s.percentile(95):>7.2f} {s.percentile(99):>7.2f} "
+                             f"{s.max_ns / 1e6:>9.2f}")
+        return "\n".join(lines)
+
+    def write_report(self, log_dir="logs"):
+        # Write the report to logs/functions_<time>.txt and return the path
+        path = Path(log_dir) / time.strftime("functions_%Y%m%d_%H%M%S.txt")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        since = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)) if self.started_at else "-"
+        header = f"# Function timing since {since} (p50/p95/p99 are histogram bucket upper bounds, ms)\n"
+        path.write_text(header + self.report() + "\n", encoding="utf-8")
+        return path
+
+
+_instrumentation = Instrumentation()
+_env_value = os.environ.get(ENV_INSTRUMENT, "").strip()
+if _env_value not in ("", "0"):
+    _instrumentation.enable(int(_env_value) if _env_value.isdigit() else None)
+
+
+def get_instrumentation():
+    return _instrumentation
@@ -0,0 +1,369 @@
+import bisect
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+# Sparse index: one (timestamp, byte offset) probe per stride of a log file
+INDEX_STRIDE = 64 * 1024
+# Flight recorder dumps land after later records, with timestamps of any age; their line
+# ranges are indexed separately by spotting this marker in newly appended bytes
+FLIGHT_MARKER = b'"flight": true'
+FLIGHT_SCAN_CHUNK = 1024 * 1024
+TAIL_BLOCK = 64 * 1024
+ACTIVE_LOG = "zSnapr.jsonl"
+
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+# Legacy text format: '%(asctime)s [%(levelname)s] %(threadName)s:%(funcName)s:%(lineno)d - %(message)s'
+TEXT_RE = re.compile(r"^(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d),(\d{3}) \[(\w+)\] (.*?):([^:]*):(\d+) - (.*)$")
+
+
+def parse_line(line: str) -> Optional[Dict]:
+    # Parse one JSON-lines or legacy text record; None for blank or continuation lines
+    line = line.rstrip("\r\n")
+    if not line:
+        return None
+    if line[0] == "{":
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return record if isinstance(record, dict) and "ts" in record else None
+    m = TEXT_RE.match(line)
+    if not m:
+        return None
+    y, mo, d, h, mi, s, ms = (int(v) for v in m.groups()[:7])
+    return {
+        "ts": time.mktime((y, mo, d, h, mi, s, 0, 0, -1)) + ms / 1000.0,
+        "time": line[:23],
+        "level": m.group(8),
+        "logger": "ZSnapr",
+        "thread": m.group(9),
+        "func": m.group(10),
+        "line": int(m.group(11)),
+        "msg": m.group(12),
+    }
+
+
+def make_filter(levels: Optional[Iterable[str]] = None, threads: Optional[Iterable[str]] = None,
+                loggers: Optional[Iterable[str]] = None, text: Optional[str] = None) -> Callable[[Dict], bool]:
+    # Record predicate; None means "any"
+    levels = {l.upper() for l in levels} if levels else None
+    threads = set(threads) if threads else None
+    loggers = set(loggers) if loggers else None
+    text = text.lower() if text else None
+
+    def match(record: Dict) -> bool:
+        if levels is not None and record.get("level") not in levels:
+            return False
+        if threads is not None and record.get("thread") not in threads:
+            return False
+        if loggers is not None and record.get("logger") not in loggers:
+            return False
+        if text is not None and text not in record.get("msg", "").lower():
+            return False
+        return True
+    return match
+
+
+def levels_at_least(level: str) -> List[str]:
+    # 'WARNING' -> ['WARNING', 'ERROR', 'CRITICAL']
+    return list(LEVELS[LEVELS.index(level.upper()):])
+
+
+class LogFile:
+    # One log file with a sparse timestamp -> offset index built by seeking, not by reading it all
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.compressed = self.path.suffix == ".gz"
+        self._ts: List[float] = []
+        self._offsets: List[int] = []
+        self._indexed_size = 0
+        # Flight recorder blocks: [start offset, end offset, min ts, max ts], in file order
+        self._flight: List[list] = []
+        self._flight_scanned = 0
+        self._identity = None
+        self.mtime = 0.0
+        self.size = 0
+
+    def _records(self, f, start: int, stop: Optional[int], inclusive: bool = True) -> Iterator[Dict]:
+        # Records from byte offset start (a line start) up to stop; traceback lines attach to the previous record
+        f.seek(start)
+        pending = None
+        while stop is None or f.tell() < stop or (inclusive and f.tell() == stop):
+            raw = f.readline()
+            if not raw:
+                break
+            record = parse_line(raw.decode("utf-8", "replace"))
+            if record is None:
+                if pending is not None and raw.strip():
+                    pending["exc"] = pending.get("exc", "") + raw.decode("utf-8", "replace")
+                continue
+            if pending is not None:
+                yield pending
+            record["file"] = self.path.name
+            pending = record
+        if pending is not None:
+            yield pending
+
+    def _probe(self, f, offset: int):
+        # Timestamp of the first in-order (non flight recorder) record after offset
+        f.seek(offset)
+        if offset:
+            f.readline()
+        for _ in range(64):
+            pos = f.tell()
+            raw = f.readline()
+            if not raw:
+                return None
+            record = parse_line(raw.decode("utf-8", "replace"))
+            if record is not None and not record.get("flight"):
+                return record["ts"], pos
+        return None
+
+    def refresh(self):
+        # Extend the index over bytes appended since the last refresh; rebuild after rotation
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._reset()
+            return
+        identity = (stat.st_ino, stat.st_ctime)
+        if identity != self._identity or stat.st_size < self._indexed_size:
+            self._reset()
+            self._identity = identity
+        self.mtime, self.size = stat.st_mtime, stat.st_size
+        if self.compressed or stat.st_size <= self._indexed_size:
+            return
+        with open(self.path, "rb") as f:
+            offset = self._indexed_size - self._indexed_size % INDEX_STRIDE
+            while offset < stat.st_size:
+                probe = self._probe(f, offset)
+                if probe is not None and (not self._offsets or probe[1] > self._offsets[-1]):
+                    ts = max(probe[0], self._ts[-1]) if self._ts else probe[0]
+                    self._ts.append(ts)
+                    self._offsets.append(probe[1])
+                offset += INDEX_STRIDE
+            self._scan_flight(f, stat.st_size)
+        self._indexed_size = stat.st_size
+
+    def _reset(self):
+        self._ts, self._offsets, self._indexed_size = [], [], 0
+        self._flight, self._flight_scanned = [], 0
+
+    def _scan_flight(self, f, size: int):
+        # Index flight recorder lines in the bytes appended since the last scan (complete lines only)
+        pos = self._flight_scanned
+        f.seek(pos)
+        while pos < size:
+            chunk = f.read(min(FLIGHT_SCAN_CHUNK, size - pos))
+            if not chunk:
+                break
+            last_newline = chunk.rfind(b"\n")
+            if last_newline < 0:
+                if len(chunk) < FLIGHT_SCAN_CHUNK:
+                    break       # Partial last line; scanned again once it is complete
+                last_newline = len(chunk) - 1
+            chunk = chunk[:last_newline + 1]
+            hit = chunk.find(FLIGHT_MARKER)
+            while hit >= 0:
+                line_start = chunk.rfind(b"\n", 0, hit) + 1
+                line_end = chunk.find(b"\n", hit) + 1
+                record = parse_line(chunk[line_start:line_end].decode("utf-8", "replace"))
+                if record is not None and record.get("flight"):
+                    start, end, ts = pos + line_start, pos + line_end, record["ts"]
+                    block = self._flight[-1] if self._flight else None
+                    if block is not None and block[1] == start:
+                        block[1] = end
+                        block[2] = min(block[2], ts)
+                        block[3] = max(block[3], ts)
+                    else:
+                        self._flight.append([start, end, ts, ts])
+                hit = chunk.find(FLIGHT_MARKER, line_end)
+            pos += len(chunk)
+            f.seek(pos)
+        self._flight_scanned = pos
+
+    @property
+    def first_ts(self) -> Optional[float]:
+        # Earliest timestamp in the file, including flight recorder records dumped into it
+        candidates = [self._ts[0]] if self._ts else []
+        candidates.extend(block[2] for block in self._flight)
+        return min(candidates) if candidates else None
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Dict]:
+        # Records with start <= ts <= end. Plain files seek via the index for in-order records and
+        # read every flight block whose ts range overlaps; gzip files are streamed to the end,
+        # since a flight dump anywhere in them may hold records from the range.
+        def in_range(ts):
+            return (start is None or ts >= start) and (end is None or ts <= end)
+
+        if self.compressed:
+            with gzip.open(self.path, "rb") as f:
+                for record in self._records(f, 0, None):
+                    if in_range(record["ts"]):
+                        yield record
+            return
+
+        lo = 0
+        if start is not None and self._ts:
+            i = bisect.bisect_left(self._ts, start) - 1
+            lo = self._offsets[i] if i >= 0 else 0
+        hi = None
+        if end is not None and self._ts:
+            j = bisect.bisect_right(self._ts, end)
+            hi = self._offsets[j] if j < len(self._offsets) else None
+        with open(self.path, "rb") as f:
+            for record in self._records(f, lo, hi):
+                if not record.get("flight") and in_range(record["ts"]):
+                    yield record
+            for block_start, block_end, ts_min, ts_max in list(self._flight):
+                if (end is not None and ts_min > end) or (start is not None and ts_max < start):
+                    continue
+                for record in self._records(f, block_start, block_end, inclusive=False):
+                    if in_range(record["ts"]):
+                        yield record
+            # Flight lines appended after the last refresh are not indexed yet
+            if self._flight_scanned < self._indexed_size:
+                for record in self._records(f, self._flight_scanned, None):
+                    if record.get("flight") and in_range(record["ts"]):
+                        yield record
+
+    def tail(self, n: int, match: Callable[[Dict], bool]) -> List[Dict]:
+        # Last n matching records, reading backwards in blocks
+        if self.compressed:
+            found = deque((r for r in self.records() if match(r)), maxlen=n)
+            return list(found)
+        found: List[Dict] = []
+        with open(self.path, "rb") as f:
+            end = f.seek(0, os.SEEK_END)
+            carry = b""
+            while end > 0 and len(found) < n:
+                start = max(0, end - TAIL_BLOCK)
+                f.seek(start)
+                block = f.read(end - start) + carry
+                lines = block.split(b"\n")
+                carry = lines.pop(0) if start > 0 else b""
+                for raw in reversed(lines):
+                    record = parse_line(raw.decode("utf-8", "replace"))
+                    if record is not None and match(record):
+                        record["file"] = self.path.name
+                        found.append(record)
+                        if len(found) >= n:
+                            break
+                end = start
+        found.reverse()
+        return found
+
+
+class LogQuery:
+    # Time-range queries, tail and follow across the rotated and compressed logs in a directory
+
+    def __init__(self, log_dir: str = "logs"):
+        self.log_dir = Path(log_dir)
+        self._files: Dict[str, LogFile] = {}
+        self._lock = threading.Lock()
+
+    def log_files(self) -> List[LogFile]:
+        # Known logs, oldest first (by last write time), with indexes refreshed
+        with self._lock:
+            names = set()
+            try:
+                with os.scandir(self.log_dir) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith(".") or name.endswith(".tmp"):
+                            continue
+                        if name.endswith((".jsonl", ".log", ".gz")) or ".jsonl." in name:
+                            names.add(name)
+            except OSError:
+                return []
+            for name in list(self._files):
+                if name not in names:
+                    del self._files[name]
+            for name in names:
+                if name not in self._files:
+                    self._files[name] = LogFile(self.log_dir / name)
+                self._files[name].refresh()
+            return sorted(self._files.values(), key=lambda lf: lf.mtime)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              levels: Optional[Iterable[str]] = None, threads: Optional[Iterable[str]] = None,
+              loggers: Optional[Iterable[str]] = None, text: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        # Matching records in [start, end] (epoch seconds); with limit, the latest ones are kept
+        match = make_filter(levels, threads, loggers, text)
+        found = deque(maxlen=limit) if limit else []
+        for log_file in self.log_files():
+            if start is not None and log_file.mtime < start:
+                continue  # Last write before the range
+            if end is not None and log_file.first_ts is not None and log_file.first_ts > end:
+                continue
+            for record in log_file.records(start, end):
+                if match(record):
+                    found.append(record)
+        records = list(found)
+        records.sort(key=lambda r: r["ts"])
+        return records
+
+    def around(self, ts: float, seconds: float = 150.0, **filters) -> List[Dict]:
+        # Records within +/- seconds of a moment, e.g. a capture
+        return self.query(ts - seconds, ts + seconds, **filters)
+
+    def tail(self, n: int = 200, **filters) -> List[Dict]:
+        # Last n matching records across files, newest file first
+        match = make_filter(**filters)
+        found: List[Dict] = []
+        for log_file in reversed(self.log_files()):
+            found = log_file.tail(n - len(found), match) + found
+            if len(found) >= n:
+                break
+        return found
+
+    def follow(self, stop: Optional[threading.Event] = None, poll_interval: float = 0.5,
+               from_end: bool = True, **filters) -> Iterator[List[Dict]]:
+        # Yield batches of new matching records appended to the active log; survives rotation
+        match = make_filter(**filters)
+        path = self.log_dir / ACTIVE_LOG
+        stop = stop or threading.Event()
+        f = None
+        identity = None
+        carry = b""
+        try:
+            while not stop.is_set():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    stop.wait(poll_interval)
+                    continue
+                if f is None or (stat.st_ino, stat.st_ctime) != identity or stat.st_size < f.tell():
+                    if f is not None:
+                        f.close()
+                    f = open(path, "rb")
+                    if from_end and identity is None:
+                        f.seek(0, os.SEEK_END)
+                    identity = (stat.st_ino, stat.st_ctime)
+                    carry = b""
+                chunk = f.read()
+                if chunk:
+                    lines = (carry + chunk).split(b"\n")
+                    carry = lines.pop()
+                    batch = []
+                    for raw in lines:
+                        record = parse_line(raw.decode("utf-8", "replace"))
+                        if record is not None and match(record):
+                            record["file"] = path.name
+                            batch.append(record)
+                    if batch:
+                        yield batch
+                stop.wait(poll_interval)
+        finally:
+            if f is not None:
+                f.close()
@@ -1,11 +1,139 @@
+import functools
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
 import threading
 import traceback
 import atexit
+from collections import deque
+from core.log_sys.remote import RemoteLogServer, child_handler_from_env
+from core.log_sys.tracing import ENV_TRACE, get_tracer
+from core.log_sys.instrument import ENV_INSTRUMENT, get_instrumentation
+
+# Single structured log, rotated by size (zSnapr.jsonl, zSnapr.jsonl.1, ...)
+LOG_FILE_NAME = "zSnapr.jsonl"
+LOG_MAX_BYTES = int(os.environ.get("ZSNAPR_LOG_MAX_BYTES", 5 * 1024 * 1024))
+LOG_BACKUP_COUNT = 5
+# DEBUG records kept in memory by the flight recorder
+FLIGHT_RECORDER_CAPACITY = int(os.environ.get("ZSNAPR_FLIGHT_RECORDS", 5000))
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per record
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "proc": record.processName,
+            "thread": record.threadName,
+            "func": record.funcName,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        if getattr(record, "flight", False):
+            entry["flight"] = True
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class FlightRecorderHandler(logging.Handler):
+    # Keeps records below pass_level in a ring buffer; writes them to target only
+    # when a record at trigger_level or above arrives, or a dump is requested
+    def __init__(self, target, capacity=FLIGHT_RECORDER_CAPACITY,
+                 pass_level=logging.INFO, trigger_level=logging.WARNING):
+        super().__init__(logging.DEBUG)
+        self.target = target
+        self.pass_level = pass_level
+        self.trigger_level = trigger_level
+        self.buffer = deque(maxlen=capacity)
+
+    def emit(self, record):
+        if getattr(record, "flight_dump", False) or record.levelno >= self.trigger_level:
+            self._dump()
+        if record.levelno < self.pass_level:
+            self.buffer.append(record)
+        else:
+            self.target.handle(record)
+
+    def _dump(self):
+        records = list(self.buffer)
+        self.buffer.clear()
+        for record in records:
+            record.flight = True
+            self.target.handle(record)
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self.target.close()
+        super().close()
+
+
+class BatchedFileHandler(logging.handlers.RotatingFileHandler):
+    # Size-rotated file handler that flushes in batches instead of after every record
+    FLUSH_RECORDS = 200      # Flush after this many buffered records
+    FLUSH_INTERVAL = 1.0     # ... or when the oldest buffered record is this old (seconds)
+
+    def __init__(self, filename, maxBytes=0, backupCount=0, encoding=None):
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding)
+        self._pending = 0
+        self._first_pending = 0.0
+
+    def emit(self, record):
+        # Same as RotatingFileHandler.emit without the per-record flush
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            msg = self.format(record)
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if self._pending == 0:
+            self._first_pending = time.monotonic()
+        self._pending += 1
+        if (record.levelno >= logging.WARNING or self._pending >= self.FLUSH_RECORDS
+                or time.monotonic() - self._first_pending >= self.FLUSH_INTERVAL):
+            self.flush()
+
+    def flush(self):
+        self._pending = 0
+        super().flush()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    # Enqueue the record as is: the message is formatted and exc_info turned into a traceback
+    # on the listener thread, and the JSON formatter still sees exc_info for its "exc" field
+    def prepare(self, record):
+        return record
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    # Queue listener that flushes its handlers whenever the queue drains
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        return self.queue.get(block)
 
 class Logger:
     _instance = None
@@ -27,17 +155,39 @@ class Logger:
         self.log_dir = Path("logs")
         self.log_dir.mkdir(exist_ok=True)
         
-        # Setup logger
+        # Setup logger; ZSNAPR_LOG_LEVEL=INFO drops debug records before any formatting
         self.logger = logging.getLogger('ZSnapr')
-        self.logger.setLevel(logging.DEBUG)
+        self.logger.setLevel(os.environ.get("ZSNAPR_LOG_LEVEL", "DEBUG").upper())
+        self.logger.propagate = False
         
         # Clear existing handlers
         self.logger.handlers.clear()
+        self._remote_server = None
         
-        # File handler
-        log_file = self.log_dir / f"zSnapr_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # Child processes launched with child_env() forward every record to the parent's log
+        remote_handler = child_handler_from_env()
+        if remote_handler is not None:
+            self.log_file = None
+            self.flight_recorder = None
+            self._queue = queue.SimpleQueue()
+            self.listener = logging.handlers.QueueListener(self._queue, remote_handler)
+            self.listener.start()
+            self.logger.addHandler(LazyQueueHandler(self._queue))
+            atexit.register(self._stop_listener)
+            # Trace spans and function timings go to the parent's recording too
+            get_tracer().forward = remote_handler.send_span
+            atexit.register(lambda: remote_handler.send_stats(get_instrumentation().snapshot()))
+            self.info("Logger initialized (forwarding to parent)")
+            return
+        
+        # Structured, size-rotated file (written by the queue listener thread, flushed in batches)
+        self.log_file = self.log_dir / LOG_FILE_NAME
+        file_handler = BatchedFileHandler(self.log_file, maxBytes=LOG_MAX_BYTES,
+                                          backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonLinesFormatter())
+        # DEBUG records stay in memory until a WARNING/ERROR or an explicit dump
+        self.flight_recorder = FlightRecorderHandler(file_handler)
         
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
@@ -47,12 +197,16 @@ class Logger:
         formatter = logging.Formatter(
             '%(asctime)s [%(levelname)s] %(threadName)s:%(funcName)s:%(lineno)d - %(message)s'
         )
-        file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Callers only enqueue; file and console I/O happen on the listener thread
+        self._queue = queue.SimpleQueue()
+        self.listener = BatchingQueueListener(self._queue, self.flight_recorder, console_handler,
+                                              respect_handler_level=True)
+        self.listener.start()
+        self.logger.addHandler(LazyQueueHandler(self._queue))
+        # Registered before the exit cleanup so it runs after it and flushes its messages
+        atexit.register(self._stop_listener)
         
         self.info("Logger initialized")
         
@@ -64,7 +218,7 @@ class Logger:
         def silent_cleanup_on_exit():
             try:
                 from core.log_sys.auto_clean import auto_cleanup_logs, CleanupStrategy
-                result = auto_cleanup_logs(CleanupStrategy.AGGRESSIVE)
+                result = auto_cleanup_logs(CleanupStrategy.AGGRESSIVE, compress=False)
                 
                 if result.get("status") == "success":
                     deleted_count = len(result.get("deleted_files", []))
@@ -79,7 +233,7 @@ class Logger:
                             self.info(f"Space freed: {mb_freed:.2f} MB")
                     else:
                         self.info("Exit cleanup check: no files need to be deleted")
-                elif result.get("status") == "no_cleanup_needed":
+                elif result.get("status") in ("no_cleanup_needed", "no_files", "too_soon"):
                     self.info("Exit cleanup check: log file count is normal, no cleanup needed")
                 else:
                     self.warning(f"Exit cleanup status: {result.get('status', 'unknown')}")
@@ -88,26 +242,74 @@ class Logger:
         
         atexit.register(silent_cleanup_on_exit)
     
-    def debug(self, message):
-        self.logger.debug(message)
+    def _stop_listener(self):
+        # Drain the queue and flush handlers
+        try:
+            self.listener.stop()
+        except Exception:
+            pass
+    
+    def child_env(self, process_name):
+        # Environment for a child process whose Logger should stream into this log
+        if self._remote_server is None:
+            with self._lock:
+                if self._remote_server is None:
+                    self._remote_server = RemoteLogServer(self.logger)
+        env = self._remote_server.child_env(process_name)
+        env[ENV_TRACE] = "1" if get_tracer().enabled else "0"
+        instrumentation = get_instrumentation()
+        env[ENV_INSTRUMENT] = str(instrumentation.sample_every) if instrumentation.enabled else "0"
+        return env
+    
+    def wait_for_child(self, pid, timeout=1.0):
+        # Wait until a child's forwarded records have all arrived
+        if self._remote_server is None:
+            return False
+        return self._remote_server.wait_for(pid, timeout)
+    
+    def dump_flight_recorder(self, reason="requested"):
+        # Write buffered DEBUG records to the log file (ordered after everything logged so far)
+        self.logger.info("Flight recorder dump: %s", reason, extra={"flight_dump": True}, stacklevel=2)
+    
+    def enabled(self, level=logging.DEBUG):
+        # Cheap level check for guarding expensive message construction
+        return self.logger.isEnabledFor(level)
+    
+    def set_level(self, level):
+        # Change the logger level at runtime (e.g. "INFO" to drop debug records)
+        self.logger.setLevel(level.upper() if isinstance(level, str) else level)
+    
+    def _log(self, level, message, args, exc_info=False):
+        # Level check first; message may be a %-style format or a callable returning the text
+        if not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        # stacklevel points funcName/lineno at the caller, not this wrapper
+        self.logger.log(level, message, *args, exc_info=exc_info, stacklevel=3)
+    
+    def debug(self, message, *args):
+        self._log(logging.DEBUG, message, args)
     
-    def info(self, message):
-        self.logger.info(message)
+    def info(self, message, *args):
+        self._log(logging.INFO, message, args)
     
-    def warning(self, message):
-        self.logger.warning(message)
+    def warning(self, message, *args):
+        self._log(logging.WARNING, message, args)
     
-    def error(self, message):
-        self.logger.error(message)
+    def error(self, message, *args):
+        self._log(logging.ERROR, message, args)
     
-    def critical(self, message):
-        self.logger.critical(message)
+    def critical(self, message, *args):
+        self._log(logging.CRITICAL, message, args)
     
-    def exception(self, message):
-        self.logger.exception(message)
+    def exception(self, message, *args):
+        self._log(logging.ERROR, message, args, exc_info=True)
     
     def log_function_entry(self, func_name, args=None, kwargs=None):
         # Log function entry with parameters
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         params = []
         if args:
             params.append(f"args={args}")
@@ -118,19 +320,22 @@ class Logger:
     
     def log_function_exit(self, func_name, result=None):
         # Log function exit with result
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         result_str = f"result={result}" if result is not None else "no result"
         self.debug(f"EXIT {func_name} -> {result_str}")
     
     def log_thread_info(self, message):
         # Log with thread information
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         thread_name = threading.current_thread().name
         thread_id = threading.get_ident()
         self.debug(f"[Thread:{thread_name}:{thread_id}] {message}")
     
     def log_qt_event(self, event_type, details=None):
         # Log Qt events
-        details_str = f" - {details}" if details else ""
-        self.debug(f"QT_EVENT: {event_type}{details_str}")
+        self.debug(lambda: f"QT_EVENT: {event_type}{f' - {details}' if details else ''}")
     
     def log_hotkey_event(self, hotkey, action):
         # Log hotkey events
@@ -156,34 +361,49 @@ def get_logger():
         _logger_instance = Logger()
     return _logger_instance
 
-# Decorator for function logging
-def log_function(func):
-    def wrapper(*args, **kwargs):
-        logger = get_logger()
-        logger.log_function_entry(func.__name__, args, kwargs)
-        try:
-            result = func(*args, **kwargs)
-            logger.log_function_exit(func.__name__, result)
-            return result
-        except Exception as e:
-            logger.error(f"Exception in {func.__name__}: {str(e)}")
-            logger.exception("Full traceback:")
-            raise
-    return wrapper
-
-# Context manager for operation logging
+# Decorator for function instrumentation: counts, cumulative/self time and latency histograms
+# while get_instrumentation() is enabled; a single flag check otherwise.
+# Use bare (@log_function) or with options (@log_function(sample_every=20) for hot paths).
+def log_function(func=None, *, name=None, sample_every=None):
+    instrumentation = get_instrumentation()
+    
+    def decorate(func):
+        stats = instrumentation.register(name or f"{func.__module__}.{func.__qualname__}", sample_every)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not instrumentation.enabled:
+                return func(*args, **kwargs)
+            return instrumentation.call(stats, func, args, kwargs)
+        return wrapper
+    
+    return decorate(func) if func is not None else decorate
+
+# Context manager for operation logging; also a trace span while tracing is recording
 class LogOperation:
-    def __init__(self, operation_name):
+    def __init__(self, operation_name, log=True, cat="op", **args):
+        # log=False keeps only the span (for hot paths); args are attached to the trace event
         self.operation_name = operation_name
+        self.log = log
+        self.cat = cat
+        self.args = args
         self.logger = get_logger()
+        self.span = None
     
     def __enter__(self):
-        self.logger.info(f"START OPERATION: {self.operation_name}")
+        if self.log:
+            self.logger.info(f"START OPERATION: {self.operation_name}")
+        tracer = get_tracer()
+        if tracer.enabled:
+            self.span = tracer.begin(self.operation_name, self.cat, self.args)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.span is not None:
+            get_tracer().end(self.span, exc_val)
+            self.span = None
         if exc_type:
             self.logger.error(f"OPERATION FAILED: {self.operation_name} - {exc_val}")
             self.logger.exception("Operation exception:")
-        else:
+        elif self.log:
             self.logger.info(f"OPERATION COMPLETED: {self.operation_name}")
\ No newline at end of file
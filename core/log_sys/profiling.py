@@ -0,0 +1,223 @@
+import cProfile
+import contextlib
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Frames kept per allocation traceback; more frames attribute better but cost memory and time
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 25
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} GiB"
+
+
+class ProfileSession:
+    # cProfile and/or tracemalloc around the next N captures, or every capture within a time window.
+    # Each capture writes logs/profile_<stamp>_<NN>_<label>.prof and memory_<stamp>_<NN>_<label>.txt;
+    # memory reports diff against the previous capture and the session start to point at growth.
+
+    def __init__(self, captures=None, seconds=None, cpu=True, memory=True, log_dir="logs",
+                 probes=None, on_finish=None):
+        self.captures = captures
+        self.seconds = seconds
+        self.cpu = cpu
+        self.memory = memory
+        self.log_dir = Path(log_dir)
+        self.probes = dict(probes or {})
+        self.on_finish = on_finish
+        self.stamp = time.strftime("%Y%m%d_%H%M%S")
+        self.count = 0
+        self.files = []
+        self.finished = False
+        self._combined = None
+        self._baseline = None
+        self._previous = None
+        self._owns_tracemalloc = False
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def describe(self):
+        parts = [p for p, on in (("cpu", self.cpu), ("memory", self.memory)) if on]
+        scope = f"next {self.captures} captures" if self.captures else f"{self.seconds:g} s"
+        return f"{'+'.join(parts)} profiling, {scope}"
+
+    def start(self):
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._owns_tracemalloc = True
+            self._baseline = self._previous = self._snapshot()
+            self._write_memory_report("start", self._baseline, None, None)
+        if self.seconds:
+            self._timer = threading.Timer(self.seconds, self.finish)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    def _path(self, prefix, label, suffix):
+        return self.log_dir / f"{prefix}_{self.stamp}_{label}{suffix}"
+
+    @contextlib.contextmanager
+    def capture(self, label="capture"):
+        # Profile one capture on the calling thread (cProfile only sees the thread it is enabled on)
+        profile = None
+        if self.cpu:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None      # Another profiler is active on this thread
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._capture_done(label, profile)
+
+    def _capture_done(self, label, profile):
+        with self._lock:
+            if self.finished:
+                return
+            self.count += 1
+            name = f"{self.count:02d}_{label}"
+            if profile is not None:
+                path = self._path("profile", name, ".prof")
+                profile.dump_stats(path)
+                self.files.append(path)
+                if self._combined is None:
+                    self._combined = pstats.Stats(profile)
+                else:
+                    self._combined.add(profile)
+            if self.memory:
+                snapshot = self._snapshot()
+                self._write_memory_report(name, snapshot, self._previous, self._baseline)
+                self._previous = snapshot
+            done = self.captures is not None and self.count >= self.captures
+        if done:
+            self.finish()
+
+    def _write_memory_report(self, name, snapshot, previous, baseline):
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"# tracemalloc {name}: traced {_format_size(current)}, peak {_format_size(peak)}"]
+        for probe, fn in self.probes.items():
+            try:
+                lines.append(f"# {probe}: {fn()}")
+            except Exception as e:
+                lines.append(f"# {probe}: <error {e}>")
+        sections = [("Top allocations", snapshot.statistics("lineno"), False)]
+        if previous is not None:
+            sections.append(("Growth since previous capture", snapshot.compare_to(previous, "lineno"), True))
+        if baseline is not None and baseline is not previous:
+            sections.append(("Growth since session start", snapshot.compare_to(baseline, "lineno"), True))
+        for title, stats, is_diff in sections:
+            lines.append("")
+            lines.append(f"## {title}")
+            if is_diff:
+                stats = [s for s in stats if s.size_diff > 0]
+            for stat in stats[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                if is_diff:
+                    lines.append(f"{_format_size(stat.size_diff):>12} ({stat.count_diff:+d} blocks) "
+                                 f"now {_format_size(stat.size):>10}  {frame.filename}:{frame.lineno}")
+                else:
+                    lines.append(f"{_format_size(stat.size):>12} ({stat.count} blocks)  {frame.filename}:{frame.lineno}")
+        path = self._path("memory", name, ".txt")
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        self.files.append(path)
+
+    def finish(self):
+        # Write the combined profile and final memory report, then stop tracemalloc if we started it
+        with self._lock:
+            if self.finished:
+                return
+            self.finished = True
+            if self._timer is not None:
+                self._timer.cancel()
+            if self._combined is not None and self.count > 1:
+                path = self._path("profile", "all", ".prof")
+                self._combined.dump_stats(path)
+                self.files.append(path)
+            if self.memory and tracemalloc.is_tracing():
+                self._write_memory_report("end", self._snapshot(), self._previous, self._baseline)
+                if self._owns_tracemalloc:
+                    tracemalloc.stop()
+        if self.on_finish is not None:
+            try:
+                self.on_finish(self)
+            except Exception:
+                pass
+
+
+class Profiler:
+    # Holds the active session; capture() is a no-op context when nothing is being profiled
+    def __init__(self):
+        self.session = None
+        self.probes = {}
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.session is not None and not self.session.finished
+
+    def add_probe(self, name, fn):
+        # Extra line in each memory report, e.g. cache sizes of suspected leaks
+        self.probes[name] = fn
+
+    def start(self, captures=None, seconds=None, cpu=True, memory=True, log_dir="logs", on_finish=None):
+        # Start a session (replacing a running one); captures or seconds bounds it
+        if not captures and not seconds:
+            captures = 1
+        with self._lock:
+            if self.active:
+                self.session.finish()
+            self.session = ProfileSession(captures, seconds, cpu, memory, log_dir, self.probes, on_finish)
+            return self.session.start()
+
+    def stop(self):
+        with self._lock:
+            session, self.session = self.session, None
+        if session is not None:
+            session.finish()
+        return session
+
+    def capture(self, label="capture"):
+        session = self.session
+        if session is None or session.finished:
+            return contextlib.nullcontext()
+        return session.capture(label)
+
+
+def parse_profile_spec(spec):
+    # '5' -> 5 captures, '60s' / '2m' -> a time window in seconds
+    spec = str(spec).strip().lower()
+    if spec.endswith("s"):
+        return None, float(spec[:-1])
+    if spec.endswith("m"):
+        return None, float(spec[:-1]) * 60
+    return int(spec), None
+
+
+_profiler = Profiler()
+
+
+def get_profiler():
+    return _profiler
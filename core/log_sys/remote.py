@@ -0,0 +1,164 @@
+import hmac
+import json
+import logging
+import os
+import secrets
+import socket
+import threading
+
+from core.log_sys.instrument import get_instrumentation
+from core.log_sys.tracing import get_tracer
+
+# Environment handed to child processes so their Logger forwards instead of writing files
+ENV_ADDRESS = "ZSNAPR_LOG_SOCKET"
+ENV_TOKEN = "ZSNAPR_LOG_TOKEN"
+ENV_PROCESS = "ZSNAPR_LOG_PROCESS"
+
+# LogRecord attributes carried over the wire (message and traceback are pre-rendered)
+RECORD_FIELDS = ("levelno", "levelname", "created", "msecs", "relativeCreated", "pathname",
+                 "filename", "module", "funcName", "lineno", "thread", "threadName", "process")
+
+
+class RemoteLogHandler(logging.Handler):
+    # Child side: one JSON line per record over a local socket, sent as the record is handled
+    def __init__(self, address, token, process_name):
+        super().__init__(logging.DEBUG)
+        host, port = address.rsplit(":", 1)
+        self.process_name = process_name
+        self.sock = socket.create_connection((host, int(port)), timeout=2.0)
+        self.sock.settimeout(None)
+        hello = {"token": token, "pid": os.getpid(), "process": process_name}
+        self.sock.sendall(json.dumps(hello).encode("utf-8") + b"\n")
+
+    def emit(self, record):
+        if self.sock is None:
+            return
+        try:
+            entry = {name: getattr(record, name, None) for name in RECORD_FIELDS}
+            entry["msg"] = record.getMessage()
+            if record.exc_info and not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            if record.exc_text:
+                entry["exc_text"] = record.exc_text
+            if getattr(record, "flight_dump", False):
+                entry["flight_dump"] = True
+            self.sock.sendall(json.dumps(entry, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        except Exception:
+            # Parent went away; stop forwarding rather than failing every log call
+            self.sock = None
+
+    def send_span(self, event, thread_name=None):
+        # Forward a finished trace event on the same connection
+        self.send({"span": event, "thread_name": thread_name})
+
+    def send_stats(self, snapshot):
+        # Forward function timing counters (sent once, at exit)
+        if snapshot:
+            self.send({"stats": snapshot})
+
+    def send(self, message):
+        # Side-channel message next to the log records
+        if self.sock is None:
+            return
+        line = json.dumps(message, default=str).encode("utf-8") + b"\n"
+        self.acquire()
+        try:
+            self.sock.sendall(line)
+        except Exception:
+            self.sock = None
+        finally:
+            self.release()
+
+    def close(self):
+        try:
+            if self.sock is not None:
+                self.sock.close()
+        finally:
+            self.sock = None
+            super().close()
+
+
+class RemoteLogServer:
+    # Parent side: accepts child connections and feeds their records into a logger as they arrive
+    def __init__(self, logger):
+        self.logger = logger
+        self.token = secrets.token_hex(16)
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen()
+        self.address = "%s:%d" % self._sock.getsockname()
+        self._closed = {}
+        self._lock = threading.Lock()
+        threading.Thread(target=self._accept_loop, name="LogServer", daemon=True).start()
+
+    def child_env(self, process_name):
+        # Environment variables that make a child's Logger forward here
+        return {ENV_ADDRESS: self.address, ENV_TOKEN: self.token, ENV_PROCESS: process_name}
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,), name="LogServerConn", daemon=True).start()
+
+    def _done_event(self, pid):
+        with self._lock:
+            return self._closed.setdefault(pid, threading.Event())
+
+    def _serve(self, conn):
+        pid = None
+        with conn, conn.makefile("rb") as stream:
+            try:
+                hello = json.loads(stream.readline() or b"{}")
+                if not hmac.compare_digest(str(hello.get("token", "")), self.token):
+                    return
+                pid = int(hello["pid"])
+                name = "%s.%s" % (self.logger.name, hello.get("process") or "child")
+                process_name = hello.get("process") or "child"
+                for raw in stream:
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if "span" in entry:
+                        get_tracer().add_remote(entry["span"], process_name, entry.get("thread_name"))
+                        continue
+                    if "stats" in entry:
+                        get_instrumentation().merge(entry["stats"])
+                        continue
+                    entry["name"] = name
+                    entry["processName"] = process_name
+                    entry["args"] = None
+                    self.logger.handle(logging.makeLogRecord(entry))
+            except (OSError, ValueError, KeyError):
+                pass
+            finally:
+                if pid is not None:
+                    self._done_event(pid).set()
+
+    def wait_for(self, pid, timeout=1.0):
+        # Block until the child's connection has closed, so its records precede what the caller logs next
+        done = self._done_event(pid).wait(timeout)
+        with self._lock:
+            self._closed.pop(pid, None)
+        return done
+
+    def close(self):
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def child_handler_from_env():
+    # RemoteLogHandler for a child launched with child_env(), or None when not a child / parent unreachable
+    address = os.environ.get(ENV_ADDRESS)
+    token = os.environ.get(ENV_TOKEN)
+    if not address or not token:
+        return None
+    try:
+        return RemoteLogHandler(address, token, os.environ.get(ENV_PROCESS) or "child")
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,150 @@
+import itertools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Set ZSNAPR_TRACE=1 to record from startup; otherwise toggle with Tracer.start()/stop()
+ENV_TRACE = "ZSNAPR_TRACE"
+# Spans kept in memory while recording; the oldest are dropped beyond this
+MAX_EVENTS = int(os.environ.get("ZSNAPR_TRACE_EVENTS", 200000))
+
+
+class Span:
+    # One timed operation; finished spans become Chrome 'X' (complete) events
+    __slots__ = ("name", "cat", "args", "id", "parent", "start_ns", "tid")
+
+    def __init__(self, name, cat, args, span_id, parent, tid):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.id = span_id
+        self.parent = parent
+        self.tid = tid
+        self.start_ns = time.perf_counter_ns()
+
+
+class Tracer:
+    # Collects nested spans from every thread and writes them in Chrome trace-event format
+    def __init__(self):
+        self.enabled = False
+        self.forward = None         # Child processes send finished events to the parent instead
+        self._events = []
+        self._pid = os.getpid()
+        self._threads = {}          # (pid, tid) -> thread name
+        self._processes = {self._pid: "ZSnapr"}
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.started_at = None
+        # Wall clock anchor, so perf_counter timestamps from different processes line up
+        self._anchor_ns = time.time_ns() - time.perf_counter_ns()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _ts_us(self, perf_ns):
+        return (perf_ns + self._anchor_ns) / 1000.0
+
+    def start(self):
+        # Begin recording (drops anything from a previous recording)
+        with self._lock:
+            self._events = []
+            self.started_at = time.time()
+            self.enabled = True
+
+    def stop(self, log_dir="logs"):
+        # Stop recording and write the trace file; returns its path, or None when nothing was recorded
+        with self._lock:
+            self.enabled = False
+            events, self._events = self._events, []
+        if not events:
+            return None
+        return self.write(events, log_dir)
+
+    def begin(self, name, cat="op", args=None):
+        # Open a span nested under the calling thread's current span
+        stack = self._stack()
+        thread = threading.current_thread()
+        tid = thread.ident
+        if (self._pid, tid) not in self._threads:
+            self._threads[(self._pid, tid)] = thread.name
+        span = Span(name, cat, args, next(self._ids), stack[-1].id if stack else None, tid)
+        stack.append(span)
+        return span
+
+    def end(self, span, error=None):
+        end_ns = time.perf_counter_ns()
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif span in stack:
+            stack.remove(span)
+        args = dict(span.args) if span.args else {}
+        args["span"] = span.id
+        if span.parent is not None:
+            args["parent"] = span.parent
+        if error is not None:
+            args["error"] = str(error)
+        event = {
+            "name": span.name,
+            "cat": span.cat,
+            "ph": "X",
+            "ts": self._ts_us(span.start_ns),
+            "dur": (end_ns - span.start_ns) / 1000.0,
+            "pid": self._pid,
+            "tid": span.tid,
+            "args": args,
+        }
+        self.add(event)
+
+    def add(self, event):
+        # Record a finished event
+        if not self.enabled:
+            return
+        if self.forward is not None:
+            self.forward(event, self._threads.get((event["pid"], event["tid"])))
+            return
+        with self._lock:
+            if len(self._events) >= MAX_EVENTS:
+                del self._events[:MAX_EVENTS // 10]
+            self._events.append(event)
+
+    def add_remote(self, event, process, thread_name=None):
+        # Record an event forwarded by a child process
+        self._processes[event["pid"]] = process
+        if thread_name:
+            self._threads[(event["pid"], event["tid"])] = thread_name
+        self.add(event)
+
+    def write(self, events, log_dir="logs"):
+        # Chrome trace JSON with process/thread name metadata; loads in chrome://tracing or Perfetto
+        meta = []
+        threads = {(event["pid"], event["tid"]) for event in events}
+        for pid in sorted({pid for pid, _ in threads}):
+            meta.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                         "args": {"name": self._processes.get(pid, str(pid))}})
+        for key in sorted(threads):
+            name = self._threads.get(key)
+            if name:
+                meta.append({"name": "thread_name", "ph": "M", "pid": key[0], "tid": key[1],
+                             "args": {"name": name}})
+        path = Path(log_dir) / time.strftime("trace_%Y%m%d_%H%M%S.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f, separators=(",", ":"))
+        return path
+
+
+_tracer = Tracer()
+if os.environ.get(ENV_TRACE, "").strip() not in ("", "0"):
+    _tracer.enabled = True
+    _tracer.started_at = time.time()
+
+
+def get_tracer():
+    return _tracer
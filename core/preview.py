@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from core.log_sys import get_logger
+
+# Previews are written under the Flet assets dir and shown by URL, so the client fetches a small
+# JPEG over HTTP instead of receiving a base64 PNG of the full capture over the websocket
+ASSETS_DIR = os.path.abspath("assets")
+PREVIEW_DIR = os.path.join("cache", "previews")
+PREVIEW_URL = "/cache/previews"
+PREVIEW_SIZE = (640, 360)
+PREVIEW_QUALITY = 85
+MAX_PREVIEWS = 20
+
+
+class PreviewEntry:
+    __slots__ = ("capture_id", "src", "path", "size", "source_size", "created")
+
+    def __init__(self, capture_id, src, path, size, source_size):
+        self.capture_id = capture_id
+        self.src = src                  # Asset URL for ft.Image
+        self.path = path
+        self.size = size
+        self.source_size = source_size
+        self.created = time.time()
+
+
+class PreviewCache:
+    # Downsamples captures on a background worker and keeps the last MAX_PREVIEWS on disk,
+    # keyed by capture ID; showing a cached preview again only sets ft.Image.src
+
+    def __init__(self, assets_dir=ASSETS_DIR, max_entries=MAX_PREVIEWS, size=PREVIEW_SIZE):
+        self.assets_dir = assets_dir
+        self.directory = os.path.join(assets_dir, PREVIEW_DIR)
+        self.max_entries = max_entries
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Preview")
+        self._clear_directory()
+
+    def _clear_directory(self):
+        # Leftovers from a previous run are never referenced again
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def submit(self, capture_id, image, on_ready=None):
+        # Queue a preview for image; on_ready(entry) runs on the worker when it is written
+        return self._executor.submit(self._build, capture_id, image, on_ready)
+
+    def _build(self, capture_id, image, on_ready):
+        try:
+            entry = self._write(capture_id, image)
+        except Exception as e:
+            get_logger().warning("Preview for capture %s failed: %s", capture_id, e)
+            return None
+        if on_ready is not None:
+            on_ready(entry)
+        return entry
+
+    def _write(self, capture_id, image):
+        width, height = image.size
+        scale = min(self.size[0] / width, self.size[1] / height, 1.0)
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        # reducing_gap lets PIL shrink by an integer factor first, which is much cheaper on 4K frames
+        preview = image.resize(target, Image.Resampling.BILINEAR, reducing_gap=2.0)
+        if preview.mode != "RGB":
+            preview = preview.convert("RGB")
+        name = f"capture_{capture_id}.jpg"
+        path = os.path.join(self.directory, name)
+        preview.save(path, "JPEG", quality=PREVIEW_QUALITY)
+        entry = PreviewEntry(capture_id, f"{PREVIEW_URL}/{name}", path, preview.size, image.size)
+        with self._lock:
+            self._entries[capture_id] = entry
+            while len(self._entries) > self.max_entries:
+                _, old = self._entries.popitem(last=False)
+                try:
+                    os.remove(old.path)
+                except OSError:
+                    pass
+        return entry
+
+    def get(self, capture_id):
+        with self._lock:
+            return self._entries.get(capture_id)
+
+    def ids(self):
+        # Cached capture IDs, oldest first
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+
+# Current process resource usage without third-party dependencies (Windows API via ctypes, /proc on Linux)
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _psapi = ctypes.WinDLL("psapi", use_last_error=True)
+    _kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    _psapi.GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(_PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    _kernel32.GetProcessHandleCount.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    _kernel32.SetProcessWorkingSetSize.argtypes = [wintypes.HANDLE, ctypes.c_size_t, ctypes.c_size_t]
+
+    def rss_bytes():
+        # Working set size of this process
+        counters = _PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not _psapi.GetProcessMemoryInfo(_kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+
+    def open_handles():
+        # Kernel handle count (files, events, threads, ...)
+        count = wintypes.DWORD()
+        if not _kernel32.GetProcessHandleCount(_kernel32.GetCurrentProcess(), ctypes.byref(count)):
+            return None
+        return count.value
+
+    def trim_memory():
+        # Return free heap blocks to the OS and trim the working set (pages fault back in cheaply)
+        try:
+            ctypes.CDLL("ucrtbase")._heapmin()
+        except (OSError, AttributeError):
+            pass
+        return bool(_kernel32.SetProcessWorkingSetSize(_kernel32.GetCurrentProcess(),
+                                                        ctypes.c_size_t(-1), ctypes.c_size_t(-1)))
+else:
+    def rss_bytes():
+        # Resident set size from /proc (None where unavailable)
+        try:
+            with open("/proc/self/statm", "rb") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def open_handles():
+        # Open file descriptors
+        for fd_dir in ("/proc/self/fd", "/dev/fd"):
+            try:
+                return len(os.listdir(fd_dir))
+            except OSError:
+                continue
+        return None
+
+    def trim_memory():
+        # Release free malloc arenas back to the OS (glibc); no-op elsewhere
+        try:
+            import ctypes
+            return bool(ctypes.CDLL("libc.so.6").malloc_trim(0))
+        except (OSError, AttributeError):
+            return False
+
+
+def thread_count():
+    # Python threads (native threads started outside Python are not included)
+    return threading.active_count()
+
+
+def format_bytes(size):
+    if size is None:
+        return "n/a"
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.2f} GB"
@@ -1,19 +1,17 @@
 import threading
 import os
-import time
 import pystray
 from PIL import Image, ImageDraw
-import queue
+from core.log_sys import get_profiler
 
 class TrayManager:
     def __init__(self, app):
         self.app = app
         self.tray_icon = None
         self.tray_thread = None
-        self.action_queue = queue.Queue()
-        self.checker_running = False
-        self.checker_thread = None
-        self._stop_event = threading.Event()
+        # Menu callbacks run on the pystray thread; they only post to the app's command bus
+        self.commands = app.commands
+        self.commands.register("tray", self._process_action)
 
     def _create_tray_image(self):
         # Create tray icon image
@@ -27,21 +25,28 @@ class TrayManager:
         # Show system tray icon with proper error handling
         try:
             def on_restore(icon, item):
-                self.action_queue.put("restore")
+                self.commands.post("tray", "restore")
             
             def on_exit(icon, item):
-                self.action_queue.put("exit")
+                self.commands.post("tray", "exit")
             
             def on_capture(icon, item):
-                self.action_queue.put("capture_region")
+                self.commands.post("tray", "capture_region")
             
             def on_click(icon):
-                self.action_queue.put("capture_region")
+                self.commands.post("tray", "capture_region")
+            
+            def on_profile(icon, item):
+                self.commands.post("tray", "toggle_profiling")
+            
+            def profiling_active(item):
+                return get_profiler().active
 
             image = self._create_tray_image()
             menu = pystray.Menu(
                 pystray.MenuItem("Capture Region", on_capture, default=True),
                 pystray.MenuItem("Restore Window", on_restore),
+                pystray.MenuItem("Profile Next 5 Captures", on_profile, checked=profiling_active),
                 pystray.MenuItem("Exit", on_exit)
             )
             
@@ -64,7 +69,6 @@ class TrayManager:
             
             # Start tray icon if not already running
             if not self.tray_thread or not self.tray_thread.is_alive():
-                self._stop_event.clear()
                 self.tray_thread = threading.Thread(target=self._show_tray, daemon=True)
                 self.tray_thread.start()
             
@@ -110,39 +114,24 @@ class TrayManager:
         except Exception as e:
             print(f"Hide window error: {e}")
 
-    def start_checker(self):
-        # Start action queue checker with improved stability
-        if self.checker_running:
-            return
-            
-        self.checker_running = True
-        self.checker_thread = threading.Thread(target=self._action_checker, daemon=True)
-        self.checker_thread.start()
-
-    def _action_checker(self):
-        # Process tray actions in a stable loop
-        while self.checker_running and not self._stop_event.is_set():
-            try:
-                # Check for actions with timeout
-                try:
-                    action = self.action_queue.get(timeout=0.1)
-                    self._process_action(action)
-                except queue.Empty:
-                    continue
-                    
-            except Exception as e:
-                print(f"Action checker error: {e}")
-                
-            # Small delay to prevent CPU spinning
-            time.sleep(0.05)
+    @property
+    def in_tray(self):
+        # True while the window is minimised to the tray icon
+        return self.tray_thread is not None and self.tray_thread.is_alive()
 
     def _process_action(self, action):
-        # Process individual tray actions safely
+        # Process individual tray actions safely (runs on the command bus thread)
         try:
+            if hasattr(self.app, '_note_activity'):
+                self.app._note_activity()
             if action == "capture_region":
                 if hasattr(self.app, '_capture_region'):
-                    # Use threading to avoid blocking
-                    threading.Thread(target=self.app._capture_region, daemon=True).start()
+                    # Starts its own capture thread, so the bus is not blocked
+                    self.app._capture_region()
+                    
+            elif action == "toggle_profiling":
+                if hasattr(self.app, '_toggle_profiling_from_tray'):
+                    self.app._toggle_profiling_from_tray()
                     
             elif action == "restore":
                 self.restore_from_tray()
@@ -161,10 +150,11 @@ class TrayManager:
             
             # Restore window
             self._show_window()
+            if hasattr(self.app, '_refresh_memory_text'):
+                self.app._refresh_memory_text()
             
-            # Update page
-            if self.app.page:
-                self.app.page.update()
+            # Window state changed; flushed with any pending status updates
+            self.app.ui.mark()
                 
         except Exception as e:
             print(f"Restore from tray error: {e}")
@@ -221,9 +211,8 @@ class TrayManager:
     def _exit_application(self):
         # Clean exit of the application
         try:
-            # Stop checker
-            self.checker_running = False
-            self._stop_event.set()
+            # Stop command dispatch
+            self.commands.stop()
             
             # Stop tray icon
             self._stop_tray_icon()
@@ -238,18 +227,17 @@ class TrayManager:
     def cleanup(self):
         # Clean up resources
         try:
-            self.checker_running = False
-            self._stop_event.set()
+            self.commands.stop()
             self._stop_tray_icon()
         except Exception:
             pass
 
     # Public interface methods for compatibility
     def on_tray_click(self):
-        self.action_queue.put("capture_region")
+        self.commands.post("tray", "capture_region")
 
     def on_tray_restore(self):
-        self.action_queue.put("restore")
+        self.commands.post("tray", "restore")
 
     def on_tray_exit(self):
-        self.action_queue.put("exit")
\ No newline at end of file
+        self.commands.post("tray", "exit")
\ No newline at end of file
@@ -0,0 +1,66 @@
+import threading
+import time
+
+# Flushes at most this often; changes made in between go out in one update
+FRAME_INTERVAL = 1 / 30
+
+_PAGE = object()
+
+
+class UpdateScheduler:
+    # Collects dirty controls from any thread and pushes them to the Flet client from one
+    # "UIUpdates" thread: page.update(*controls) for targeted changes, a full page.update()
+    # only when something asked for it. The thread sleeps on an event while nothing is dirty.
+
+    def __init__(self, get_page, interval=FRAME_INTERVAL):
+        self.get_page = get_page
+        self.interval = interval
+        self.flushes = 0
+        self.marks = 0
+        self._dirty = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_flush = 0.0
+        self._thread = threading.Thread(target=self._run, name="UIUpdates", daemon=True)
+        self._thread.start()
+
+    def mark(self, *controls):
+        # Queue controls for the next flush; no arguments means the whole page (window, overlays)
+        with self._lock:
+            self.marks += 1
+            if not controls:
+                self._dirty[id(_PAGE)] = _PAGE
+            for control in controls:
+                if control is not None:
+                    self._dirty[id(control)] = control
+        self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            self._wake.clear()
+        page = self.get_page()
+        if not dirty or page is None:
+            return
+        self._last_flush = time.monotonic()
+        self.flushes += 1
+        try:
+            if id(_PAGE) in dirty:
+                page.update()
+            else:
+                page.update(*dirty.values())
+        except Exception:
+            # A control not (or no longer) on the page; fall back to a full update
+            try:
+                page.update()
+            except Exception:
+                pass
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Throttle: let further changes within the frame join this flush
+            delay = self._last_flush + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.flush()
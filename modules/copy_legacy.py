@@ -1,11 +1,13 @@
 import io
 from PIL import Image
 import win32clipboard
+from core.log_sys import log_function
 
 class ClipboardManager:
     """Clipboard operations for screenshots"""
     
     @staticmethod
+    @log_function
     def copy_image_to_clipboard(image):
         """Copy PIL Image to Windows clipboard"""
         try:
@@ -0,0 +1,100 @@
+import queue
+import threading
+from concurrent.futures import Future
+from tkinter import filedialog
+import tkinter as tk
+
+
+class DialogHost:
+    # One hidden Tk root on a dedicated "TkDialogs" thread, reused for every file dialog.
+    # Tk objects must stay on the thread that created them, so callers hand the dialog over
+    # and block on a Future; between dialogs the thread sleeps on its queue.
+
+    def __init__(self):
+        self._requests = None
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self.root = None
+
+    def _run(self, requests):
+        # Any failure (no display, Tk errors outside a dialog) ends this thread but is handed
+        # to every waiting caller; the next call() starts a fresh thread with its own queue
+        error = None
+        root = None
+        try:
+            root = self.root = tk.Tk()
+            root.withdraw()
+            while True:
+                func, future = requests.get()
+                if func is None:
+                    break
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(root))
+                except Exception as e:
+                    future.set_exception(e)
+                # Let Tk finish tearing down the dialog before sleeping on the queue again
+                root.update()
+        except Exception as e:
+            error = e
+        finally:
+            if root is not None:
+                try:
+                    root.destroy()
+                except Exception:
+                    pass
+            self._finish(requests, error or RuntimeError("Dialog host closed"))
+
+    def _finish(self, requests, error):
+        # Detach the dead thread's queue and fail whatever is still waiting in it
+        with self._lock:
+            if self._requests is requests:
+                self._requests = None
+                self._thread = None
+                self.root = None
+        while True:
+            try:
+                func, future = requests.get_nowait()
+            except queue.Empty:
+                break
+            if future is not None and future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def call(self, func):
+        # Run func(root) on the dialog thread and wait for its result
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Dialog host closed")
+            if self._thread is None or not self._thread.is_alive():
+                self._requests = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._run, args=(self._requests,),
+                                                name="TkDialogs", daemon=True)
+                self._thread.start()
+            self._requests.put((func, future))
+        return future.result()
+
+    def ask_save_filename(self, **options):
+        return self.call(lambda root: filedialog.asksaveasfilename(parent=root, **options))
+
+    def ask_directory(self, **options):
+        return self.call(lambda root: filedialog.askdirectory(parent=root, **options))
+
+    def close(self):
+        # Later calls raise instead of queueing behind the stop request
+        with self._lock:
+            self._closed = True
+            if self._requests is not None:
+                self._requests.put((None, None))
+
+
+_host = None
+
+
+def get_dialog_host():
+    global _host
+    if _host is None:
+        _host = DialogHost()
+    return _host
@@ -0,0 +1,150 @@
+import sys
+import threading
+import time
+from PIL import Image
+
+# Freezes the primary screen as fast as possible. On Windows the frame is BitBlt'ed into a
+# DIB section allocated once and reused (no per-grab allocation); conversion to a PIL image
+# happens afterwards, outside the latency-critical part. Other platforms use PIL ImageGrab.
+
+
+class Frame:
+    # One frozen frame; `image` is converted lazily from the grab buffer
+    def __init__(self, grabbed_at, size, data=None, image=None):
+        self.grabbed_at = grabbed_at    # perf_counter() right after the pixels were copied
+        self.size = size
+        self._data = data
+        self._image = image
+
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = Image.frombuffer("RGB", self.size, self._data, "raw", "BGRX", 0, 1)
+            self._data = None
+        return self._image
+
+    def crop(self, x, y, width, height):
+        return self.image.crop((x, y, x + width, y + height))
+
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    _gdi32 = ctypes.WinDLL("gdi32", use_last_error=True)
+
+    SM_CXSCREEN = 0
+    SM_CYSCREEN = 1
+    SRCCOPY = 0x00CC0020
+    CAPTUREBLT = 0x40000000
+    DIB_RGB_COLORS = 0
+
+    class _BITMAPINFOHEADER(ctypes.Structure):
+        _fields_ = [
+            ("biSize", wintypes.DWORD),
+            ("biWidth", wintypes.LONG),
+            ("biHeight", wintypes.LONG),
+            ("biPlanes", wintypes.WORD),
+            ("biBitCount", wintypes.WORD),
+            ("biCompression", wintypes.DWORD),
+            ("biSizeImage", wintypes.DWORD),
+            ("biXPelsPerMeter", wintypes.LONG),
+            ("biYPelsPerMeter", wintypes.LONG),
+            ("biClrUsed", wintypes.DWORD),
+            ("biClrImportant", wintypes.DWORD),
+        ]
+
+    _user32.GetDC.restype = wintypes.HDC
+    _user32.GetDC.argtypes = [wintypes.HWND]
+    _user32.ReleaseDC.argtypes = [wintypes.HWND, wintypes.HDC]
+    _gdi32.CreateCompatibleDC.restype = wintypes.HDC
+    _gdi32.CreateCompatibleDC.argtypes = [wintypes.HDC]
+    _gdi32.CreateDIBSection.restype = wintypes.HBITMAP
+    _gdi32.CreateDIBSection.argtypes = [wintypes.HDC, ctypes.POINTER(_BITMAPINFOHEADER), wintypes.UINT,
+                                        ctypes.POINTER(ctypes.c_void_p), wintypes.HANDLE, wintypes.DWORD]
+    _gdi32.SelectObject.restype = wintypes.HGDIOBJ
+    _gdi32.SelectObject.argtypes = [wintypes.HDC, wintypes.HGDIOBJ]
+    _gdi32.BitBlt.argtypes = [wintypes.HDC, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                              wintypes.HDC, ctypes.c_int, ctypes.c_int, wintypes.DWORD]
+    _gdi32.DeleteObject.argtypes = [wintypes.HGDIOBJ]
+    _gdi32.DeleteDC.argtypes = [wintypes.HDC]
+
+
+class FrameGrabber:
+    # Grabs the primary screen (same area as pyautogui.screenshot()); thread safe
+
+    def __init__(self):
+        self.backend = "gdi" if sys.platform == "win32" else "imagegrab"
+        self._lock = threading.Lock()
+        self._size = None
+        self._mem_dc = None
+        self._bitmap = None
+        self._bits = None
+
+    def _allocate(self, width, height):
+        # (Re)create the memory DC and DIB section when the resolution changes
+        self._release()
+        header = _BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(header)
+        header.biWidth = width
+        header.biHeight = -height       # Top-down rows
+        header.biPlanes = 1
+        header.biBitCount = 32
+        bits = ctypes.c_void_p()
+        screen_dc = _user32.GetDC(None)
+        try:
+            self._mem_dc = _gdi32.CreateCompatibleDC(screen_dc)
+            self._bitmap = _gdi32.CreateDIBSection(screen_dc, ctypes.byref(header), DIB_RGB_COLORS,
+                                                   ctypes.byref(bits), None, 0)
+        finally:
+            _user32.ReleaseDC(None, screen_dc)
+        if not self._mem_dc or not self._bitmap:
+            self._release()
+            raise OSError("Failed to allocate frame buffer")
+        _gdi32.SelectObject(self._mem_dc, self._bitmap)
+        self._bits = (ctypes.c_char * (width * height * 4)).from_address(bits.value)
+        self._size = (width, height)
+
+    def _release(self):
+        if self._bitmap:
+            _gdi32.DeleteObject(self._bitmap)
+        if self._mem_dc:
+            _gdi32.DeleteDC(self._mem_dc)
+        self._bitmap = self._mem_dc = self._bits = None
+        self._size = None
+
+    def grab(self):
+        # Returns a Frame; the pixels are copied out of the shared buffer before returning
+        with self._lock:
+            if self.backend == "gdi":
+                width = _user32.GetSystemMetrics(SM_CXSCREEN)
+                height = _user32.GetSystemMetrics(SM_CYSCREEN)
+                if self._size != (width, height):
+                    self._allocate(width, height)
+                screen_dc = _user32.GetDC(None)
+                try:
+                    ok = _gdi32.BitBlt(self._mem_dc, 0, 0, width, height, screen_dc, 0, 0, SRCCOPY | CAPTUREBLT)
+                finally:
+                    _user32.ReleaseDC(None, screen_dc)
+                grabbed_at = time.perf_counter()
+                if not ok:
+                    raise OSError("BitBlt failed")
+                return Frame(grabbed_at, self._size, data=bytes(self._bits))
+            from PIL import ImageGrab
+            image = ImageGrab.grab()
+            return Frame(time.perf_counter(), image.size, image=image)
+
+    def close(self):
+        with self._lock:
+            self._release()
+
+
+_grabber = None
+
+
+def get_frame_grabber():
+    global _grabber
+    if _grabber is None:
+        _grabber = FrameGrabber()
+    return _grabber
@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QRect
+from PySide6.QtGui import QPixmap
+from core.log_sys import get_logger
+from core.font_manager.icon_manager import DEFAULT_TTF
+
+# Disk cache for prebuilt atlases (relative to the working directory, like logs/)
+DEFAULT_CACHE_DIR = os.path.join("assets", "cache", "icons")
+
+
+class IconAtlas:
+    # Icons packed side by side into one QPixmap, rendered once and cached on disk
+
+    def __init__(self, specs, cache_dir=DEFAULT_CACHE_DIR):
+        # specs: iterable of (icon_name, size, rgba), one colour per name and size
+        self.logger = get_logger()
+        self.specs = [(name, int(size), tuple(rgba)) for name, size, rgba in specs]
+        self.cache_dir = Path(cache_dir)
+        self.atlas = None
+        self.frames = {}
+        self._pixmaps = {}
+
+    def _cache_key(self):
+        # Spec list plus font identity, so a font update invalidates the cache
+        try:
+            stat = DEFAULT_TTF.stat()
+            font_id = f"{stat.st_size}:{int(stat.st_mtime)}"
+        except OSError:
+            font_id = "missing"
+        raw = json.dumps([self.specs, font_id])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def load(self):
+        # Load from the disk cache, rendering and saving on a miss
+        key = self._cache_key()
+        png_path = self.cache_dir / f"atlas_{key}.png"
+        manifest_path = self.cache_dir / f"atlas_{key}.json"
+        if png_path.exists() and manifest_path.exists():
+            try:
+                frames = json.loads(manifest_path.read_text(encoding="utf-8"))
+                atlas = QPixmap(str(png_path))
+                if not atlas.isNull():
+                    self.atlas = atlas
+                    self.frames = {name: tuple(rect) for name, rect in frames.items()}
+                    self.logger.debug(f"Icon atlas loaded from cache: {png_path.name}")
+                    return self
+            except Exception as e:
+                self.logger.warning(f"Icon atlas cache unreadable, re-rendering: {e}")
+        self._render(png_path, manifest_path)
+        return self
+
+    def _render(self, png_path, manifest_path):
+        # Rasterise every spec into one strip (only on a cache miss)
+        from PIL import Image, ImageQt
+        from core.font_manager.icon_manager import RenderConfig, get_icon_manager
+
+        manager = get_icon_manager()
+        images = []
+        for name, size, rgba in self.specs:
+            try:
+                images.append((name, size, manager.render_icon(name, RenderConfig(size=size, color=rgba, background=None), shared=True)))
+            except Exception as e:
+                self.logger.warning(f"Icon atlas skipped {name}: {e}")
+
+        width = sum(img.width for _, _, img in images) or 1
+        height = max((img.height for _, _, img in images), default=1)
+        strip = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        frames = {}
+        x = 0
+        for name, size, img in images:
+            strip.paste(img, (x, 0))
+            frames[self._frame_name(name, size)] = (x, 0, img.width, img.height)
+            x += img.width
+
+        self.atlas = QPixmap.fromImage(ImageQt.ImageQt(strip))
+        self.frames = frames
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            strip.save(png_path, "PNG")
+            manifest_path.write_text(json.dumps(frames), encoding="utf-8")
+            self.logger.debug(f"Icon atlas rendered and cached: {png_path.name}")
+        except Exception as e:
+            self.logger.warning(f"Icon atlas cache write failed: {e}")
+
+    @staticmethod
+    def _frame_name(name, size):
+        return f"{name}@{size}"
+
+    def pixmap(self, name, size):
+        # Sub-pixmap for one icon; copied out of the atlas once and reused
+        frame_name = self._frame_name(name, size)
+        pixmap = self._pixmaps.get(frame_name)
+        if pixmap is None:
+            rect = self.frames.get(frame_name)
+            if self.atlas is None or rect is None:
+                return QPixmap()
+            pixmap = self.atlas.copy(QRect(*rect))
+            self._pixmaps[frame_name] = pixmap
+        return pixmap
@@ -4,7 +4,7 @@ from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap, QFont, QCurso
 import sys
 import pyautogui
 from PIL import Image, ImageQt
-from core.font_manager.icon_manager import MaterialSymbolsTTFManager, RenderConfig, IconVariations
+from core.font_manager.icon_manager import RenderConfig, IconVariations, get_icon_manager
 
 class RegionSelector(QWidget):
     """Professional region selection tool using PySide6"""
@@ -22,8 +22,8 @@ class RegionSelector(QWidget):
         self.toolbar = None
         self.result = None
         self.material_font_available = "Material Symbols Outlined" in QFontDatabase.families()
-        # Icon manager instance for toolbar icons
-        self.icon_manager = MaterialSymbolsTTFManager()
+        # Shared icon manager for toolbar icons
+        self.icon_manager = get_icon_manager()
         
     def select_region(self):
         """Show region selection overlay and return selected coordinates"""
@@ -215,7 +215,7 @@ class RegionSelector(QWidget):
         # Build buttons with icons rendered by icon manager
         def make_icon(name: str, size: int = 18, rgba=(255, 255, 255, 255)):
             cfg = RenderConfig(size=size, color=rgba, background=None)
-            img = self.icon_manager.render_icon(name, cfg)
+            img = self.icon_manager.render_icon(name, cfg, shared=True)
             qimage = ImageQt.ImageQt(img)
             return QPixmap.fromImage(qimage)
 
@@ -1,13 +1,16 @@
 from PySide6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QHBoxLayout, QGraphicsDropShadowEffect
 from PySide6.QtCore import Qt, QRect, QPoint, Signal, QTimer, QSize
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap, QFont, QCursor, QLinearGradient, QFontDatabase
+from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPixmap, QIcon, QFont, QCursor, QLinearGradient, QFontDatabase, QFontMetrics, QRegion
+import os
 import sys
 import pyautogui
 from PIL import Image, ImageQt
 import time
-from core.log_sys import get_logger
+from core.log_sys import get_logger, log_function
 from modules.qt_manager import get_qt_app
-from core.font_manager.icon_manager import MaterialSymbolsTTFManager, RenderConfig, IconVariations
+from modules.icon_atlas import IconAtlas
+from config import TOOLBAR_ICONS
+from modules.snap_index import SnapIndex, visible_window_rects
 
 class ModernRegionSelector(QWidget):
     # Enhanced Material Design 3 region selector with smooth performance
@@ -15,6 +18,12 @@ class ModernRegionSelector(QWidget):
     selection_completed = Signal(tuple)
     selection_cancelled = Signal()
     
+    # Toolbar icons are rendered into the icon atlas at this size and colour
+    TOOLBAR_ICON_SIZE = 20
+    TOOLBAR_ICON_COLOR = (51, 65, 85, 255)
+    TOOLBAR_WIDTH = 280
+    TOOLBAR_HEIGHT = 60
+    
     def __init__(self):
         super().__init__()
         self.logger = get_logger()
@@ -29,8 +38,12 @@ class ModernRegionSelector(QWidget):
         self.result = None
         self.screen_rect = QRect()
         self.material_font_loaded = False
-        # Icon manager instance for toolbar icons
-        self.icon_manager = MaterialSymbolsTTFManager()
+        # Toolbar icons come from a prebuilt atlas (disk cached); the toolbar is built once
+        # Icon names per action come from config (customisable in Settings)
+        self.toolbar_icons = dict(TOOLBAR_ICONS)
+        self.icon_atlas = IconAtlas(
+            [(name, self.TOOLBAR_ICON_SIZE, self.TOOLBAR_ICON_COLOR) for name in self.toolbar_icons.values()]
+        ).load()
         
         # Enhanced interaction states
         self.dragging = False
@@ -52,9 +65,69 @@ class ModernRegionSelector(QWidget):
         self.MD3_OUTLINE = QColor(121, 116, 126)
         self.MD3_SUCCESS = QColor(56, 142, 60)
         self.MD3_ERROR = QColor(211, 47, 47)
-        
-    def select_region(self):
-        # Show enhanced region selection overlay
+
+        # Cached paint layers (built once per frozen frame)
+        self.dimmed_pixmap = None
+        self.frame_image = None
+        self.OVERLAY_COLOR = QColor(0, 0, 0, 120)
+
+        # Precomputed style objects so paintEvent allocates nothing per frame
+        self._border_pen = QPen(self.MD3_PRIMARY, 2)
+        self._border_pen.setStyle(Qt.SolidLine)
+        self._glow_pen = QPen(QColor(self.MD3_PRIMARY.red(), self.MD3_PRIMARY.green(),
+                                     self.MD3_PRIMARY.blue(), 80), 4)
+        self._handle_color = QColor(self.MD3_PRIMARY.red(), self.MD3_PRIMARY.green(),
+                                    self.MD3_PRIMARY.blue(), 200)
+        self._handle_shadow_color = QColor(0, 0, 0, 60)
+        self._handle_border_pen = QPen(QColor(255, 255, 255), 1)
+        self._info_font = QFont("Segoe UI", 12, QFont.Bold)
+        self._info_small_font = QFont("Segoe UI", 9)
+        self._info_metrics = QFontMetrics(self._info_font)
+        self._info_small_metrics = QFontMetrics(self._info_small_font)
+        self._info_shadow_color = QColor(0, 0, 0, 40)
+        self._info_outline_pen = QPen(self.MD3_OUTLINE, 1)
+        self._info_text_pen = QPen(self.MD3_ON_SURFACE)
+        self._info_pos_pen = QPen(QColor(self.MD3_ON_SURFACE.red(), self.MD3_ON_SURFACE.green(),
+                                         self.MD3_ON_SURFACE.blue(), 160))
+
+        # Extra pixels around the selection touched by glow, handles and shadows
+        self.CHROME_PADDING = self.HANDLE_MARGIN + 5
+
+        # Handle geometry cache keyed by the selection rect it was built for
+        self._handles_for_rect = QRect()
+        self._handles_cache = {}
+
+        # Magnifier loupe: LOUPE_PIXELS x LOUPE_PIXELS source pixels zoomed by LOUPE_ZOOM
+        self.show_magnifier = True
+        self.cursor_pos = QPoint(-1, -1)
+        self.LOUPE_PIXELS = 15
+        self.LOUPE_ZOOM = 8
+        self.LOUPE_OFFSET = 24
+        self.LOUPE_READOUT_HEIGHT = 38
+        self._loupe_rect = QRect()
+        self._loupe_grid = None
+        self._loupe_border_pen = QPen(self.MD3_OUTLINE, 1)
+        self._loupe_font = QFont("Consolas", 9)
+        self._loupe_text_pen = QPen(self.MD3_ON_SURFACE)
+
+        # Edge snapping and click-to-select (hold Alt to place edges freely)
+        self.snap_index = None
+        self.snap_enabled = True
+        self.SNAP_DISTANCE = 8
+        self.CLICK_TOLERANCE = 3
+        self.press_pos = QPoint()
+        self.hover_element = QRect()
+        self._element_pen = QPen(self.MD3_PRIMARY, 2, Qt.DashLine)
+
+        # Per-frame paint timing, logged per frame when ZSNAPR_DEBUG_PAINT=1
+        self.debug_paint = os.environ.get("ZSNAPR_DEBUG_PAINT", "").strip() == "1"
+        self._paint_count = 0
+        self._paint_total_ms = 0.0
+        self._paint_max_ms = 0.0
+
+    @log_function
+    def select_region(self, screenshot=None):
+        # Show enhanced region selection overlay over `screenshot` (a frozen frame), or a fresh grab
         self.logger.log_qt_event("REGION_SELECTOR_START")
         try:
             self.logger.debug("Getting QApplication through QtManager")
@@ -63,16 +136,22 @@ class ModernRegionSelector(QWidget):
             
             # Get screen geometry for boundary checks
             self.screen_rect = app.primaryScreen().geometry()
-            self.logger.debug(f"Screen geometry: {self.screen_rect}")
+            self.logger.debug("Screen geometry: %s", self.screen_rect)
             
-            # Capture screenshot
-            self.logger.debug("Taking screenshot with pyautogui")
-            screenshot = pyautogui.screenshot()
-            self.logger.debug(f"Screenshot size: {screenshot.size}")
+            # Capture screenshot unless the caller froze one at hotkey time
+            if screenshot is None:
+                self.logger.debug("Taking screenshot with pyautogui")
+                screenshot = pyautogui.screenshot()
+            self.logger.debug("Screenshot size: %s", screenshot.size)
             
             qt_image = ImageQt.ImageQt(screenshot)
             self.screenshot_pixmap = QPixmap.fromImage(qt_image)
+            # Keep the QImage for direct pixel reads by the magnifier
+            self.frame_image = qt_image
+            self._build_snap_index(screenshot)
             self.logger.debug("Screenshot converted to QPixmap")
+            self._build_overlay_layers()
+            self._build_modern_toolbar()
             
             # Setup fullscreen overlay
             self.logger.debug("Setting up fullscreen overlay")
@@ -123,7 +202,10 @@ class ModernRegionSelector(QWidget):
                     if current_time - last_log_time >= 3.0:
                         elapsed = current_time - start_time
                         fps_estimate = loop_count / elapsed if elapsed > 0 else 0
-                        self.logger.debug(f"Event loop: {loop_count} iterations, {elapsed:.2f}s, ~{fps_estimate:.0f} FPS, visible={self.isVisible()}")
+                        self.logger.debug("Event loop: %d iterations, %.2fs, ~%.0f FPS, visible=%s", loop_count, elapsed, fps_estimate, self.isVisible())
+                        if self._paint_count:
+                            avg_ms = self._paint_total_ms / self._paint_count
+                            self.logger.debug("Paint stats: %d frames, avg %.2f ms, max %.2f ms", self._paint_count, avg_ms, self._paint_max_ms)
                         last_log_time = current_time
                     
                     # Check if window was closed
@@ -141,7 +223,7 @@ class ModernRegionSelector(QWidget):
                     break
             
             elapsed_total = time.time() - start_time
-            self.logger.debug(f"Event loop finished: {loop_count} iterations, {elapsed_total:.2f}s total")
+            self.logger.debug("Event loop finished: %d iterations, %.2fs total", loop_count, elapsed_total)
             self.logger.log_qt_event("REGION_SELECTOR_END", f"Result: {self.result}")
             
             return self.result
@@ -151,73 +233,104 @@ class ModernRegionSelector(QWidget):
             self.logger.exception("Region selection exception:")
             return None
     
+    def _build_overlay_layers(self):
+        # Pre-render the darkened layer once so paints only blit cached pixmaps
+        self.dimmed_pixmap = QPixmap(self.screenshot_pixmap)
+        layer_painter = QPainter(self.dimmed_pixmap)
+        layer_painter.fillRect(self.dimmed_pixmap.rect(), self.OVERLAY_COLOR)
+        layer_painter.end()
+        self._loupe_grid = self._build_loupe_grid()
+        self.logger.debug("Overlay layers cached")
+
+    @log_function
+    def _build_snap_index(self, screenshot):
+        # Edge/rect index of the frozen frame; built before the overlay is first painted (and
+        # before it is shown, so window enumeration cannot pick up the overlay itself)
+        try:
+            windows = visible_window_rects(self.screen_rect.x(), self.screen_rect.y())
+            self.snap_index = SnapIndex.from_image(screenshot, windows)
+            self.logger.debug(lambda: f"Snap index ready: {self.snap_index.stats()}")
+        except Exception as e:
+            self.snap_index = None
+            self.logger.warning(f"Snap index unavailable: {e}")
+
+    def _build_loupe_grid(self):
+        # Transparent pixel grid with a highlighted centre cell, drawn over the zoomed image
+        zoom = self.LOUPE_ZOOM
+        side = self.LOUPE_PIXELS * zoom
+        grid = QPixmap(side, side)
+        grid.fill(Qt.transparent)
+        grid_painter = QPainter(grid)
+        grid_painter.setPen(QPen(QColor(255, 255, 255, 40), 1))
+        for i in range(1, self.LOUPE_PIXELS):
+            grid_painter.drawLine(i * zoom, 0, i * zoom, side)
+            grid_painter.drawLine(0, i * zoom, side, i * zoom)
+        center = (self.LOUPE_PIXELS // 2) * zoom
+        grid_painter.setPen(QPen(self.MD3_PRIMARY, 2))
+        grid_painter.drawRect(center, center, zoom, zoom)
+        grid_painter.end()
+        return grid
+
+    @log_function(sample_every=10)
     def paintEvent(self, event):
-        # Highly optimized painting for maximum performance
+        # Repaint only the damaged region from the cached base and darkened layers
+        paint_start = time.perf_counter()
         painter = QPainter(self)
         
         # Enable high-performance rendering hints
         painter.setRenderHint(QPainter.Antialiasing, True)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
         painter.setRenderHint(QPainter.TextAntialiasing, True)
         
         # Use composition mode for better performance
         painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
         
-        # Draw original screenshot as background
-        painter.drawPixmap(0, 0, self.screenshot_pixmap)
-        
-        # Only redraw changed regions for better performance
+        damaged = event.region()
         update_rect = event.rect()
+        painter.setClipRegion(damaged)
         
-        # Draw semi-transparent overlay (optimized)
-        self._draw_optimized_overlay(painter, update_rect)
+        # Darkened layer everywhere, original frame inside the selection
+        self._draw_base_layers(painter, damaged)
         
         if not self.selection_rect.isEmpty():
             # Only draw selection elements if they intersect with update region
-            if self.selection_rect.intersects(update_rect):
+            if self._selection_chrome_rect(self.selection_rect).intersects(update_rect):
                 self._draw_selection_border(painter)
                 self._draw_resize_handles(painter)
                 self._draw_info_overlay(painter)
         else:
+            # Outline the element a single click would select
+            if not self.hover_element.isEmpty() and self.hover_element.intersects(update_rect):
+                painter.setPen(self._element_pen)
+                painter.drawRect(self.hover_element)
             # Draw instructions only if needed
             if update_rect.intersects(QRect(0, 0, self.width(), 120)):
                 self._draw_instructions(painter)
-    
-    def _draw_optimized_overlay(self, painter, update_rect):
-        # Highly optimized overlay drawing with region clipping
-        overlay_color = QColor(0, 0, 0, 120)
         
-        if self.selection_rect.isEmpty():
-            # No selection - only draw overlay in update region
-            painter.fillRect(update_rect, overlay_color)
-        else:
-            # Only draw overlay parts that intersect with update region
-            # Top area
-            if self.selection_rect.top() > 0:
-                top_rect = QRect(0, 0, self.width(), self.selection_rect.top())
-                if top_rect.intersects(update_rect):
-                    painter.fillRect(top_rect.intersected(update_rect), overlay_color)
-            
-            # Bottom area
-            if self.selection_rect.bottom() < self.height():
-                bottom_rect = QRect(0, self.selection_rect.bottom() + 1, 
-                                  self.width(), self.height() - self.selection_rect.bottom() - 1)
-                if bottom_rect.intersects(update_rect):
-                    painter.fillRect(bottom_rect.intersected(update_rect), overlay_color)
-            
-            # Left area
-            if self.selection_rect.left() > 0:
-                left_rect = QRect(0, self.selection_rect.top(), 
-                                self.selection_rect.left(), self.selection_rect.height())
-                if left_rect.intersects(update_rect):
-                    painter.fillRect(left_rect.intersected(update_rect), overlay_color)
-            
-            # Right area
-            if self.selection_rect.right() < self.width():
-                right_rect = QRect(self.selection_rect.right() + 1, self.selection_rect.top(),
-                                 self.width() - self.selection_rect.right() - 1, self.selection_rect.height())
-                if right_rect.intersects(update_rect):
-                    painter.fillRect(right_rect.intersected(update_rect), overlay_color)
+        if not self._loupe_rect.isEmpty() and self._loupe_rect.intersects(update_rect):
+            self._draw_magnifier(painter)
+        
+        painter.end()
+        self._record_paint_time(paint_start, update_rect)
+    
+    def _draw_base_layers(self, painter, damaged):
+        # Blit cached layers for each damaged rect only
+        selection = self.selection_rect
+        for rect in damaged:
+            painter.drawPixmap(rect, self.dimmed_pixmap, rect)
+            if not selection.isEmpty():
+                clear_rect = rect.intersected(selection)
+                if not clear_rect.isEmpty():
+                    painter.drawPixmap(clear_rect, self.screenshot_pixmap, clear_rect)
+    
+    def _record_paint_time(self, paint_start, update_rect):
+        # Accumulate paint cost; per-frame lines only in paint debug mode
+        elapsed_ms = (time.perf_counter() - paint_start) * 1000.0
+        self._paint_count += 1
+        self._paint_total_ms += elapsed_ms
+        if elapsed_ms > self._paint_max_ms:
+            self._paint_max_ms = elapsed_ms
+        if self.debug_paint:
+            self.logger.debug("Paint frame %d: %.2f ms, rect=%dx%d", self._paint_count, elapsed_ms, update_rect.width(), update_rect.height())
     
     def _draw_clear_selection(self, painter):
         # Selection area remains completely clear (original screenshot visible)
@@ -226,15 +339,11 @@ class ModernRegionSelector(QWidget):
     
     def _draw_selection_border(self, painter):
         # Modern selection border
-        pen = QPen(self.MD3_PRIMARY, 2)
-        pen.setStyle(Qt.SolidLine)
-        painter.setPen(pen)
+        painter.setPen(self._border_pen)
         painter.drawRect(self.selection_rect)
         
         # Add outer glow
-        glow_pen = QPen(QColor(self.MD3_PRIMARY.red(), self.MD3_PRIMARY.green(), 
-                              self.MD3_PRIMARY.blue(), 80), 4)
-        painter.setPen(glow_pen)
+        painter.setPen(self._glow_pen)
         painter.drawRect(self.selection_rect.adjusted(-1, -1, 1, 1))
     
     def _draw_resize_handles(self, painter):
@@ -247,41 +356,36 @@ class ModernRegionSelector(QWidget):
                 handle_color = self.MD3_PRIMARY
                 handle_size = self.HANDLE_SIZE + 2
             else:
-                handle_color = QColor(self.MD3_PRIMARY.red(), self.MD3_PRIMARY.green(), 
-                                    self.MD3_PRIMARY.blue(), 200)
+                handle_color = self._handle_color
                 handle_size = self.HANDLE_SIZE
             
+            center = handle_rect.center()
+            
             # Draw handle shadow
-            shadow_rect = QRect(handle_rect.center().x() - handle_size//2 + 1, 
-                              handle_rect.center().y() - handle_size//2 + 1,
+            shadow_rect = QRect(center.x() - handle_size//2 + 1, 
+                              center.y() - handle_size//2 + 1,
                               handle_size, handle_size)
-            painter.fillRect(shadow_rect, QColor(0, 0, 0, 60))
+            painter.fillRect(shadow_rect, self._handle_shadow_color)
             
             # Draw main handle
-            main_rect = QRect(handle_rect.center().x() - handle_size//2, 
-                            handle_rect.center().y() - handle_size//2,
+            main_rect = QRect(center.x() - handle_size//2, 
+                            center.y() - handle_size//2,
                             handle_size, handle_size)
             painter.fillRect(main_rect, handle_color)
             
             # Add white border
-            painter.setPen(QPen(QColor(255, 255, 255), 1))
+            painter.setPen(self._handle_border_pen)
             painter.drawRect(main_rect)
     
-    def _draw_info_overlay(self, painter):
-        # Draw dimensions and position info
-        width = self.selection_rect.width()
-        height = self.selection_rect.height()
-        
-        font = QFont("Segoe UI", 12, QFont.Bold)
-        painter.setFont(font)
-        
-        # Main dimensions
-        text = f"{width} × {height}"
-        text_rect = painter.fontMetrics().boundingRect(text)
+    def _info_layout(self, rect):
+        # Compute info label texts and geometry for a selection rect
+        text = f"{rect.width()} × {rect.height()}"
+        pos_text = f"({rect.x()}, {rect.y()})"
+        text_rect = self._info_metrics.boundingRect(text)
         
         # Smart positioning
-        info_x = self.selection_rect.center().x() - text_rect.width() // 2
-        info_y = max(25, self.selection_rect.top() - 15)
+        info_x = rect.center().x() - text_rect.width() // 2
+        info_y = max(25, rect.top() - 15)
         
         # Ensure info stays on screen
         info_x = max(10, min(info_x, self.width() - text_rect.width() - 10))
@@ -290,22 +394,121 @@ class ModernRegionSelector(QWidget):
         bg_rect = QRect(info_x - 12, info_y - text_rect.height() - 6,
                        text_rect.width() + 24, text_rect.height() + 12)
         
-        painter.fillRect(bg_rect.adjusted(1, 1, 1, 1), QColor(0, 0, 0, 40))  # Shadow
+        # Position line is drawn below the card and may extend past it
+        pos_rect = self._info_small_metrics.boundingRect(pos_text).translated(info_x, info_y + 16)
+        bounds = bg_rect.adjusted(0, 0, 2, 2).united(pos_rect.adjusted(-1, -1, 1, 1))
+        return text, pos_text, QPoint(info_x, info_y), bg_rect, bounds
+    
+    def _selection_chrome_rect(self, rect):
+        # Everything painted for a selection: frame, glow, handles and info label
+        if rect.isEmpty():
+            return QRect()
+        pad = self.CHROME_PADDING
+        chrome = rect.adjusted(-pad, -pad, pad, pad)
+        return chrome.united(self._info_layout(rect)[4])
+    
+    def _ring_region(self, rect, pad):
+        # Band of +/- pad pixels around the edges of rect
+        if rect.isEmpty():
+            return QRegion()
+        ring = QRegion(rect.adjusted(-pad, -pad, pad, pad))
+        inner = rect.adjusted(pad, pad, -pad, -pad)
+        if inner.isValid() and not inner.isEmpty():
+            ring = ring.subtracted(QRegion(inner))
+        return ring
+    
+    def _selection_chrome_region(self, rect):
+        # Chrome as a ring around the edges plus the info label (interior excluded)
+        if rect.isEmpty():
+            return QRegion()
+        ring = self._ring_region(rect, self.CHROME_PADDING)
+        return ring.united(QRegion(self._info_layout(rect)[4]))
+    
+    def _draw_info_overlay(self, painter):
+        # Draw dimensions and position info
+        text, pos_text, origin, bg_rect, _ = self._info_layout(self.selection_rect)
+        
+        painter.fillRect(bg_rect.adjusted(1, 1, 1, 1), self._info_shadow_color)  # Shadow
         painter.fillRect(bg_rect, self.MD3_SURFACE)
-        painter.setPen(QPen(self.MD3_OUTLINE, 1))
+        painter.setPen(self._info_outline_pen)
         painter.drawRect(bg_rect)
         
         # Text
-        painter.setPen(QPen(self.MD3_ON_SURFACE))
-        painter.drawText(QPoint(info_x, info_y), text)
+        painter.setFont(self._info_font)
+        painter.setPen(self._info_text_pen)
+        painter.drawText(origin, text)
         
         # Position info
-        small_font = QFont("Segoe UI", 9)
-        painter.setFont(small_font)
-        pos_text = f"({self.selection_rect.x()}, {self.selection_rect.y()})"
-        painter.setPen(QPen(QColor(self.MD3_ON_SURFACE.red(), self.MD3_ON_SURFACE.green(), 
-                                  self.MD3_ON_SURFACE.blue(), 160)))
-        painter.drawText(QPoint(info_x, info_y + 16), pos_text)
+        painter.setFont(self._info_small_font)
+        painter.setPen(self._info_pos_pen)
+        painter.drawText(QPoint(origin.x(), origin.y() + 16), pos_text)
+    
+    def _loupe_geometry(self, pos):
+        # Place the loupe beside the cursor, flipping to stay on screen
+        side = self.LOUPE_PIXELS * self.LOUPE_ZOOM
+        width = side
+        height = side + self.LOUPE_READOUT_HEIGHT
+        x = pos.x() + self.LOUPE_OFFSET
+        y = pos.y() + self.LOUPE_OFFSET
+        if x + width > self.width():
+            x = pos.x() - self.LOUPE_OFFSET - width
+        if y + height > self.height():
+            y = pos.y() - self.LOUPE_OFFSET - height
+        return QRect(max(0, x), max(0, y), width + 1, height + 1)
+    
+    def _update_magnifier(self, pos):
+        # Move the loupe; only its old and new fixed-size rects are repainted
+        old_rect = self._loupe_rect
+        if self.show_magnifier and self.frame_image is not None and not self.dragging:
+            self.cursor_pos = QPoint(pos)
+            self._loupe_rect = self._loupe_geometry(pos)
+        else:
+            self._loupe_rect = QRect()
+        if old_rect == self._loupe_rect and old_rect.isEmpty():
+            return
+        region = QRegion(old_rect).united(QRegion(self._loupe_rect))
+        if not region.isEmpty():
+            self.update(region)
+    
+    def _draw_magnifier(self, painter):
+        # Zoomed pixel grid and colour readout around cursor_pos
+        image = self.frame_image
+        rect = self._loupe_rect
+        zoom = self.LOUPE_ZOOM
+        count = self.LOUPE_PIXELS
+        side = count * zoom
+        half = count // 2
+        cx, cy = self.cursor_pos.x(), self.cursor_pos.y()
+        zoom_rect = QRect(rect.x(), rect.y(), side, side)
+        
+        # Nearest-neighbour blit of the source pixels that are inside the frame
+        painter.fillRect(zoom_rect, Qt.black)
+        source = QRect(cx - half, cy - half, count, count).intersected(image.rect())
+        if not source.isEmpty():
+            target = QRect(zoom_rect.x() + (source.x() - (cx - half)) * zoom,
+                           zoom_rect.y() + (source.y() - (cy - half)) * zoom,
+                           source.width() * zoom, source.height() * zoom)
+            painter.drawImage(target, image, source)
+        painter.drawPixmap(zoom_rect.topLeft(), self._loupe_grid)
+        
+        # Readout card under the zoom box
+        readout = QRect(rect.x(), zoom_rect.bottom() + 1, side, self.LOUPE_READOUT_HEIGHT)
+        painter.fillRect(readout, self.MD3_SURFACE)
+        painter.setPen(self._loupe_border_pen)
+        painter.drawRect(QRect(rect.x(), rect.y(), side, side + self.LOUPE_READOUT_HEIGHT))
+        
+        painter.setFont(self._loupe_font)
+        painter.setPen(self._loupe_text_pen)
+        if image.valid(cx, cy):
+            color = image.pixelColor(cx, cy)
+            swatch = QRect(readout.x() + 6, readout.y() + 6, 12, 12)
+            painter.fillRect(swatch, color)
+            painter.drawRect(swatch)
+            painter.drawText(QPoint(swatch.right() + 6, swatch.bottom()), color.name().upper())
+            painter.drawText(QPoint(readout.x() + 6, readout.y() + 32),
+                             f"RGB {color.red()}, {color.green()}, {color.blue()}")
+        else:
+            painter.drawText(QPoint(readout.x() + 6, readout.y() + 18), "Out of frame")
     
     def _draw_instructions(self, painter):
         return
@@ -343,16 +546,18 @@ class ModernRegionSelector(QWidget):
         painter.drawText(QPoint(shortcuts_x, text_y + 30), shortcuts)
     
     def _get_resize_handles(self):
-        # Get resize handle rectangles with boundary checks
+        # Get resize handle rectangles, rebuilt only when the selection changes
         if self.selection_rect.isEmpty():
             return {}
         
+        rect = self.selection_rect
+        if rect == self._handles_for_rect:
+            return self._handles_cache
+        
         handles = {}
         margin = self.HANDLE_MARGIN
         size = self.HANDLE_SIZE
         
-        rect = self.selection_rect
-        
         # Corner handles
         handles['top_left'] = QRect(rect.left() - margin, rect.top() - margin, size, size)
         handles['top_right'] = QRect(rect.right() - size + margin, rect.top() - margin, size, size)
@@ -365,6 +570,8 @@ class ModernRegionSelector(QWidget):
         handles['left'] = QRect(rect.left() - margin, rect.center().y() - size//2, size, size)
         handles['right'] = QRect(rect.right() - size + margin, rect.center().y() - size//2, size, size)
         
+        self._handles_for_rect = QRect(rect)
+        self._handles_cache = handles
         return handles
     
     def _get_cursor_for_handle(self, handle_type):
@@ -433,13 +640,17 @@ class ModernRegionSelector(QWidget):
             # Start new selection
             self.start_point = event.pos()
             self.end_point = event.pos()
+            self.press_pos = event.pos()
             self.selecting = True
+            self._set_hover_element(QRect())
             self.setCursor(Qt.CrossCursor)
             self._hide_toolbar()
     
+    @log_function(sample_every=10)
     def mouseMoveEvent(self, event):
         # Optimized mouse move handling with minimal redraws
         old_rect = QRect(self.selection_rect)
+        self._update_magnifier(event.pos())
         
         if self.selecting:
             self.end_point = event.pos()
@@ -454,26 +665,27 @@ class ModernRegionSelector(QWidget):
             # Move entire selection with boundary checks
             new_top_left = event.pos() - self.drag_offset
             new_rect = QRect(new_top_left, self.selection_rect.size())
-            self.selection_rect = self._constrain_to_screen(new_rect)
+            self.selection_rect = self._constrain_to_screen(self._snap_moved_rect(new_rect))
             # Only update changed regions
             self._update_regions(old_rect, self.selection_rect)
         else:
             # Handle hover effects with minimal updates
             self._update_hover_state(event.pos())
+            self._update_hover_element(event.pos())
     
     def _update_regions(self, old_rect, new_rect):
-        # Smart region updates to minimize redraws
+        # Damage old and new chrome plus pixels that switched between clear and dimmed
         if old_rect != new_rect:
-            # Calculate union of old and new rects plus some margin for handles/overlay
-            margin = 50
-            update_rect = old_rect.united(new_rect).adjusted(-margin, -margin, margin, margin)
+            region = self._selection_chrome_region(old_rect)
+            region = region.united(self._selection_chrome_region(new_rect))
+            region = region.united(QRegion(old_rect).xored(QRegion(new_rect)))
             
             # Constrain to screen bounds
-            screen_rect = QRect(0, 0, self.width(), self.height())
-            update_rect = update_rect.intersected(screen_rect)
+            region = region.intersected(QRegion(0, 0, self.width(), self.height()))
             
             # Update only the necessary region
-            self.update(update_rect)
+            if not region.isEmpty():
+                self.update(region)
         else:
             # No change, no update needed
             pass
@@ -481,10 +693,16 @@ class ModernRegionSelector(QWidget):
     def mouseReleaseEvent(self, event):
         # Clean mouse release handling
         if event.button() == Qt.LeftButton:
+            old_rect = QRect(self.selection_rect)
             if self.selecting:
                 self.selecting = False
                 self.end_point = event.pos()
-                self._update_selection_rect()
+                element = self._clicked_element(event.pos())
+                if element is not None:
+                    # Single click selects the UI element or window under the cursor
+                    self.selection_rect = self._constrain_to_screen(element)
+                else:
+                    self._update_selection_rect()
                 if not self.selection_rect.isEmpty():
                     self._show_modern_toolbar()
             elif self.resizing:
@@ -498,7 +716,7 @@ class ModernRegionSelector(QWidget):
                 if not self.selection_rect.isEmpty():
                     self._show_modern_toolbar()
             
-            self.update()
+            self._update_regions(old_rect, self.selection_rect)
     
     def _resize_selection(self, pos):
         # Resize with boundary constraints
@@ -516,8 +734,10 @@ class ModernRegionSelector(QWidget):
         if 'bottom' in self.resize_handle:
             rect.setBottom(pos.y())
         
-        # Apply constraints
-        self.selection_rect = self._constrain_to_screen(rect.normalized())
+        # Snap the edges being moved, then apply constraints
+        edges = [edge for edge in ("left", "right", "top", "bottom") if edge in self.resize_handle]
+        rect = self._snap_rect(rect.normalized(), edges)
+        self.selection_rect = self._constrain_to_screen(rect)
     
     def _update_hover_state(self, pos):
         # Smooth hover state updates
@@ -541,14 +761,94 @@ class ModernRegionSelector(QWidget):
             else:
                 self.setCursor(Qt.CrossCursor)
         
-        # Only update if hover state changed
+        # Only repaint the handles whose hover state changed
         if old_hover != self.hover_handle:
-            self.update()
+            for handle_type in (old_hover, self.hover_handle):
+                if handle_type in handles:
+                    self.update(handles[handle_type].adjusted(-4, -4, 4, 4))
     
     def _update_selection_rect(self):
         # Update selection with constraints
         rect = QRect(self.start_point, self.end_point).normalized()
-        self.selection_rect = self._constrain_to_screen(rect)
+        self.selection_rect = self._constrain_to_screen(self._snap_rect(rect))
+    
+    def _snapping_active(self):
+        # Snapping needs the index and is suspended while Alt is held
+        if not self.snap_enabled or self.snap_index is None:
+            return False
+        return not (QApplication.keyboardModifiers() & Qt.AltModifier)
+    
+    def _snap_rect(self, rect, edges=("left", "right", "top", "bottom")):
+        # Pull the given edges onto nearby frame edges or window borders
+        if rect.isEmpty() or not self._snapping_active():
+            return rect
+        index = self.snap_index
+        distance = self.SNAP_DISTANCE
+        snapped = QRect(rect)
+        if "left" in edges:
+            x = index.snap_vertical(rect.left(), rect.top(), rect.bottom(), distance)
+            if x is not None:
+                snapped.setLeft(x)
+        if "right" in edges:
+            x = index.snap_vertical(rect.right() + 1, rect.top(), rect.bottom(), distance)
+            if x is not None:
+                snapped.setRight(x - 1)
+        if "top" in edges:
+            y = index.snap_horizontal(rect.top(), rect.left(), rect.right(), distance)
+            if y is not None:
+                snapped.setTop(y)
+        if "bottom" in edges:
+            y = index.snap_horizontal(rect.bottom() + 1, rect.left(), rect.right(), distance)
+            if y is not None:
+                snapped.setBottom(y - 1)
+        if snapped.width() < self.MIN_SELECTION_SIZE or snapped.height() < self.MIN_SELECTION_SIZE:
+            return rect
+        return snapped
+    
+    def _snap_moved_rect(self, rect):
+        # Translate a dragged selection so its closest edge on each axis snaps
+        snapped = self._snap_rect(rect)
+        if snapped is rect:
+            return rect
+        dx_candidates = [d for d in (snapped.left() - rect.left(), snapped.right() - rect.right()) if d]
+        dy_candidates = [d for d in (snapped.top() - rect.top(), snapped.bottom() - rect.bottom()) if d]
+        dx = min(dx_candidates, key=abs) if dx_candidates else 0
+        dy = min(dy_candidates, key=abs) if dy_candidates else 0
+        return rect.translated(dx, dy)
+    
+    def _element_rect_at(self, pos):
+        # Indexed element/window rect under pos as a QRect (empty if none)
+        if self.snap_index is None:
+            return QRect()
+        hit = self.snap_index.element_at(pos.x(), pos.y())
+        if hit is None:
+            return QRect()
+        x0, y0, x1, y1 = hit
+        return QRect(QPoint(x0, y0), QPoint(x1, y1))
+    
+    def _clicked_element(self, pos):
+        # Element rect for a press/release without a drag, else None
+        if (pos - self.press_pos).manhattanLength() > self.CLICK_TOLERANCE:
+            return None
+        if not self._snapping_active():
+            return None
+        element = self._element_rect_at(pos)
+        return None if element.isEmpty() else element
+    
+    def _update_hover_element(self, pos):
+        # Preview the click-to-select target while nothing is selected
+        if self.selection_rect.isEmpty() and self._snapping_active():
+            self._set_hover_element(self._element_rect_at(pos))
+        else:
+            self._set_hover_element(QRect())
+    
+    def _set_hover_element(self, rect):
+        if rect == self.hover_element:
+            return
+        region = self._ring_region(self.hover_element, 2).united(self._ring_region(rect, 2))
+        self.hover_element = rect
+        if not region.isEmpty():
+            self.update(region)
     
     def keyPressEvent(self, event):
         # Handle keyboard shortcuts - Fixed for immediate response
@@ -556,6 +856,17 @@ class ModernRegionSelector(QWidget):
             self._cancel_selection()
         elif event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
             self._confirm_selection()
+        elif event.key() == Qt.Key_M:
+            # Toggle magnifier loupe
+            self.show_magnifier = not self.show_magnifier
+            self._update_magnifier(self.mapFromGlobal(QCursor.pos()))
+
+    def leaveEvent(self, event):
+        # Hide the loupe when the cursor leaves the overlay (e.g. onto the toolbar)
+        if not self._loupe_rect.isEmpty():
+            self.update(self._loupe_rect)
+            self._loupe_rect = QRect()
+        super().leaveEvent(event)
     
     def _ensure_material_font(self):
         # Try load Material Symbols font once
@@ -571,17 +882,9 @@ class ModernRegionSelector(QWidget):
             pass
         return False
 
-    def _show_modern_toolbar(self):
-        # Enhanced Material Design 3 toolbar with modern icons
-        if self.toolbar:
-            self.toolbar.hide()
-            self.toolbar.deleteLater()
-        
-        self.toolbar = QWidget(self)
-        self.toolbar.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
-        
+    def _toolbar_stylesheet(self):
         # Enhanced Material Design 3 styling with glassmorphism effect
-        self.toolbar.setStyleSheet(f"""
+        return f"""
             QWidget {{
                 background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
                     stop:0 rgba(255, 255, 255, 250),
@@ -646,7 +949,13 @@ class ModernRegionSelector(QWidget):
                     stop:1 rgba({self.MD3_ERROR.red()}, {self.MD3_ERROR.green()}, {self.MD3_ERROR.blue()}, 15));
                 border: 1px solid rgba({self.MD3_ERROR.red()}, {self.MD3_ERROR.green()}, {self.MD3_ERROR.blue()}, 60);
             }}
-        """)
+        """
+    
+    def _build_modern_toolbar(self):
+        # Enhanced Material Design 3 toolbar with modern icons, built once per selector
+        self.toolbar = QWidget(self)
+        self.toolbar.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.toolbar.setStyleSheet(self._toolbar_stylesheet())
         
         # Enhanced shadow effect with multiple layers
         effect = QGraphicsDropShadowEffect(self.toolbar)
@@ -659,41 +968,44 @@ class ModernRegionSelector(QWidget):
         layout.setSpacing(8)
         layout.setContentsMargins(16, 12, 16, 12)
         
-        # Build buttons with icons rendered by icon manager
-        def make_icon(name: str, size: int = 20, rgba=(51, 65, 85, 255)):
-            cfg = RenderConfig(size=size, color=rgba, background=None)
-            img = self.icon_manager.render_icon(name, cfg)
-            qimage = ImageQt.ImageQt(img)
-            return QPixmap.fromImage(qimage)
+        # Build buttons with icons from the prebuilt atlas
+        def make_icon(action: str):
+            return QIcon(self.icon_atlas.pixmap(self.toolbar_icons[action], self.TOOLBAR_ICON_SIZE))
         
         confirm_btn = QPushButton("Copy")
         confirm_btn.setObjectName("primary")
         confirm_btn.setToolTip("Copy selection to clipboard (Enter)")
-        confirm_btn.setIcon(make_icon("content_copy", 20))
+        confirm_btn.setIcon(make_icon("copy"))
         confirm_btn.setIconSize(QSize(20, 20))
         confirm_btn.clicked.connect(self._confirm_selection)
 
         save_btn = QPushButton("Save")
         save_btn.setObjectName("success")
         save_btn.setToolTip("Save selection to file")
-        save_btn.setIcon(make_icon("save", 20))
+        save_btn.setIcon(make_icon("save"))
         save_btn.setIconSize(QSize(20, 20))
         save_btn.clicked.connect(self._save_selection)
 
         cancel_btn = QPushButton("Cancel")
         cancel_btn.setObjectName("error")
         cancel_btn.setToolTip("Cancel selection (Esc)")
-        cancel_btn.setIcon(make_icon("close", 20))
+        cancel_btn.setIcon(make_icon("cancel"))
         cancel_btn.setIconSize(QSize(20, 20))
         cancel_btn.clicked.connect(self._cancel_selection)
 
         layout.addWidget(confirm_btn)
         layout.addWidget(save_btn)
         layout.addWidget(cancel_btn)
+        self.toolbar.resize(self.TOOLBAR_WIDTH, self.TOOLBAR_HEIGHT)
+    
+    def _show_modern_toolbar(self):
+        # Reuse the prebuilt toolbar: only move and show it
+        if self.toolbar is None:
+            self._build_modern_toolbar()
         
         # Smart positioning with enhanced screen boundary checks
-        toolbar_width = 280
-        toolbar_height = 60
+        toolbar_width = self.TOOLBAR_WIDTH
+        toolbar_height = self.TOOLBAR_HEIGHT
         
         # Center horizontally with screen bounds
         toolbar_x = max(20, min(
@@ -706,13 +1018,9 @@ class ModernRegionSelector(QWidget):
         if toolbar_y + toolbar_height > self.height() - 20:
             toolbar_y = max(20, self.selection_rect.top() - toolbar_height - 20)
         
-        self.toolbar.setGeometry(toolbar_x, toolbar_y, toolbar_width, toolbar_height)
-        
-        # Add entrance animation effect
+        self.toolbar.move(toolbar_x, toolbar_y)
         self.toolbar.show()
-        
-        # Optional: Add fade-in animation
-        QTimer.singleShot(50, lambda: self.toolbar.setWindowOpacity(1.0))
+        self.toolbar.raise_()
     
     def _hide_toolbar(self):
         # Hide toolbar
@@ -729,7 +1037,7 @@ class ModernRegionSelector(QWidget):
                 self.selection_rect.width(),
                 self.selection_rect.height()
             )
-            self.logger.debug(f"Confirming selection with rect: {rect}")
+            self.logger.debug("Confirming selection with rect: %s", rect)
             # Set result immediately and close
             self.result = (rect, "copy")
             self._close_app()
@@ -747,7 +1055,7 @@ class ModernRegionSelector(QWidget):
                 self.selection_rect.width(),
                 self.selection_rect.height()
             )
-            self.logger.debug(f"Saving selection with rect: {rect}")
+            self.logger.debug("Saving selection with rect: %s", rect)
             # Set result immediately and close
             self.result = (rect, "save")
             self._close_app()
@@ -763,7 +1071,7 @@ class ModernRegionSelector(QWidget):
     
     def _on_selection_completed(self, rect):
         # Handle completion - This method is now unused but kept for compatibility
-        self.logger.debug(f"Selection completed with rect: {rect}")
+        self.logger.debug("Selection completed with rect: %s", rect)
         self.result = rect
         self._close_app()
     
@@ -1,7 +1,6 @@
 import sys
 import json
 import os
-import traceback
 
 # Ensure we can import from the parent directory
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,7 +8,9 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+from PIL import Image
 from PySide6.QtWidgets import QApplication
+from core.log_sys import get_logger, LogOperation
 from modules.region_selector_modern import ModernRegionSelector
 
 def _stdout_json(obj):
@@ -43,12 +44,22 @@ def main():
         os.environ.setdefault("QT_LOGGING_RULES", "*.debug=false;qt.*=false")
         os.environ.setdefault("QT_LOGGING_TO_CONSOLE", "0")
 
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
+        with LogOperation("qt_init", log=False, cat="worker"):
+            app = QApplication.instance()
+            if app is None:
+                app = QApplication(sys.argv)
 
-        selector = ModernRegionSelector()
-        outcome = selector.select_region()
+        # Frame frozen by the parent at hotkey time; without one the selector grabs the screen itself
+        frame = None
+        frame_path = os.environ.get("ZSNAPR_REGION_FRAME", "").strip()
+        if frame_path:
+            with LogOperation("load_frame", log=False, cat="worker"):
+                frame = Image.open(frame_path)
+                frame.load()
+
+        with LogOperation("select_region", log=False, cat="worker"):
+            selector = ModernRegionSelector()
+            outcome = selector.select_region(frame)
 
         if outcome is None:
             _write_result({"ok": False, "reason": "cancel"})
@@ -63,10 +74,8 @@ def main():
         _write_result({"ok": True, "x": x, "y": y, "w": w, "h": h, "action": action})
         return 0
     except Exception as e:
-        try:
-            traceback.print_exc(file=sys.stderr)
-        except Exception:
-            pass
+        # Forwarded to the parent's log as a structured record with the traceback
+        get_logger().exception("region_worker failed: %s", e)
         _write_result({"ok": False, "reason": f"error:{e}"})
         return 1
 
@@ -1,31 +1,66 @@
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from tkinter import filedialog
-import tkinter as tk
 from PIL import Image
+from core.log_sys import log_function
+from modules.dialog_host import get_dialog_host
+
+# Pillow format for each extension offered in the save dialog
+SAVE_FORMATS = {
+    ".png": "PNG",
+    ".jpg": "JPEG",
+    ".jpeg": "JPEG",
+    ".bmp": "BMP",
+    ".tiff": "TIFF",
+    ".tif": "TIFF",
+}
+
+_encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="Encode")
+
+def format_for_extension(ext):
+    # Other extensions typed under "All files" still save in the format Pillow knows them by
+    return SAVE_FORMATS.get(ext) or Image.registered_extensions().get(ext, "PNG")
+
+def encode_image(image, ext):
+    """Encode image for a file extension; returns the file bytes"""
+    format_name = format_for_extension(ext)
+    output = io.BytesIO()
+    if format_name == "JPEG":
+        # Convert RGBA to RGB for JPEG
+        if image.mode == "RGBA":
+            rgb_image = Image.new("RGB", image.size, (255, 255, 255))
+            rgb_image.paste(image, mask=image.split()[-1])
+            image = rgb_image
+        image.save(output, "JPEG", quality=95)
+    else:
+        image.save(output, format_name)
+    return output.getvalue()
 
 class SaveManager:
     """File save operations for screenshots"""
     
     def __init__(self, default_directory):
         self.default_directory = default_directory
+        # Extension picked in the last save dialog; the next one is pre-encoded in that format
+        self.last_extension = ".png"
         
+    @log_function
     def save_as_dialog(self, image, initial_filename=None):
-        """Show save as dialog and save image"""
+        """Show save as dialog and save image; encoding runs while the dialog is open"""
         try:
-            # Create hidden root window
-            root = tk.Tk()
-            root.withdraw()
+            ext = self.last_extension
+            pending = _encoder.submit(encode_image, image, ext)
             
             if initial_filename is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                initial_filename = f"screenshot_{timestamp}.png"
+                initial_filename = f"screenshot_{timestamp}{ext}"
             
-            # Show save dialog
-            filepath = filedialog.asksaveasfilename(
+            # Show save dialog on the shared dialog thread
+            filepath = get_dialog_host().ask_save_filename(
                 initialdir=self.default_directory,
                 initialfile=initial_filename,
-                defaultextension=".png",
+                defaultextension=ext,
                 filetypes=[
                     ("PNG files", "*.png"),
                     ("JPEG files", "*.jpg"),
@@ -35,29 +70,28 @@ class SaveManager:
                 ]
             )
             
-            root.destroy()
+            if not filepath:
+                pending.cancel()
+                return None
             
-            if filepath:
-                # Determine format from extension
-                ext = os.path.splitext(filepath)[1].lower()
-                if ext == '.jpg' or ext == '.jpeg':
-                    # Convert RGBA to RGB for JPEG
-                    if image.mode == "RGBA":
-                        rgb_image = Image.new("RGB", image.size, (255, 255, 255))
-                        rgb_image.paste(image, mask=image.split()[-1])
-                        image = rgb_image
-                    image.save(filepath, "JPEG", quality=95)
-                else:
-                    image.save(filepath)
-                
-                return filepath
-            
-            return None
+            # Use the pre-encoded bytes when the chosen format matches, otherwise encode now
+            chosen = os.path.splitext(filepath)[1].lower()
+            if format_for_extension(chosen) == format_for_extension(ext):
+                data = pending.result()
+            else:
+                pending.cancel()
+                data = encode_image(image, chosen)
+            with open(filepath, "wb") as f:
+                f.write(data)
+            if chosen in SAVE_FORMATS:
+                self.last_extension = chosen
+            return filepath
             
         except Exception as e:
             print(f"Save as error: {e}")
             return None
     
+    @log_function
     def quick_save(self, image, directory, format_name="PNG"):
         """Quick save with auto-generated filename"""
         try:
@@ -0,0 +1,322 @@
+import bisect
+import ctypes
+import time
+
+import numpy as np
+
+try:
+    import win32gui
+except Exception:
+    win32gui = None
+
+# DWM attributes used to get the visible frame of top-level windows
+DWMWA_EXTENDED_FRAME_BOUNDS = 9
+DWMWA_CLOAKED = 14
+
+
+def _step_mask(a, b, threshold):
+    # |a - b| > threshold on uint8 arrays without widening to a signed type
+    return (np.maximum(a, b) - np.minimum(a, b)) > threshold
+
+
+def _runs(mask, min_len):
+    # Vectorized run scan along axis 1; returns (row, start, end) of runs >= min_len (end inclusive).
+    # The mask is first eroded so only cells starting min_len trues stay set; text and noise
+    # vanish and the run scan touches the few rows left.
+    height, width = mask.shape
+    empty = np.empty(0, dtype=np.int64)
+    if width < min_len:
+        return empty, empty, empty
+    eroded, span = mask, 1
+    while span < min_len:
+        step = min(span, min_len - span)
+        eroded = eroded[:, :-step] & eroded[:, step:]
+        span += step
+    lines = np.flatnonzero(eroded.any(axis=1))
+    if lines.size == 0:
+        return empty, empty, empty
+    padded = np.zeros((lines.size, eroded.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = eroded[lines]
+    delta = np.diff(padded, axis=1)
+    rows, cols = np.nonzero(delta)
+    # Starts (+1) and ends (-1) alternate along each row; an eroded run [s, e) comes from
+    # the mask run [s, e + min_len - 1)
+    rising = delta[rows, cols] > 0
+    return lines[rows[rising]], cols[rising], cols[~rising] + min_len - 2
+
+
+def _label_blocks(mask):
+    # Connected components (4-connected) of a boolean grid: union-find over the horizontal runs
+    # of each row, merging runs that overlap a run in the row above. Always finishes in one pass.
+    h, w = mask.shape
+    background = h * w
+    labels = np.full((h, w), background, dtype=np.int64)
+    padded = np.zeros((h, w + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    delta = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(delta == 1)
+    _, ends = np.nonzero(delta == -1)           # Exclusive
+    n = rows.size
+    if n == 0:
+        return labels
+
+    parent = list(range(n))
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    row_first = np.searchsorted(rows, np.arange(h + 1)).tolist()
+    run_start, run_end = starts.tolist(), ends.tolist()
+    for y in range(1, h):
+        i, i_end = row_first[y - 1], row_first[y]
+        j, j_end = row_first[y], row_first[y + 1]
+        # Sweep both rows' runs (sorted by start) and join the overlapping pairs
+        while i < i_end and j < j_end:
+            if run_start[i] < run_end[j] and run_start[j] < run_end[i]:
+                a, b = find(i), find(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+            if run_end[i] < run_end[j]:
+                i += 1
+            else:
+                j += 1
+
+    roots = np.array([find(k) for k in range(n)], dtype=np.int64)
+    lengths = ends - starts
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    flat = np.repeat(rows * w + starts, lengths) + offsets
+    labels.ravel()[flat] = np.repeat(roots, lengths)
+    return labels
+
+
+def _frame_bounds(hwnd):
+    # Visible frame rect from DWM (excludes invisible resize borders); None if unavailable
+    try:
+        from ctypes import wintypes
+        dwmapi = ctypes.windll.dwmapi
+        cloaked = wintypes.DWORD()
+        dwmapi.DwmGetWindowAttribute(wintypes.HWND(hwnd), DWMWA_CLOAKED,
+                                     ctypes.byref(cloaked), ctypes.sizeof(cloaked))
+        if cloaked.value:
+            return ()
+        rect = wintypes.RECT()
+        res = dwmapi.DwmGetWindowAttribute(wintypes.HWND(hwnd), DWMWA_EXTENDED_FRAME_BOUNDS,
+                                           ctypes.byref(rect), ctypes.sizeof(rect))
+        if res == 0:
+            return (rect.left, rect.top, rect.right, rect.bottom)
+    except Exception:
+        pass
+    return None
+
+
+def visible_window_rects(origin_x=0, origin_y=0):
+    # Visible top-level window rects as (x0, y0, x1, y1) inclusive, relative to the overlay origin
+    if win32gui is None:
+        return []
+    rects = []
+
+    def on_window(hwnd, _):
+        try:
+            if not win32gui.IsWindowVisible(hwnd) or win32gui.IsIconic(hwnd):
+                return True
+            bounds = _frame_bounds(hwnd)
+            if bounds == ():
+                return True  # cloaked (hidden UWP / other desktop)
+            left, top, right, bottom = bounds or win32gui.GetWindowRect(hwnd)
+            if right - left > 1 and bottom - top > 1:
+                rects.append((left - origin_x, top - origin_y, right - 1 - origin_x, bottom - 1 - origin_y))
+        except Exception:
+            pass
+        return True
+
+    try:
+        win32gui.EnumWindows(on_window, None)
+    except Exception:
+        return []
+    return rects
+
+
+class SnapIndex:
+    # Edge segments and element rects of a frozen frame, indexed for mouse-move-rate lookups
+
+    EDGE_THRESHOLD = 32     # Grey-level step that counts as an edge
+    MIN_SEGMENT = 24        # Shortest straight edge run kept for snapping
+    BLOCK = 8               # Block size for element detection
+    MIN_ELEMENT = 12        # Smallest element rect kept for click-to-select
+    MAX_ELEMENT_RATIO = 0.9 # Element rects covering more of the frame are dropped
+    MAX_BLOCK_RUNS = 12000  # Labelling cost cap; busier frames are labelled on coarser blocks
+    BUCKET = 128            # Grid bucket size of the rect index
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # Vertical boundaries (x between x-1 and x) with their y span, sorted by x
+        self._v_pos, self._v_lo, self._v_hi = [], [], []
+        # Horizontal boundaries (y between y-1 and y) with their x span, sorted by y
+        self._h_pos, self._h_lo, self._h_hi = [], [], []
+        # Element rects (x0, y0, x1, y1) inclusive, sorted by area, and their grid buckets
+        self.rects = []
+        self._buckets = {}
+        self.build_ms = 0.0
+
+    @classmethod
+    def from_image(cls, image, window_rects=None):
+        # Build the index from a PIL image and optional window rects in image coordinates
+        start = time.perf_counter()
+        gray = np.asarray(image.convert("L"))
+        height, width = gray.shape
+        index = cls(width, height)
+        # Screen-sized rects (the desktop, a fullscreen overlay) would make any click select everything
+        full = (0, 0, width - 1, height - 1)
+        clipped = [index._clip(r) for r in (window_rects or [])]
+        window_rects = [r for r in clipped if r and r != full]
+
+        threshold = cls.EDGE_THRESHOLD
+        v_mask = _step_mask(gray[:, 1:], gray[:, :-1], threshold)   # (H, W-1): step between x and x+1
+        h_mask = _step_mask(gray[1:], gray[:-1], threshold)         # (H-1, W): step between y and y+1
+
+        # Long straight runs become snap segments; boundary sits at x+1 / y+1
+        vx, vy0, vy1 = _runs(v_mask.T, cls.MIN_SEGMENT)
+        hy, hx0, hx1 = _runs(h_mask, cls.MIN_SEGMENT)
+        v_pos, v_lo, v_hi = vx + 1, vy0, vy1
+        h_pos, h_lo, h_hi = hy + 1, hx0, hx1
+
+        if window_rects:
+            win = np.array(window_rects, dtype=np.int64)
+            v_pos = np.concatenate([v_pos, win[:, 0], win[:, 2] + 1])
+            v_lo = np.concatenate([v_lo, win[:, 1], win[:, 1]])
+            v_hi = np.concatenate([v_hi, win[:, 3], win[:, 3]])
+            h_pos = np.concatenate([h_pos, win[:, 1], win[:, 3] + 1])
+            h_lo = np.concatenate([h_lo, win[:, 0], win[:, 0]])
+            h_hi = np.concatenate([h_hi, win[:, 2], win[:, 2]])
+            order = np.argsort(v_pos, kind="stable")
+            v_pos, v_lo, v_hi = v_pos[order], v_lo[order], v_hi[order]
+            order = np.argsort(h_pos, kind="stable")
+            h_pos, h_lo, h_hi = h_pos[order], h_lo[order], h_hi[order]
+
+        index._v_pos, index._v_lo, index._v_hi = v_pos.tolist(), v_lo.tolist(), v_hi.tolist()
+        index._h_pos, index._h_lo, index._h_hi = h_pos.tolist(), h_lo.tolist(), h_hi.tolist()
+
+        edges = np.zeros((height, width), dtype=bool)
+        edges[:, 1:] |= v_mask
+        edges[1:, :] |= h_mask
+        rects = [index._refine(r) for r in index._element_rects(edges)] + window_rects
+        index._index_rects(rects)
+
+        index.build_ms = (time.perf_counter() - start) * 1000.0
+        return index
+
+    def _clip(self, rect):
+        # Clip an inclusive rect to the frame; None if nothing is left
+        x0, y0, x1, y1 = rect
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width - 1, x1), min(self.height - 1, y1)
+        if x1 - x0 < 1 or y1 - y0 < 1:
+            return None
+        return (int(x0), int(y0), int(x1), int(y1))
+
+    def _element_rects(self, edges):
+        # Bounding boxes of connected edge blocks: buttons, icons, text runs, panels
+        block = self.BLOCK
+        while True:
+            hb, wb = self.height // block, self.width // block
+            if hb == 0 or wb == 0:
+                return []
+            # Reduce the rows of each block band first: that pass runs along contiguous memory
+            blocks = edges[:hb * block].reshape(hb, block, self.width).any(axis=1)
+            blocks = blocks[:, :wb * block].reshape(hb, wb, block).any(axis=2)
+            runs = np.count_nonzero(blocks[:, 0]) + np.count_nonzero(blocks[:, 1:] & ~blocks[:, :-1])
+            if runs <= self.MAX_BLOCK_RUNS:
+                break
+            block *= 2
+        labels = _label_blocks(blocks)
+        ys, xs = np.nonzero(blocks)
+        if ys.size == 0:
+            return []
+        ids = labels[ys, xs]
+        order = np.argsort(ids, kind="stable")
+        ids, ys, xs = ids[order], ys[order], xs[order]
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        x0 = np.minimum.reduceat(xs, starts) * block
+        y0 = np.minimum.reduceat(ys, starts) * block
+        x1 = np.minimum((np.maximum.reduceat(xs, starts) + 1) * block - 1, self.width - 1)
+        y1 = np.minimum((np.maximum.reduceat(ys, starts) + 1) * block - 1, self.height - 1)
+
+        w, h = x1 - x0 + 1, y1 - y0 + 1
+        keep = (w >= self.MIN_ELEMENT) & (h >= self.MIN_ELEMENT)
+        keep &= (w * h) < self.MAX_ELEMENT_RATIO * self.width * self.height
+        return list(zip(x0[keep].tolist(), y0[keep].tolist(), x1[keep].tolist(), y1[keep].tolist()))
+
+    def _refine(self, rect):
+        # Tighten a block-aligned rect onto the nearest real edges inside its outer blocks
+        x0, y0, x1, y1 = rect
+        radius = self.BLOCK
+        left = self.snap_vertical(x0, y0, y1, radius)
+        right = self.snap_vertical(x1 + 1, y0, y1, radius)
+        top = self.snap_horizontal(y0, x0, x1, radius)
+        bottom = self.snap_horizontal(y1 + 1, x0, x1, radius)
+        x0 = x0 if left is None else left
+        x1 = x1 if right is None else right - 1
+        y0 = y0 if top is None else top
+        y1 = y1 if bottom is None else bottom - 1
+        if x1 - x0 < self.MIN_ELEMENT or y1 - y0 < self.MIN_ELEMENT:
+            return rect
+        return (x0, y0, x1, y1)
+
+    def _index_rects(self, rects):
+        # Bucket rects by grid cell; buckets keep ascending area so the first hit is the smallest
+        self.rects = sorted(set(rects), key=lambda r: (r[2] - r[0] + 1) * (r[3] - r[1] + 1))
+        bucket = self.BUCKET
+        buckets = {}
+        for i, (x0, y0, x1, y1) in enumerate(self.rects):
+            for bx in range(x0 // bucket, x1 // bucket + 1):
+                for by in range(y0 // bucket, y1 // bucket + 1):
+                    buckets.setdefault((bx, by), []).append(i)
+        self._buckets = buckets
+
+    def element_at(self, x, y):
+        # Smallest element or window rect containing (x, y), or None
+        candidates = self._buckets.get((x // self.BUCKET, y // self.BUCKET))
+        if not candidates:
+            return None
+        rects = self.rects
+        for i in candidates:
+            x0, y0, x1, y1 = rects[i]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                return rects[i]
+        return None
+
+    @staticmethod
+    def _nearest(positions, lows, highs, value, span_lo, span_hi, radius):
+        # Closest boundary within radius whose segment overlaps [span_lo, span_hi]
+        i = bisect.bisect_left(positions, value - radius)
+        j = bisect.bisect_right(positions, value + radius)
+        best = None
+        best_dist = radius + 1
+        for k in range(i, j):
+            if lows[k] <= span_hi and highs[k] >= span_lo:
+                dist = abs(positions[k] - value)
+                if dist < best_dist:
+                    best, best_dist = positions[k], dist
+                    if dist == 0:
+                        break
+        return best
+
+    def snap_vertical(self, x, y0, y1, radius):
+        # Nearest vertical boundary to x (pixel columns x-1 | x) overlapping rows y0..y1
+        return self._nearest(self._v_pos, self._v_lo, self._v_hi, x, y0, y1, radius)
+
+    def snap_horizontal(self, y, x0, x1, radius):
+        # Nearest horizontal boundary to y (pixel rows y-1 | y) overlapping columns x0..x1
+        return self._nearest(self._h_pos, self._h_lo, self._h_hi, y, x0, x1, radius)
+
+    def stats(self):
+        return {
+            "vertical_segments": len(self._v_pos),
+            "horizontal_segments": len(self._h_pos),
+            "rects": len(self.rects),
+            "build_ms": round(self.build_ms, 1),
+        }
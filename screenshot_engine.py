@@ -10,9 +10,10 @@ from PIL import Image
 from datetime import datetime
 from config import DEFAULT_SAVE_DIR, SUPPORTED_FORMATS
 from modules.window_capture_legacy import WindowCapture
-from core.log_sys import get_logger
+from core.log_sys import get_logger, LogOperation, log_function
 import subprocess
 import sys
+import threading
 import json
 import os
 import re
@@ -67,17 +68,22 @@ class ScreenshotEngine:
         extension = self._get_file_extension()
         return f"screenshot_{timestamp}{extension}"
     
-    def capture_fullscreen(self):
-        """Capture full screen screenshot"""
+    @log_function
+    def capture_fullscreen(self, frame=None):
+        """Capture full screen screenshot (or use a frame frozen at hotkey time)"""
+        if frame is not None:
+            return frame.image
         self._apply_delay()
         screenshot = pyautogui.screenshot()
         return screenshot
     
-    def capture_region(self, x=None, y=None, width=None, height=None):
-        """Capture specific region of screen"""
-        self.logger.debug(f"capture_region called with x={x}, y={y}, width={width}, height={height}")
+    @log_function
+    def capture_region(self, x=None, y=None, width=None, height=None, frame=None):
+        """Capture specific region of screen; with a frozen frame the selector shows it and the result is cropped from it"""
+        self.logger.debug("capture_region called with x=%s, y=%s, width=%s, height=%s", x, y, width, height)
         
         action = "copy"
+        out_path = frame_path = None
         if x is None or y is None or width is None or height is None:
             # Launch selector in a separate process to avoid Qt main-thread conflicts
             try:
@@ -89,39 +95,53 @@ class ScreenshotEngine:
                 with tempfile.NamedTemporaryFile(prefix="zsnapr_region_", suffix=".json", delete=False) as tf:
                     out_path = tf.name
                 env["ZSNAPR_REGION_OUT"] = out_path
+                if frame is not None:
+                    # Uncompressed, so writing and reading it back costs little more than a copy
+                    with LogOperation("frame_handoff", log=False, cat="capture"):
+                        with tempfile.NamedTemporaryFile(prefix="zsnapr_frame_", suffix=".bmp", delete=False) as ff:
+                            frame_path = ff.name
+                        frame.image.save(frame_path, "BMP")
+                    env["ZSNAPR_REGION_FRAME"] = frame_path
+                # Worker log records stream into our log as they happen, tagged with the worker process
+                env.update(self.logger.child_env("region_worker"))
                 cmd = [sys.executable, worker_path]
-                self.logger.debug(f"tmp json path={out_path}")
-                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=120, env=env)
-                self.logger.debug(f"region_worker returncode={proc.returncode}")
-                stdout = (proc.stdout or "").strip()
-                stderr = (proc.stderr or "").strip()
-                if stdout:
-                    self.logger.debug(f"region_worker stdout(raw)={stdout}")
-                if stderr:
-                    self.logger.debug(f"region_worker stderr={stderr}")
-                data = None
-                try:
-                    exists = os.path.exists(out_path)
-                    self.logger.debug(f"tmp json exists={exists}")
-                    if exists:
-                        with open(out_path, "r", encoding="utf-8") as f:
-                            txt = f.read().strip()
-                        self.logger.debug(f"tmp json content={txt}")
-                        if txt:
-                            data = json.loads(txt)
-                finally:
+                self.logger.debug("tmp json path=%s", out_path)
+                with LogOperation("region_worker", log=False, cat="capture"):
+                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                            text=True, errors="replace", env=env)
+                    readers = [
+                        threading.Thread(target=self._relay_worker_output, args=(proc.stdout, "stdout"), daemon=True),
+                        threading.Thread(target=self._relay_worker_output, args=(proc.stderr, "stderr"), daemon=True),
+                    ]
+                    for reader in readers:
+                        reader.start()
                     try:
-                        if os.path.exists(out_path):
-                            os.remove(out_path)
-                    except Exception:
-                        pass
+                        proc.wait(timeout=120)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        proc.wait()
+                        raise
+                    finally:
+                        for reader in readers:
+                            reader.join(timeout=1.0)
+                        self.logger.wait_for_child(proc.pid, timeout=0.5)
+                self.logger.debug("region_worker returncode=%s", proc.returncode)
+                data = None
+                exists = os.path.exists(out_path)
+                self.logger.debug("tmp json exists=%s", exists)
+                if exists:
+                    with open(out_path, "r", encoding="utf-8") as f:
+                        txt = f.read().strip()
+                    self.logger.debug("tmp json content=%s", txt)
+                    if txt:
+                        data = json.loads(txt)
                 if not data or not data.get("ok"):
                     reason = data.get("reason") if isinstance(data, dict) else "unknown"
                     self.logger.info(f"Region selection not ok: {reason}")
                     return None
                 x = int(data["x"]); y = int(data["y"]); width = int(data["w"]); height = int(data["h"])
                 action = data.get("action", "copy")
-                self.logger.debug(f"Worker provided region: ({x},{y},{width},{height}), action={action}")
+                self.logger.debug("Worker provided region: (%s,%s,%s,%s), action=%s", x, y, width, height, action)
             except subprocess.TimeoutExpired:
                 self.logger.error("region_worker timed out")
                 return None
@@ -129,23 +149,53 @@ class ScreenshotEngine:
                 self.logger.error(f"region_worker failed: {e}")
                 self.logger.exception("region_worker exception:")
                 return None
+            finally:
+                # Covers every exit once the temp files exist; the frame BMP is the whole screen
+                for path in (out_path, frame_path):
+                    try:
+                        if path and os.path.exists(path):
+                            os.remove(path)
+                    except Exception:
+                        pass
+        
+        if frame is not None:
+            # The selection was made on the frozen frame; crop it instead of grabbing again
+            with LogOperation("crop", log=False, cat="capture", width=width, height=height):
+                screenshot = frame.crop(x, y, width, height)
+            self.logger.debug("Cropped frozen frame, size: %s", screenshot.size)
+            return (screenshot, action)
         
         self.logger.debug("Applying delay before screenshot")
         self._apply_delay()
         
-        self.logger.debug(f"Taking screenshot with region: ({x}, {y}, {width}, {height})")
-        screenshot = pyautogui.screenshot(region=(x, y, width, height))
-        self.logger.debug(f"Screenshot taken, size: {screenshot.size}")
+        self.logger.debug("Taking screenshot with region: (%s, %s, %s, %s)", x, y, width, height)
+        with LogOperation("grab", log=False, cat="capture", width=width, height=height):
+            screenshot = pyautogui.screenshot(region=(x, y, width, height))
+        self.logger.debug("Screenshot taken, size: %s", screenshot.size)
         
         result = (screenshot, action)
-        self.logger.debug(f"Returning result: screenshot + action '{action}'")
+        self.logger.debug("Returning result: screenshot + action '%s'", action)
         return result
     
+    def _relay_worker_output(self, stream, name):
+        # Log stray worker output line by line instead of buffering it until exit
+        try:
+            for line in stream:
+                line = line.rstrip()
+                if line:
+                    self.logger.debug("region_worker %s: %s", name, line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            stream.close()
+    
+    @log_function
     def capture_window(self):
         """Capture active window"""
         self._apply_delay()
         return WindowCapture.capture_active_window()
     
+    @log_function
     def save_screenshot(self, screenshot, filename=None):
         """Save screenshot to file"""
         if filename is None:
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Soak/stress harness for the long-running tray process.
+
+Drives ZSnaprApp capture handlers, TrayManager actions and _apply_settings
+against a synthetic capture backend (no screen grabs, clipboard or dialogs),
+samples RSS, thread count and open handles/fds, and exits non-zero when any
+of them trends upward.
+
+Examples:
+  python soak_test.py                          # 20000 iterations
+  python soak_test.py -n 100000 --concurrency 4
+  python soak_test.py --hotkeys --real-clipboard
+"""
+import argparse
+import csv
+import gc
+import io
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Keep the console readable; the log path still runs (ZSNAPR_LOG_LEVEL=DEBUG to soak it fully)
+os.environ.setdefault("ZSNAPR_LOG_LEVEL", "WARNING")
+
+import flet as ft
+from PIL import Image
+
+import config
+import ZSnapr
+from ZSnapr import ZSnaprApp
+from screenshot_engine import ScreenshotEngine
+from modules.save_legacy import SaveManager
+from ui.pages import settings_page
+from core.process_stats import rss_bytes, open_handles, thread_count, format_bytes
+
+WARMUP_FRACTION = 0.2      # Samples ignored at the start (caches filling, lazy imports)
+MIN_CORRELATION = 0.5      # A rise must also be steady to count as a trend, not one step
+
+
+class SyntheticEngine(ScreenshotEngine):
+    # Screenshot engine that renders solid images instead of grabbing the screen
+    def __init__(self, max_size, rng):
+        super().__init__()
+        self.max_size = max_size
+        self.rng = rng
+        self.actions = ("copy", "save", None)
+
+    def _image(self):
+        w = self.rng.randint(16, self.max_size[0])
+        h = self.rng.randint(16, self.max_size[1])
+        return Image.new("RGB", (w, h), tuple(self.rng.randrange(256) for _ in range(3)))
+
+    def capture_fullscreen(self, frame=None):
+        return frame.image if frame is not None else self._image()
+
+    def capture_window(self):
+        return self._image()
+
+    def capture_region(self, x=None, y=None, width=None, height=None, frame=None):
+        action = self.rng.choice(self.actions)
+        if action is None:
+            return None     # Selection cancelled
+        return self._image(), action
+
+
+class SyntheticClipboard:
+    # Does the real DIB encoding but never touches the system clipboard
+    @staticmethod
+    def copy_image_to_clipboard(image):
+        output = io.BytesIO()
+        image.convert("RGB").save(output, "BMP")
+        output.close()
+        return True
+
+
+class SyntheticSaveManager(SaveManager):
+    # "Save as" writes straight into the default directory instead of opening a dialog
+    def save_as_dialog(self, image, initial_filename=None):
+        return self.quick_save(image, self.default_directory, "PNG")
+
+
+class HeadlessPage:
+    # Stand-in for ft.Page so handlers run their update paths without a window
+    def __init__(self):
+        self.width = 939
+        self.height = 597
+        self.snack_bar = None
+        self.controls = []
+        self.updates = 0
+        self.window = SimpleNamespace(visible=True, minimized=False, to_front=False,
+                                      hide=lambda: None, show=lambda: None)
+
+    def update(self, *controls):
+        self.updates += 1
+
+    def open(self, control):
+        control.open = True
+
+    def close(self, control):
+        control.open = False
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+
+
+def build_app(args, work_dir, rng):
+    # Create the app with synthetic backends and headless settings controls
+    config.HOTKEYS_FILE = os.path.join(work_dir, "hotkeys.json")
+    config.TOOLBAR_ICONS_FILE = os.path.join(work_dir, "toolbar_icons.json")
+    if not args.hotkeys:
+        ZSnapr.re_register_hotkeys = lambda app, mappings: None
+
+    app = ZSnaprApp()
+    app.page = HeadlessPage()
+    app.status_text = ft.Text("")
+    app.engine = SyntheticEngine(tuple(args.max_size), rng)
+    if not args.real_clipboard:
+        app.clipboard_manager = SyntheticClipboard()
+    app.save_manager = SyntheticSaveManager(os.path.join(work_dir, "a"))
+    settings_page.build(app)
+    app.commands.start()
+
+    errors = []
+    update_status = app._update_status
+
+    def tracking_status(message, color=ft.Colors.BLACK):
+        if "error" in str(message).lower() or "failed" in str(message).lower():
+            errors.append(message)
+        update_status(message, color)
+    app._update_status = tracking_status
+    return app, errors
+
+
+def apply_random_settings(app, work_dir, rng):
+    app.save_dir_field.value = os.path.join(work_dir, rng.choice("ab"))
+    app.format_dropdown.value = rng.choice(("PNG", "JPEG", "BMP"))
+    app.delay_field.value = "0"
+    app.auto_save_checkbox.value = rng.random() < 0.7
+    app.auto_copy_fullscreen_checkbox.value = rng.random() < 0.5
+    app.auto_copy_window_checkbox.value = rng.random() < 0.5
+    app._apply_settings(None)
+
+
+def wait_for_threads(baseline, timeout):
+    # Wait for capture threads to finish; False if they did not within timeout
+    deadline = time.monotonic() + timeout
+    while thread_count() > baseline:
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.002)
+    return True
+
+
+def clear_saved(work_dir):
+    removed = 0
+    for sub in ("a", "b"):
+        folder = os.path.join(work_dir, sub)
+        if os.path.isdir(folder):
+            for name in os.listdir(folder):
+                try:
+                    os.remove(os.path.join(folder, name))
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+def detect_growth(samples, key, budget):
+    # Least-squares trend over the post-warmup samples; returns (growth over the run, correlation, failed)
+    tail = [s for s in samples[int(len(samples) * WARMUP_FRACTION):] if s[key] is not None]
+    if len(tail) < 5:
+        return 0.0, 0.0, False
+    xs = [s["iteration"] for s in tail]
+    ys = [s[key] for s in tail]
+    try:
+        slope, _ = statistics.linear_regression(xs, ys)
+        r = statistics.correlation(xs, ys)
+    except statistics.StatisticsError:
+        return 0.0, 0.0, False    # Constant series
+    growth = slope * (xs[-1] - xs[0])
+    return growth, r, growth > budget and r > MIN_CORRELATION
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="zsnapr_soak_")
+    app, errors = build_app(args, work_dir, rng)
+
+    operations = [
+        ("fullscreen", 3, lambda: app._capture_fullscreen()),
+        ("window", 2, lambda: app._capture_window()),
+        ("region", 2, lambda: app._capture_region()),
+        ("tray_region", 2, lambda: app.tray_manager._process_action("capture_region")),
+        ("tray_restore", 1, lambda: app.tray_manager._process_action("restore")),
+        ("settings", 1, lambda: apply_random_settings(app, work_dir, rng)),
+    ]
+    names = [op[0] for op in operations]
+    weights = [op[1] for op in operations]
+    actions = {op[0]: op[2] for op in operations}
+    counts = dict.fromkeys(names, 0)
+
+    # Warm up lazy imports and caches before taking the thread baseline
+    idle_threads = thread_count()
+    for name in names:
+        actions[name]()
+        wait_for_threads(idle_threads, args.timeout)
+    gc.collect()
+    baseline_threads = thread_count()
+
+    samples = []
+    stuck = 0
+    started = time.monotonic()
+    print(f"Soak: {args.iterations} iterations, concurrency {args.concurrency}, work dir {work_dir}")
+    print(f"{'iter':>8} {'rss':>10} {'threads':>8} {'handles':>8} {'ops/s':>8}")
+    try:
+        for i in range(1, args.iterations + 1):
+            name = rng.choices(names, weights)[0]
+            counts[name] += 1
+            actions[name]()
+            if i % args.concurrency == 0 and not wait_for_threads(baseline_threads, args.timeout):
+                stuck += 1
+            if i % args.sample_every == 0 or i == args.iterations:
+                wait_for_threads(baseline_threads, args.timeout)
+                clear_saved(work_dir)
+                gc.collect()
+                sample = {
+                    "iteration": i,
+                    "elapsed": round(time.monotonic() - started, 2),
+                    "rss": rss_bytes(),
+                    "threads": thread_count(),
+                    "handles": open_handles(),
+                }
+                samples.append(sample)
+                rate = i / max(sample["elapsed"], 1e-9)
+                print(f"{i:>8} {format_bytes(sample['rss']):>10} {sample['threads']:>8} "
+                      f"{sample['handles'] if sample['handles'] is not None else 'n/a':>8} {rate:>8.0f}")
+    except KeyboardInterrupt:
+        print("Interrupted; analysing samples so far")
+    finally:
+        wait_for_threads(baseline_threads, args.timeout)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs("logs", exist_ok=True)
+    csv_path = os.path.join("logs", time.strftime("soak_%Y%m%d_%H%M%S.csv"))
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["iteration", "elapsed", "rss", "threads", "handles"])
+        writer.writeheader()
+        writer.writerows(samples)
+
+    checks = [
+        ("rss", args.rss_budget_mb * 1024 * 1024, lambda v: format_bytes(v)),
+        ("threads", args.thread_slack, lambda v: f"{v:+.1f}"),
+        ("handles", args.handle_slack, lambda v: f"{v:+.1f}"),
+    ]
+    failed = False
+    print("-" * 50)
+    print("Operations: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+    print(f"Page updates: {app.page.updates}, status errors: {len(errors)}, waits timed out: {stuck}")
+    for key, budget, fmt in checks:
+        growth, r, bad = detect_growth(samples, key, budget)
+        failed |= bad
+        print(f"{'FAIL' if bad else 'ok':>4}  {key:<8} growth {fmt(growth):>10} (r={r:.2f}, budget {fmt(budget)})")
+    if errors:
+        print(f"First errors: {errors[:3]}")
+    if stuck:
+        print("FAIL  capture threads did not finish in time")
+        failed = True
+    print(f"Samples written to {csv_path}")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Soak/stress test the tray process against a synthetic capture backend",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Examples:")[1] if "Examples:" in __doc__ else None,
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=1, help="Operations started before waiting for them")
+    parser.add_argument("--sample-every", type=int, default=500, help="Iterations between resource samples")
+    parser.add_argument("--max-size", type=int, nargs=2, default=[1920, 1080], metavar=("W", "H"))
+    parser.add_argument("--rss-budget-mb", type=float, default=64.0, help="Allowed RSS growth after warmup")
+    parser.add_argument("--thread-slack", type=float, default=2.0, help="Allowed thread count growth")
+    parser.add_argument("--handle-slack", type=float, default=32.0, help="Allowed handle/fd count growth")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for capture threads")
+    parser.add_argument("--hotkeys", action="store_true", help="Really re-register global hotkeys on settings changes")
+    parser.add_argument("--real-clipboard", action="store_true", help="Copy to the system clipboard")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    sys.exit(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,3 @@
-from . import capture_page, settings_page, about_page
+from . import capture_page, settings_page, about_page, logs_page
 
-__all__ = ['capture_page', 'settings_page', 'about_page']
\ No newline at end of file
+__all__ = ['capture_page', 'settings_page', 'about_page', 'logs_page']
\ No newline at end of file
@@ -3,6 +3,7 @@ import platform
 import json
 import flet as ft
 from config import APP_NAME, APP_VERSION, APP_CHANNEL
+from core.log_sys import get_profiler
 
 def _get_platform_info():
     # Get friendly platform name and architecture
@@ -174,6 +175,31 @@ def _check_update(app, e=None):
 
 def build(app):
     # About page content
+    app.profile_scope_dropdown = ft.Dropdown(
+        label="Profile",
+        value="5",
+        options=[
+            ft.dropdown.Option("1", "Next capture"),
+            ft.dropdown.Option("5", "Next 5 captures"),
+            ft.dropdown.Option("10", "Next 10 captures"),
+            ft.dropdown.Option("30s", "30 seconds"),
+            ft.dropdown.Option("60s", "1 minute"),
+            ft.dropdown.Option("300s", "5 minutes"),
+        ],
+        width=180,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50
+    )
+    app.profile_cpu_checkbox = ft.Checkbox(label="CPU (cProfile)", value=True)
+    app.profile_memory_checkbox = ft.Checkbox(label="Memory (tracemalloc)", value=True)
+    active = get_profiler().active
+    app.profile_button = ft.OutlinedButton(
+        "Stop profiling" if active else "Start profiling",
+        icon=ft.Icons.STOP_CIRCLE_OUTLINED if active else ft.Icons.PLAY_CIRCLE_OUTLINE,
+        on_click=app._toggle_profiling
+    )
+
     return ft.Container(
         content=ft.Column([
             # About information card
@@ -323,6 +349,35 @@ def build(app):
                 )
             ),
             
+            # Profiling card
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.Icons.MONITOR_HEART_OUTLINED, size=22, color=ft.Colors.RED_600),
+                        ft.Text("Diagnostics", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.RED_800)
+                    ], spacing=10),
+                    ft.Divider(height=1, color=ft.Colors.RED_100, thickness=1),
+                    ft.Text("Profile upcoming captures. .prof files and memory snapshots (with growth between captures) are written to the logs folder.",
+                            size=12, color=ft.Colors.GREY_700),
+                    ft.Row([
+                        app.profile_scope_dropdown,
+                        app.profile_cpu_checkbox,
+                        app.profile_memory_checkbox,
+                        app.profile_button,
+                    ], spacing=12, wrap=True, vertical_alignment=ft.CrossAxisAlignment.CENTER),
+                ], spacing=15),
+                padding=22,
+                bgcolor=ft.Colors.WHITE,
+                border_radius=15,
+                border=ft.border.all(1, ft.Colors.RED_100),
+                shadow=ft.BoxShadow(
+                    spread_radius=2,
+                    blur_radius=8,
+                    color=ft.Colors.with_opacity(0.12, ft.Colors.RED_300),
+                    offset=ft.Offset(0, 3)
+                )
+            ),
+            
             # Update check card
             ft.Container(
                 content=ft.Column([
@@ -1,7 +1,7 @@
 import flet as ft
-from config import HOTKEYS, DEFAULT_SETTINGS
+from config import DEFAULT_SETTINGS, load_hotkeys
 
-def build(app):
+def current_values(app):
     # Resolve values with fallbacks
     save_dir = getattr(app.save_dir_field, "value", None) if hasattr(app, "save_dir_field") else None
     if not save_dir:
@@ -15,6 +15,36 @@ def build(app):
     auto_save = getattr(app.auto_save_checkbox, "value", None) if hasattr(app, "auto_save_checkbox") else None
     if auto_save is None:
         auto_save = bool(getattr(getattr(app, "engine", None), "auto_save", False))
+    hotkeys = load_hotkeys()
+    return {
+        "save_dir": str(save_dir),
+        "image_format": str(image_format),
+        "delay": str(delay_value),
+        "auto_save": "On" if auto_save else "Off",
+        "hotkey_fullscreen": hotkeys.get("fullscreen", "").upper(),
+        "hotkey_region": hotkeys.get("region", "").upper(),
+        "hotkey_window": hotkeys.get("window", "").upper(),
+    }
+
+def refresh(app):
+    # Update the value texts in place; returns the controls that changed
+    changed = []
+    for key, value in current_values(app).items():
+        text = app.capture_value_texts.get(key)
+        if text is not None and text.value != value:
+            text.value = value
+            changed.append(text)
+    return changed
+
+def build(app):
+    values = current_values(app)
+    app.capture_value_texts = {}
+
+    def value_text(key, **kwargs):
+        text = ft.Text(values[key], size=12, weight=ft.FontWeight.W_500, **kwargs)
+        app.capture_value_texts[key] = text
+        return text
+
     return ft.Container(
         content=ft.Column([
             ft.Container(visible=False,
@@ -112,7 +142,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.FOLDER, size=16, color=ft.Colors.BLUE_600), ft.Text("Save Directory", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(save_dir, size=12, weight=ft.FontWeight.W_500, selectable=True)
+                                value_text("save_dir", selectable=True)
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -124,7 +154,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.IMAGE, size=16, color=ft.Colors.GREEN_600), ft.Text("Image Format", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(str(image_format), size=12, weight=ft.FontWeight.W_500)
+                                value_text("image_format")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -136,7 +166,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.TIMER, size=16, color=ft.Colors.ORANGE_600), ft.Text("Delay (s)", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(delay_value, size=12, weight=ft.FontWeight.W_500)
+                                value_text("delay")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -148,7 +178,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.SAVE, size=16, color=ft.Colors.PURPLE_600), ft.Text("Auto Save", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text("On" if auto_save else "Off", size=12, weight=ft.FontWeight.W_500)
+                                value_text("auto_save")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -160,7 +190,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.KEYBOARD, size=16, color=ft.Colors.PURPLE_600), ft.Text("Fullscreen Hotkey", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(HOTKEYS.get("fullscreen", "").upper(), size=12, weight=ft.FontWeight.W_500)
+                                value_text("hotkey_fullscreen")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -172,7 +202,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.KEYBOARD, size=16, color=ft.Colors.PURPLE_600), ft.Text("Region Hotkey", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(HOTKEYS.get("region", "").upper(), size=12, weight=ft.FontWeight.W_500)
+                                value_text("hotkey_region")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -184,7 +214,7 @@ def build(app):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.Icons.KEYBOARD, size=16, color=ft.Colors.PURPLE_600), ft.Text("Window Hotkey", size=12, color=ft.Colors.GREY_700)], spacing=6),
-                                ft.Text(HOTKEYS.get("window", "").upper(), size=12, weight=ft.FontWeight.W_500)
+                                value_text("hotkey_window")
                             ], spacing=6),
                             padding=12,
                             bgcolor=ft.Colors.WHITE,
@@ -1,7 +1,18 @@
+import time
 import flet as ft
 from config import DEFAULT_SETTINGS
+from core.process_stats import rss_bytes, format_bytes
 
-def build(app):
+def memory_summary(app):
+    # Current RSS, plus the last idle release (before -> after)
+    text = format_bytes(rss_bytes())
+    report = getattr(app, "idle_report", None)
+    if report:
+        when = time.strftime("%H:%M", time.localtime(report["time"]))
+        text += f"  (idle {when}: {format_bytes(report['before'])} -> {format_bytes(report['after'])})"
+    return text
+
+def current_values(app):
     # Robust getters with fallbacks
     save_dir = ""
     try:
@@ -43,11 +54,38 @@ def build(app):
     except Exception:
         auto_save = bool(DEFAULT_SETTINGS.get("auto_save", False))
 
-    def info_tile(icon, title, value, color):
+    return {
+        "save_dir": str(save_dir),
+        "image_format": str(img_fmt),
+        "delay": delay,
+        "auto_save": "On" if auto_save else "Off",
+        "memory": memory_summary(app),
+    }
+
+def refresh(app):
+    # Update the tile values in place; returns the controls that changed
+    changed = []
+    for key, value in current_values(app).items():
+        text = app.home_value_texts.get(key)
+        if text is not None and text.value != value:
+            text.value = value
+            changed.append(text)
+    return changed
+
+def build(app):
+    values = current_values(app)
+    app.home_value_texts = {}
+
+    def value_text(key, selectable=True):
+        text = ft.Text(values[key], size=13, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_900, selectable=selectable)
+        app.home_value_texts[key] = text
+        return text
+
+    def info_tile(icon, title, key, color):
         return ft.Container(
             content=ft.Column([
                 ft.Row([ft.Icon(icon, size=18, color=color), ft.Text(title, size=12, color=ft.Colors.GREY_700)], spacing=8),
-                ft.Text(str(value), size=13, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_900, selectable=True)
+                value_text(key)
             ], spacing=6),
             padding=12,
             bgcolor=ft.Colors.WHITE,
@@ -56,7 +94,7 @@ def build(app):
             shadow=ft.BoxShadow(spread_radius=1, blur_radius=3, color=ft.Colors.with_opacity(0.06, ft.Colors.BLACK), offset=ft.Offset(0, 1))
         )
 
-    def save_dir_tile(path):
+    def save_dir_tile():
         # Compact card: left path, right action
         return ft.Container(
             content=ft.Row([
@@ -64,7 +102,7 @@ def build(app):
                     expand=True,
                     content=ft.Row([
                         ft.Icon(ft.Icons.FOLDER, size=18, color=ft.Colors.BLUE_600),
-                        ft.Text(str(path), size=13, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_900, selectable=True),
+                        value_text("save_dir"),
                     ], spacing=8)
                 ),
                 ft.OutlinedButton(
@@ -83,15 +121,54 @@ def build(app):
 
     quick_actions = ft.Container()
 
+    # Last capture preview; filled by app._show_preview from the preview cache
+    app.preview_image = ft.Image(src="", fit=ft.ImageFit.CONTAIN, height=200, border_radius=8,
+                                 gapless_playback=True, visible=False)
+    app.preview_caption = ft.Text("No capture yet", size=12, color=ft.Colors.GREY_700)
+    app.preview_prev_button = ft.IconButton(icon=ft.Icons.CHEVRON_LEFT, icon_size=18, tooltip="Older capture",
+                                            on_click=lambda e: app._browse_preview(-1), disabled=True)
+    app.preview_next_button = ft.IconButton(icon=ft.Icons.CHEVRON_RIGHT, icon_size=18, tooltip="Newer capture",
+                                            on_click=lambda e: app._browse_preview(1), disabled=True)
+    preview_card = ft.Container(
+        content=ft.Column([
+            ft.Row([
+                ft.Row([ft.Icon(ft.Icons.PHOTO, size=18, color=ft.Colors.BLUE_600), ft.Text("Last Capture", size=12, color=ft.Colors.GREY_700)], spacing=8),
+                ft.Row([app.preview_prev_button, app.preview_next_button], spacing=0)
+            ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+            ft.Container(content=app.preview_image, alignment=ft.alignment.center),
+            app.preview_caption
+        ], spacing=6),
+        padding=12,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=10,
+        border=ft.border.all(1, ft.Colors.GREY_200),
+        shadow=ft.BoxShadow(spread_radius=1, blur_radius=3, color=ft.Colors.with_opacity(0.06, ft.Colors.BLACK), offset=ft.Offset(0, 1))
+    )
+
+    app.home_memory_text = value_text("memory", selectable=False)
+    memory_tile = ft.Container(
+        content=ft.Column([
+            ft.Row([ft.Icon(ft.Icons.MEMORY, size=18, color=ft.Colors.TEAL_600), ft.Text("Memory", size=12, color=ft.Colors.GREY_700)], spacing=8),
+            app.home_memory_text
+        ], spacing=6),
+        padding=12,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=10,
+        border=ft.border.all(1, ft.Colors.GREY_200),
+        shadow=ft.BoxShadow(spread_radius=1, blur_radius=3, color=ft.Colors.with_opacity(0.06, ft.Colors.BLACK), offset=ft.Offset(0, 1))
+    )
+
     return ft.Container(
         content=ft.Column([
             ft.Container(content=quick_actions, margin=ft.margin.only(top=8, bottom=10)),
             ft.ResponsiveRow([
-                save_dir_tile(save_dir),
-                info_tile(ft.Icons.IMAGE, "Image Format", img_fmt, ft.Colors.GREEN_600),
-                info_tile(ft.Icons.TIMER, "Delay (s)", delay, ft.Colors.ORANGE_600),
-                info_tile(ft.Icons.SAVE, "Auto Save", "On" if auto_save else "Off", ft.Colors.PURPLE_600),
-            ], col={"xs": 12, "sm": 6, "md": 6, "lg": 3}, run_spacing=10)
+                save_dir_tile(),
+                info_tile(ft.Icons.IMAGE, "Image Format", "image_format", ft.Colors.GREEN_600),
+                info_tile(ft.Icons.TIMER, "Delay (s)", "delay", ft.Colors.ORANGE_600),
+                info_tile(ft.Icons.SAVE, "Auto Save", "auto_save", ft.Colors.PURPLE_600),
+                memory_tile,
+            ], col={"xs": 12, "sm": 6, "md": 6, "lg": 3}, run_spacing=10),
+            preview_card
         ], spacing=10),
         padding=15
     )
\ No newline at end of file
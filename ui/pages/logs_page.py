@@ -0,0 +1,155 @@
+import flet as ft
+from core.log_sys import get_tracer
+
+# Time range options: key -> seconds back from now (None = everything, "capture" = around the last capture)
+RANGE_OPTIONS = [
+    ("5m", "Last 5 minutes"),
+    ("15m", "Last 15 minutes"),
+    ("1h", "Last hour"),
+    ("24h", "Last 24 hours"),
+    ("capture", "Around last capture"),
+    ("all", "Everything"),
+]
+
+LEVEL_COLORS = {
+    "DEBUG": ft.Colors.GREY_600,
+    "INFO": ft.Colors.BLUE_GREY_800,
+    "WARNING": ft.Colors.ORANGE_800,
+    "ERROR": ft.Colors.RED_700,
+    "CRITICAL": ft.Colors.RED_900,
+}
+
+ROW_HEIGHT = 20
+
+
+def record_row(record):
+    # One fixed-height row per record; fixed extent lets the ListView build only visible rows
+    level = record.get("level", "")
+    thread = record.get("thread", "")
+    proc = record.get("proc")
+    if proc and proc != "MainProcess":
+        thread = f"{proc}/{thread}"
+    text = f"{record.get('time', '')[11:23]}  {level:<8} {thread}:{record.get('func', '')}  {record.get('msg', '')}"
+    return ft.Text(
+        text,
+        size=11,
+        font_family="Consolas",
+        color=LEVEL_COLORS.get(level, ft.Colors.BLACK),
+        italic=bool(record.get("flight")),
+        max_lines=1,
+        overflow=ft.TextOverflow.ELLIPSIS,
+        tooltip=record.get("exc") or None,
+    )
+
+
+def build(app):
+    app.log_range_dropdown = ft.Dropdown(
+        label="Range",
+        value="15m",
+        options=[ft.dropdown.Option(key, text) for key, text in RANGE_OPTIONS],
+        width=190,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50,
+        on_change=app._refresh_log_view
+    )
+    app.log_level_dropdown = ft.Dropdown(
+        label="Level",
+        value="INFO",
+        options=[ft.dropdown.Option(level) for level in ("DEBUG", "INFO", "WARNING", "ERROR")],
+        width=130,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50,
+        on_change=app._refresh_log_view
+    )
+    app.log_text_field = ft.TextField(
+        label="Filter text",
+        expand=True,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50,
+        on_submit=app._refresh_log_view
+    )
+    app.log_follow_switch = ft.Switch(label="Follow", value=False, on_change=app._toggle_log_follow)
+    app.log_count_text = ft.Text("", size=12, color=ft.Colors.GREY_700)
+    app.trace_button = ft.IconButton(
+        icon=ft.Icons.FIBER_MANUAL_RECORD_OUTLINED,
+        selected_icon=ft.Icons.STOP_CIRCLE,
+        selected=get_tracer().enabled,
+        tooltip="Record a timeline trace (Chrome trace format)",
+        on_click=app._toggle_trace,
+        style=ft.ButtonStyle(
+            bgcolor=ft.Colors.BLUE_GREY_50,
+            color={ft.ControlState.SELECTED: ft.Colors.RED_600, ft.ControlState.DEFAULT: ft.Colors.BLUE_GREY_700},
+            shape=ft.CircleBorder()
+        )
+    )
+    app.log_list = ft.ListView(
+        controls=[],
+        item_extent=ROW_HEIGHT,
+        spacing=0,
+        height=260,
+        auto_scroll=False
+    )
+
+    return ft.Container(
+        content=ft.Column([
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.Icons.RECEIPT_LONG_OUTLINED, size=22, color=ft.Colors.BLUE_GREY_600),
+                        ft.Text("Logs", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_GREY_800),
+                        ft.Container(expand=True),
+                        app.log_count_text
+                    ], spacing=10),
+                    ft.Divider(height=1, color=ft.Colors.BLUE_GREY_100, thickness=1),
+                    ft.Row([
+                        app.log_range_dropdown,
+                        app.log_level_dropdown,
+                        app.log_text_field,
+                        ft.IconButton(
+                            icon=ft.Icons.REFRESH,
+                            tooltip="Refresh",
+                            on_click=app._refresh_log_view,
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.Colors.BLUE_GREY_50,
+                                color=ft.Colors.BLUE_GREY_700,
+                                shape=ft.CircleBorder()
+                            )
+                        ),
+                        ft.IconButton(
+                            icon=ft.Icons.BUG_REPORT_OUTLINED,
+                            tooltip="Write buffered debug records to the log",
+                            on_click=app._dump_debug_records,
+                            style=ft.ButtonStyle(
+                                bgcolor=ft.Colors.BLUE_GREY_50,
+                                color=ft.Colors.BLUE_GREY_700,
+                                shape=ft.CircleBorder()
+                            )
+                        ),
+                        app.trace_button,
+                        app.log_follow_switch,
+                    ], spacing=8, wrap=True),
+                    ft.Container(
+                        content=app.log_list,
+                        padding=ft.padding.symmetric(vertical=6, horizontal=10),
+                        bgcolor=ft.Colors.GREY_50,
+                        border_radius=8,
+                        border=ft.border.all(1, ft.Colors.GREY_200)
+                    ),
+                ], spacing=12),
+                padding=22,
+                bgcolor=ft.Colors.WHITE,
+                border_radius=15,
+                border=ft.border.all(1, ft.Colors.BLUE_GREY_100),
+                shadow=ft.BoxShadow(
+                    spread_radius=2,
+                    blur_radius=8,
+                    color=ft.Colors.with_opacity(0.12, ft.Colors.BLUE_GREY_300),
+                    offset=ft.Offset(0, 3)
+                )
+            ),
+        ], spacing=20),
+        padding=20
+    )
@@ -1,5 +1,6 @@
 import flet as ft
-from config import DEFAULT_SETTINGS, SUPPORTED_FORMATS, HOTKEYS
+from config import DEFAULT_SETTINGS, SUPPORTED_FORMATS, HOTKEYS, TOOLBAR_ICONS
+from core.log_sys import get_instrumentation
 
 def build(app):
     app.save_dir_field = ft.TextField(
@@ -118,6 +119,67 @@ def build(app):
         )
     )
 
+    app.toolbar_icon_fields = {}
+    for action, label in (("copy", "Copy Button"), ("save", "Save Button"), ("cancel", "Cancel Button")):
+        app.toolbar_icon_fields[action] = ft.TextField(
+            label=label,
+            value=TOOLBAR_ICONS.get(action, ""),
+            expand=True,
+            border_radius=8,
+            filled=True,
+            bgcolor=ft.Colors.GREY_50,
+            on_focus=lambda e, a=action: app._select_toolbar_icon_target(a)
+        )
+    app.icon_search_field = ft.TextField(
+        label="Search Material Symbols",
+        hint_text="e.g. content_copy, save, crop",
+        prefix_icon=ft.Icons.SEARCH,
+        on_change=app._on_icon_search,
+        expand=True,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50
+    )
+    app.icon_results = ft.GridView(
+        controls=[],
+        max_extent=84,
+        child_aspect_ratio=1,
+        spacing=6,
+        run_spacing=6,
+        height=190
+    )
+
+    app.idle_minutes_field = ft.TextField(
+        label="Release memory when idle in tray (min, 0 = off)",
+        value=str(DEFAULT_SETTINGS.get("idle_release_minutes", 0)),
+        width=320,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50,
+        keyboard_type=ft.KeyboardType.NUMBER
+    )
+
+    instrumentation = get_instrumentation()
+    app.instrument_switch = ft.Switch(
+        label="Function timing",
+        value=instrumentation.enabled,
+        on_change=app._toggle_instrumentation
+    )
+    app.instrument_sample_dropdown = ft.Dropdown(
+        label="Sampling",
+        value=str(instrumentation.sample_every),
+        options=[
+            ft.dropdown.Option("1", "Every call"),
+            ft.dropdown.Option("10", "Every 10th call"),
+            ft.dropdown.Option("100", "Every 100th call"),
+        ],
+        width=170,
+        border_radius=8,
+        filled=True,
+        bgcolor=ft.Colors.GREY_50,
+        on_change=app._toggle_instrumentation
+    )
+
     return ft.Container(
         content=ft.Column([
             # File Settings Card
@@ -173,6 +235,13 @@ def build(app):
                         ], spacing=8),
                         margin=ft.margin.symmetric(vertical=8)
                     ),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("Tray", size=12, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_700),
+                            ft.Row([app.idle_minutes_field])
+                        ], spacing=5),
+                        margin=ft.margin.symmetric(vertical=8)
+                    ),
 
                 ], spacing=15),
                 padding=22,
@@ -219,6 +288,75 @@ def build(app):
                 )
             ),
             
+            # Toolbar Icons Card
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.Icons.WIDGETS_OUTLINED, size=22, color=ft.Colors.TEAL_600),
+                        ft.Text("Selector Toolbar Icons", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.TEAL_800)
+                    ], spacing=10),
+                    ft.Divider(height=1, color=ft.Colors.TEAL_100, thickness=1),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("Focus a button field, then pick an icon", size=12, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_700),
+                            ft.ResponsiveRow([
+                                ft.Row([field], col={"xs": 12, "md": 4})
+                                for field in app.toolbar_icon_fields.values()
+                            ], run_spacing=8),
+                            ft.Row([app.icon_search_field]),
+                            app.icon_results
+                        ], spacing=8),
+                        margin=ft.margin.symmetric(vertical=8)
+                    ),
+                ], spacing=15),
+                padding=22,
+                bgcolor=ft.Colors.WHITE,
+                border_radius=15,
+                border=ft.border.all(1, ft.Colors.TEAL_100),
+                shadow=ft.BoxShadow(
+                    spread_radius=2,
+                    blur_radius=8,
+                    color=ft.Colors.with_opacity(0.12, ft.Colors.TEAL_300),
+                    offset=ft.Offset(0, 3)
+                )
+            ),
+
+            # Diagnostics Card
+            ft.Container(
+                content=ft.Column([
+                    ft.Row([
+                        ft.Icon(ft.Icons.SPEED_OUTLINED, size=22, color=ft.Colors.INDIGO_600),
+                        ft.Text("Diagnostics", size=16, weight=ft.FontWeight.BOLD, color=ft.Colors.INDIGO_800)
+                    ], spacing=10),
+                    ft.Divider(height=1, color=ft.Colors.INDIGO_100, thickness=1),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("Per-function call counts and latency for capture, selector and save (applies immediately)",
+                                    size=12, weight=ft.FontWeight.W_500, color=ft.Colors.GREY_700),
+                            ft.Row([
+                                app.instrument_switch,
+                                app.instrument_sample_dropdown,
+                                ft.OutlinedButton("Write report", icon=ft.Icons.DESCRIPTION_OUTLINED,
+                                                  on_click=app._write_function_report),
+                                ft.OutlinedButton("Reset", icon=ft.Icons.RESTART_ALT,
+                                                  on_click=app._reset_function_stats),
+                            ], spacing=12, wrap=True),
+                        ], spacing=8),
+                        margin=ft.margin.symmetric(vertical=8)
+                    ),
+                ], spacing=15),
+                padding=22,
+                bgcolor=ft.Colors.WHITE,
+                border_radius=15,
+                border=ft.border.all(1, ft.Colors.INDIGO_100),
+                shadow=ft.BoxShadow(
+                    spread_radius=2,
+                    blur_radius=8,
+                    color=ft.Colors.with_opacity(0.12, ft.Colors.INDIGO_300),
+                    offset=ft.Offset(0, 3)
+                )
+            ),
+
             # Apply Settings Button
             ft.Container(
                 content=ft.ElevatedButton(